@@ -0,0 +1,159 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark push/pull latency of the SuperLink state against the number of nodes."""
+
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+from uuid import UUID
+
+from flwr.common import DEFAULT_TTL
+from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import RecordSet  # pylint: disable=E0611
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
+from flwr.server.superlink.state import InMemoryState, SqliteState, State
+
+
+def _make_task_ins(run_id: int, node_id: int) -> TaskIns:
+    now = time.time()
+    return TaskIns(
+        task_id="",
+        group_id="1",
+        run_id=run_id,
+        task=Task(
+            producer=Node(node_id=0, anonymous=True),
+            consumer=Node(node_id=node_id, anonymous=False),
+            created_at=now,
+            pushed_at=now,
+            ttl=DEFAULT_TTL,
+            task_type="train",
+            recordset=RecordSet(),
+        ),
+    )
+
+
+def _make_task_res(task_ins: TaskIns) -> TaskRes:
+    now = time.time()
+    return TaskRes(
+        task_id="",
+        group_id=task_ins.group_id,
+        run_id=task_ins.run_id,
+        task=Task(
+            producer=Node(node_id=task_ins.task.consumer.node_id, anonymous=False),
+            consumer=Node(node_id=0, anonymous=True),
+            created_at=now,
+            pushed_at=now,
+            ttl=DEFAULT_TTL,
+            ancestry=[task_ins.task_id],
+            task_type=task_ins.task.task_type,
+            recordset=RecordSet(),
+        ),
+    )
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_round(state: State, num_nodes: int) -> Dict[str, float]:
+    """Push one TaskIns per node, let every node pull and reply, then pull replies.
+
+    Returns the total time spent pushing and pulling, and the median latency of a single
+    node pulling its TaskIns and pushing its TaskRes.
+    """
+    run_id = state.create_run("mock/mock", "v1.0.0", {})
+    node_ids = [state.create_node(ping_interval=600) for _ in range(num_nodes)]
+
+    # Driver: push one TaskIns per node
+    task_ins_list = [_make_task_ins(run_id, node_id) for node_id in node_ids]
+    push_ins = _timed(lambda: state.store_task_ins_batch(task_ins_list))
+
+    # Nodes: pull TaskIns and push TaskRes
+    pull_ins_latencies: List[float] = []
+    push_res_latencies: List[float] = []
+    for node_id in node_ids:
+        start = time.perf_counter()
+        pulled = state.get_task_ins(node_id=node_id, limit=1)
+        pull_ins_latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        state.store_task_res(_make_task_res(pulled[0]))
+        push_res_latencies.append(time.perf_counter() - start)
+
+    # Driver: pull all TaskRes and delete the tasks
+    task_ids = {UUID(task_ins.task_id) for task_ins in task_ins_list}
+    pull_res = _timed(lambda: state.get_task_res(task_ids=task_ids, limit=None))
+    delete = _timed(lambda: state.delete_tasks(task_ids))
+
+    return {
+        "push_ins_total_s": push_ins,
+        "pull_ins_median_ms": statistics.median(pull_ins_latencies) * 1000,
+        "push_res_median_ms": statistics.median(push_res_latencies) * 1000,
+        "pull_res_total_s": pull_res,
+        "delete_total_s": delete,
+    }
+
+
+def _make_state(kind: str, tmp_dir: str, num_nodes: int) -> State:
+    if kind == "memory":
+        return InMemoryState()
+    path = ":memory:" if kind == "sqlite-memory" else f"{tmp_dir}/{num_nodes}.db"
+    state = SqliteState(path)
+    state.initialize()
+    return state
+
+
+def main() -> None:
+    """Run the benchmark and print one line per state and node count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--nodes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000],
+        help="Number of nodes to benchmark",
+    )
+    parser.add_argument(
+        "--state",
+        choices=["memory", "sqlite-memory", "sqlite-file"],
+        nargs="+",
+        default=["memory", "sqlite-file"],
+        help="State implementations to benchmark",
+    )
+    args = parser.parse_args()
+
+    columns = [
+        "push_ins_total_s",
+        "pull_ins_median_ms",
+        "push_res_median_ms",
+        "pull_res_total_s",
+        "delete_total_s",
+    ]
+    print(" ".join(["state".ljust(14), "nodes".rjust(6), *columns]))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for kind in args.state:
+            for num_nodes in args.nodes:
+                state = _make_state(kind, tmp_dir, num_nodes)
+                result = run_round(state, num_nodes)
+                values = [f"{result[c]:.4f}".rjust(len(c)) for c in columns]
+                print(" ".join([kind.ljust(14), str(num_nodes).rjust(6), *values]))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,9 +18,10 @@ import signal
 import sys
 import time
 from dataclasses import dataclass
-from logging import ERROR, INFO, WARN
+from functools import partial
+from logging import DEBUG, ERROR, INFO, WARN
 from pathlib import Path
-from typing import Callable, ContextManager, Dict, Optional, Tuple, Type, Union
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple, Type, Union
 
 from cryptography.hazmat.primitives.asymmetric import ec
 from grpc import RpcError
@@ -44,6 +45,7 @@ from flwr.common.message import Error
 from flwr.common.retry_invoker import RetryInvoker, RetryState, exponential
 from flwr.common.typing import Run, UserConfig
 
+from .array_cache import ArrayCache
 from .grpc_adapter_client.connection import grpc_adapter
 from .grpc_client.connection import grpc_connection
 from .grpc_rere_client.connection import grpc_request_response
@@ -196,6 +198,7 @@ def _start_client_internal(
     max_retries: Optional[int] = None,
     max_wait_time: Optional[float] = None,
     flwr_path: Optional[Path] = None,
+    array_cache_dir: Optional[Path] = None,
 ) -> None:
     """Start a Flower client node which connects to a Flower server.
 
@@ -243,6 +246,10 @@ def _start_client_internal(
         If set to None, there is no limit to the total time.
     flwr_path: Optional[Path] (default: None)
         The fully resolved path containing installed Flower Apps.
+    array_cache_dir: Optional[Path] (default: None)
+        The directory in which arrays received from the server are cached, in
+        addition to memory, so that they are not received again. Only used by the
+        request/response transports. If None, arrays are only cached in memory.
     """
     if insecure is None:
         insecure = root_certificates is None
@@ -271,10 +278,18 @@ def _start_client_internal(
     # At this point, only `load_client_app_fn` should be used
     # Both `client` and `client_fn` must not be used directly
 
+    # Keep the ClientApp loaded across the messages of a run
+    client_app_cache = _ClientAppCache(load_client_app_fn)
+
     # Initialize connection context manager
     connection, address, connection_error_type = _init_connection(
         transport, server_address
     )
+    if transport != TRANSPORT_TYPE_GRPC_BIDI and transport is not None:
+        # Keep arrays received from the server cached across reconnects
+        connection = partial(
+            connection, array_cache=ArrayCache(disk_dir=array_cache_dir)
+        )
 
     app_state_tracker = _AppStateTracker()
 
@@ -365,9 +380,12 @@ def _start_client_internal(
             while not app_state_tracker.interrupt:
                 try:
                     # Receive
+                    receive_start = time.monotonic()
                     message = receive()
                     if message is None:
-                        time.sleep(3)  # Wait for 3s before asking again
+                        # Wait for 3s before asking again, unless the SuperLink
+                        # already waited for TaskIns that long
+                        time.sleep(max(0.0, 3 - (time.monotonic() - receive_start)))
                         continue
 
                     log(INFO, "")
@@ -418,9 +436,7 @@ def _start_client_internal(
                     try:
                         # Load ClientApp instance
                         run: Run = runs[run_id]
-                        client_app: ClientApp = load_client_app_fn(
-                            run.fab_id, run.fab_version
-                        )
+                        client_app: ClientApp = client_app_cache.get(run)
 
                         # Execute ClientApp
                         reply_message = client_app(message=message, context=context)
@@ -624,6 +640,7 @@ def _init_connection(transport: Optional[str], server_address: str) -> Tuple[
         transport = TRANSPORT_TYPE_GRPC_BIDI
 
     # Use either gRPC bidirectional streaming or REST request/response
+    connection: Callable[..., ContextManager[Any]]
     if transport == TRANSPORT_TYPE_REST:
         try:
             from requests.exceptions import ConnectionError as RequestsConnectionError
@@ -666,3 +683,35 @@ class _AppStateTracker:
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
+
+
+class _ClientAppCache:
+    """Keep the ClientApp of the latest run loaded.
+
+    The ClientApp is loaded again when a message of another run, or of a run with
+    another FAB ID or version, arrives.
+    """
+
+    def __init__(self, load_client_app_fn: Callable[[str, str], ClientApp]) -> None:
+        self._load_client_app_fn = load_client_app_fn
+        self._client_app: Optional[Tuple[Tuple[int, str, str], ClientApp]] = None
+
+    def get(self, run: Run) -> ClientApp:
+        """Return the ClientApp of `run`, loading it if needed."""
+        key = (run.run_id, run.fab_id, run.fab_version)
+        if self._client_app is not None and self._client_app[0] == key:
+            log(DEBUG, "Reusing loaded ClientApp for run %s", run.run_id)
+            return self._client_app[1]
+
+        # Drop the ClientApp of the previous run before loading the new one
+        self._client_app = None
+        start = time.perf_counter()
+        client_app = self._load_client_app_fn(run.fab_id, run.fab_version)
+        log(
+            INFO,
+            "Loaded ClientApp for run %s in %.2fs",
+            run.run_id,
+            time.perf_counter() - start,
+        )
+        self._client_app = (key, client_app)
+        return client_app
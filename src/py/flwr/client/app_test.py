@@ -16,6 +16,7 @@
 
 
 from typing import Dict, Tuple
+from unittest.mock import MagicMock
 
 from flwr.common import (
     Config,
@@ -30,8 +31,9 @@ from flwr.common import (
     NDArrays,
     Scalar,
 )
+from flwr.common.typing import Run
 
-from .app import start_client, start_numpy_client
+from .app import _ClientAppCache, start_client, start_numpy_client
 from .client import Client
 from .numpy_client import NumPyClient
 
@@ -126,3 +128,29 @@ def test_start_numpy_client_transport_invalid() -> None:
         raise AssertionError()  # Fail the test if no exception was raised
     except ValueError:
         pass
+
+
+def test_client_app_cache() -> None:
+    """Test that the ClientApp is loaded once per run and FAB."""
+    # Prepare
+    load_client_app_fn = MagicMock(side_effect=lambda *_: MagicMock())
+    cache = _ClientAppCache(load_client_app_fn)
+    run = Run(run_id=1, fab_id="a/b", fab_version="1.0.0", override_config={})
+    new_fab = Run(run_id=1, fab_id="a/b", fab_version="2.0.0", override_config={})
+    new_run = Run(run_id=2, fab_id="a/b", fab_version="2.0.0", override_config={})
+
+    # Execute
+    first = cache.get(run)
+    second = cache.get(run)
+    third = cache.get(new_fab)
+    fourth = cache.get(new_run)
+
+    # Assert
+    assert first is second
+    assert third is not first
+    assert fourth is not third
+    assert [call.args for call in load_client_app_fn.call_args_list] == [
+        ("a/b", "1.0.0"),
+        ("a/b", "2.0.0"),
+        ("a/b", "2.0.0"),
+    ]
@@ -0,0 +1,270 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Cache of array data received from the SuperLink, keyed by content hash."""
+
+
+import hashlib
+import os
+from collections import OrderedDict
+from logging import DEBUG, ERROR, WARN
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from flwr.common.constant import ErrorCode
+from flwr.common.logger import log
+from flwr.common.message import Error, Message
+from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
+    ArrayDigest,
+    PullTaskInsResponse,
+)
+
+# Only arrays of at least this size are cached
+ARRAY_CACHE_MIN_BYTES = 64 * 1024
+
+DEFAULT_MAX_MEMORY_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 4 * 1024 * 1024 * 1024
+
+
+class ArrayCache:  # pylint: disable=R0902
+    """A bounded cache of array data, keyed by the SHA-256 hash of the data.
+
+    The most recently used arrays are kept in memory, up to `max_memory_bytes`. If
+    `disk_dir` is set, arrays evicted from memory are written to that directory, up
+    to `max_disk_bytes`, and arrays found there are reused after a restart.
+
+    Parameters
+    ----------
+    max_memory_bytes : int (default: 512 MiB)
+        The maximum total size of the arrays kept in memory.
+    disk_dir : Optional[Union[str, Path]] (default: None)
+        The directory in which arrays evicted from memory are kept. If `None`, no
+        arrays are written to disk.
+    max_disk_bytes : int (default: 4 GiB)
+        The maximum total size of the arrays kept in `disk_dir`.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        disk_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ) -> None:
+        self._max_memory_bytes = max_memory_bytes
+        self._max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Map the hash of each array on disk to its size
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_dir: Optional[Path] = None
+        # Hashes of the arrays of the last received TaskIns holding any, which are
+        # the arrays most likely to be received again
+        self._recent: List[str] = []
+        if disk_dir is not None:
+            self._disk_dir = Path(disk_dir)
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index(self._disk_dir)
+
+    def digests(self) -> List[Tuple[str, int]]:
+        """Return the hash and size of each cached array."""
+        entries = [(sha256, len(data)) for sha256, data in self._memory.items()]
+        entries += [
+            (sha256, size)
+            for sha256, size in self._disk.items()
+            if sha256 not in self._memory
+        ]
+        return entries
+
+    def recent_digests(self) -> List[Tuple[str, int]]:
+        """Return the hash and size of each recent array that is still cached."""
+        entries: List[Tuple[str, int]] = []
+        for sha256 in self._recent:
+            data = self._memory.get(sha256)
+            if data is not None:
+                entries.append((sha256, len(data)))
+            elif sha256 in self._disk:
+                entries.append((sha256, self._disk[sha256]))
+        return entries
+
+    def set_recent(self, sha256s: List[str]) -> None:
+        """Set the hashes of the arrays of the last received TaskIns."""
+        self._recent = list(dict.fromkeys(sha256s))
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        """Return the cached data with the given hash, or `None` if not cached."""
+        data = self._memory.get(sha256)
+        if data is not None:
+            self._memory.move_to_end(sha256)
+            return data
+
+        if sha256 not in self._disk:
+            return None
+        path = self._path(sha256)
+        try:
+            data = path.read_bytes()
+        except OSError as err:
+            log(WARN, "Failed to read cached array %s: %s", sha256, err)
+            data = None
+        if data is None or hashlib.sha256(data).hexdigest() != sha256:
+            self._remove_from_disk(sha256)
+            return None
+        self._disk.move_to_end(sha256)
+        self._put_in_memory(sha256, data)
+        return data
+
+    def put(self, data: bytes) -> str:
+        """Cache `data` and return its hash."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 in self._memory:
+            self._memory.move_to_end(sha256)
+        else:
+            self._put_in_memory(sha256, data)
+        return sha256
+
+    def _put_in_memory(self, sha256: str, data: bytes) -> None:
+        """Keep `data` in memory, evicting the least recently used arrays."""
+        self._memory[sha256] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self._max_memory_bytes:
+            evicted_sha256, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._put_on_disk(evicted_sha256, evicted)
+
+    def _put_on_disk(self, sha256: str, data: bytes) -> None:
+        """Write `data` to disk, evicting the least recently used arrays."""
+        if self._disk_dir is None or len(data) > self._max_disk_bytes:
+            return
+        if sha256 in self._disk:
+            self._disk.move_to_end(sha256)
+            return
+
+        path = self._path(sha256)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            log(WARN, "Failed to write cached array %s: %s", sha256, err)
+            return
+        self._disk[sha256] = len(data)
+        self._disk_bytes += len(data)
+        while self._disk_bytes > self._max_disk_bytes:
+            self._remove_from_disk(next(iter(self._disk)))
+
+    def _remove_from_disk(self, sha256: str) -> None:
+        """Remove an array from disk."""
+        self._disk_bytes -= self._disk.pop(sha256, 0)
+        try:
+            self._path(sha256).unlink()
+        except OSError:
+            pass
+
+    def _load_disk_index(self, disk_dir: Path) -> None:
+        """Index the valid arrays found on disk, from least to most recently used.
+
+        Files that cannot be read or do not match their hash are removed, so that only
+        arrays that are actually available are announced to the SuperLink.
+        """
+        files: List[Tuple[float, str, int]] = []
+        for path in disk_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+                valid = hashlib.sha256(path.read_bytes()).hexdigest() == path.stem
+            except OSError as err:
+                log(WARN, "Failed to read cached array %s: %s", path.stem, err)
+                valid = False
+            if not valid:
+                log(WARN, "Removing invalid cached array %s", path.stem)
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, sha256, size in sorted(files):
+            self._disk[sha256] = size
+            self._disk_bytes += size
+        while self._disk_bytes > self._max_disk_bytes:
+            self._remove_from_disk(next(iter(self._disk)))
+
+    def _path(self, sha256: str) -> Path:
+        """Return the path of the file holding an array."""
+        if self._disk_dir is None:
+            raise ValueError("The cache does not keep arrays on disk.")
+        return self._disk_dir / f"{sha256}.bin"
+
+
+def get_array_digests(cache: ArrayCache) -> List[ArrayDigest]:
+    """Return the digests of the recent cached arrays for a `PullTaskInsRequest`.
+
+    Only the arrays of the last received TaskIns holding any are announced, so that the
+    request stays small however many arrays are cached.
+    """
+    return [
+        ArrayDigest(sha256=sha256, size=size) for sha256, size in cache.recent_digests()
+    ]
+
+
+def restore_and_cache_arrays(response: PullTaskInsResponse, cache: ArrayCache) -> bool:
+    """Restore the arrays the SuperLink left out of `response`, and cache new ones.
+
+    Returns `False` if an array left out of `response` is no longer in the cache.
+    """
+    refs: Dict[Tuple[int, str, int], str] = {
+        (ref.task_index, ref.record_key, ref.array_index): ref.sha256
+        for ref in response.cached_arrays
+    }
+    new_arrays: List[bytes] = []
+    recent: List[str] = []
+    # Restore all referenced arrays before caching new ones, which may evict them
+    for task_index, task_ins in enumerate(response.task_ins_list):
+        for record_key, record in task_ins.task.recordset.parameters.items():
+            for array_index, array in enumerate(record.data_values):
+                sha256 = refs.pop((task_index, record_key, array_index), None)
+                if sha256 is None:
+                    if len(array.data) >= ARRAY_CACHE_MIN_BYTES:
+                        new_arrays.append(array.data)
+                    continue
+                cached = cache.get(sha256)
+                if cached is None:
+                    log(ERROR, "Array %s is not cached", sha256)
+                    return False
+                array.data = cached
+                recent.append(sha256)
+
+    if refs:
+        log(ERROR, "Received references to unknown arrays")
+        return False
+    if response.cached_arrays:
+        log(DEBUG, "Restored %s arrays from the cache", len(response.cached_arrays))
+    for data in new_arrays:
+        recent.append(cache.put(data))
+    if recent:
+        cache.set_recent(recent)
+    return True
+
+
+def create_array_not_cached_reply(message: Message) -> Message:
+    """Create an error reply to a message whose arrays could not be restored.
+
+    The TaskIns of `message` has been delivered already, so the SuperLink will not
+    send it again. Replying with an error lets the ServerApp know instead.
+    """
+    return message.create_error_reply(
+        error=Error(
+            code=ErrorCode.ARRAY_NOT_CACHED,
+            reason="Arrays left out by the SuperLink are no longer cached",
+        )
+    )
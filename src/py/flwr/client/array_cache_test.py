@@ -0,0 +1,251 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the cache of arrays received from the SuperLink."""
+
+
+import hashlib
+from pathlib import Path
+from typing import List
+
+from flwr.common import DEFAULT_TTL, Message, Metadata, RecordSet
+from flwr.common.constant import ErrorCode
+
+# pylint: disable=E0611
+from flwr.proto.fleet_pb2 import ArrayDigest, CachedArrayRef, PullTaskInsResponse
+from flwr.proto.recordset_pb2 import Array, ParametersRecord
+from flwr.proto.recordset_pb2 import RecordSet as ProtoRecordSet
+from flwr.proto.task_pb2 import Task, TaskIns
+
+from .array_cache import (
+    ARRAY_CACHE_MIN_BYTES,
+    ArrayCache,
+    create_array_not_cached_reply,
+    get_array_digests,
+    restore_and_cache_arrays,
+)
+
+# pylint: enable=E0611
+
+
+def _make_task_ins(arrays: List[bytes]) -> TaskIns:
+    """Create a TaskIns holding the given arrays."""
+    record = ParametersRecord(
+        data_keys=[str(idx) for idx in range(len(arrays))],
+        data_values=[Array(data=data) for data in arrays],
+    )
+    return TaskIns(
+        task_id="mock",
+        task=Task(recordset=ProtoRecordSet(parameters={"params": record})),
+    )
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_memory_eviction() -> None:
+    """Test that the least recently used arrays are evicted from memory."""
+    # Prepare
+    blobs = [bytes([idx]) * 100 for idx in range(3)]
+    cache = ArrayCache(max_memory_bytes=250)
+
+    # Execute
+    cache.put(blobs[0])
+    cache.put(blobs[1])
+    cache.get(_sha256(blobs[0]))
+    cache.put(blobs[2])
+
+    # Assert
+    assert cache.get(_sha256(blobs[0])) == blobs[0]
+    assert cache.get(_sha256(blobs[1])) is None
+    assert cache.get(_sha256(blobs[2])) == blobs[2]
+    assert sorted(cache.digests()) == sorted(
+        [(_sha256(blobs[0]), 100), (_sha256(blobs[2]), 100)]
+    )
+
+
+def test_disk_tier(tmp_path: Path) -> None:
+    """Test that arrays evicted from memory are kept on disk across restarts."""
+    # Prepare
+    blobs = [bytes([idx]) * 100 for idx in range(3)]
+    cache = ArrayCache(max_memory_bytes=100, disk_dir=tmp_path, max_disk_bytes=100)
+
+    # Execute
+    for blob in blobs:
+        cache.put(blob)
+    restarted = ArrayCache(max_memory_bytes=100, disk_dir=tmp_path)
+
+    # Assert
+    assert cache.get(_sha256(blobs[0])) is None
+    assert cache.get(_sha256(blobs[1])) == blobs[1]
+    assert cache.get(_sha256(blobs[2])) == blobs[2]
+    assert restarted.digests() == [(_sha256(blobs[1]), 100)]
+    assert restarted.get(_sha256(blobs[1])) == blobs[1]
+
+
+def test_disk_tier_ignores_corrupted_files(tmp_path: Path) -> None:
+    """Test that arrays whose file does not match their hash are dropped."""
+    # Prepare
+    blob = b"\x01" * 100
+    ArrayCache(max_memory_bytes=0, disk_dir=tmp_path).put(blob)
+    (tmp_path / f"{_sha256(blob)}.bin").write_bytes(b"\x02" * 100)
+
+    # Execute
+    cache = ArrayCache(disk_dir=tmp_path)
+
+    # Assert
+    assert cache.get(_sha256(blob)) is None
+    assert not cache.digests()
+
+
+def test_disk_tier_does_not_announce_corrupted_files(tmp_path: Path) -> None:
+    """Test that arrays whose file does not match their hash are not announced."""
+    # Prepare
+    blob = b"\x01" * 100
+    ArrayCache(max_memory_bytes=0, disk_dir=tmp_path).put(blob)
+    (tmp_path / f"{_sha256(blob)}.bin").write_bytes(b"\x02" * 100)
+
+    # Execute
+    cache = ArrayCache(disk_dir=tmp_path)
+
+    # Assert
+    assert not cache.digests()
+    assert not list(tmp_path.glob("*.bin"))
+
+
+def test_restore_and_cache_arrays() -> None:
+    """Test restoring arrays left out by the SuperLink and caching new ones."""
+    # Prepare
+    model = b"\x01" * ARRAY_CACHE_MIN_BYTES
+    update = b"\x02" * ARRAY_CACHE_MIN_BYTES
+    cache = ArrayCache()
+    cache.put(model)
+    response = PullTaskInsResponse(
+        task_ins_list=[_make_task_ins([b"", update, b"\x03"])],
+        cached_arrays=[
+            CachedArrayRef(
+                task_index=0, record_key="params", array_index=0, sha256=_sha256(model)
+            )
+        ],
+    )
+
+    # Execute
+    restored = restore_and_cache_arrays(response, cache)
+
+    # Assert
+    assert restored
+    data = [
+        array.data
+        for array in response.task_ins_list[0]
+        .task.recordset.parameters["params"]
+        .data_values
+    ]
+    assert data == [model, update, b"\x03"]
+    assert {digest.sha256 for digest in get_array_digests(cache)} == {
+        _sha256(model),
+        _sha256(update),
+    }
+
+
+def test_get_array_digests_of_last_task_ins() -> None:
+    """Test that only the cached arrays of the last TaskIns are announced."""
+    # Prepare
+    stale = b"\x01" * ARRAY_CACHE_MIN_BYTES
+    model = b"\x02" * ARRAY_CACHE_MIN_BYTES
+    cache = ArrayCache()
+    cache.put(stale)
+    response = PullTaskInsResponse(task_ins_list=[_make_task_ins([model, b"\x03"])])
+
+    # Execute
+    before = get_array_digests(cache)
+    restore_and_cache_arrays(response, cache)
+    restore_and_cache_arrays(PullTaskInsResponse(), cache)
+
+    # Assert
+    assert not before
+    assert get_array_digests(cache) == [
+        ArrayDigest(sha256=_sha256(model), size=len(model))
+    ]
+    assert len(cache.digests()) == 2
+
+
+def test_restore_and_cache_arrays_missing() -> None:
+    """Test that a response referencing an array not in the cache is rejected."""
+    # Prepare
+    response = PullTaskInsResponse(
+        task_ins_list=[_make_task_ins([b""])],
+        cached_arrays=[
+            CachedArrayRef(
+                task_index=0, record_key="params", array_index=0, sha256="unknown"
+            )
+        ],
+    )
+
+    # Execute
+    restored = restore_and_cache_arrays(response, ArrayCache())
+
+    # Assert
+    assert not restored
+
+
+def test_create_array_not_cached_reply() -> None:
+    """Test the error reply to a message whose arrays could not be restored."""
+    # Prepare
+    message = Message(
+        metadata=Metadata(
+            run_id=1,
+            message_id="mock",
+            src_node_id=0,
+            dst_node_id=1,
+            reply_to_message="",
+            group_id="",
+            ttl=DEFAULT_TTL,
+            message_type="train",
+        ),
+        content=RecordSet(),
+    )
+
+    # Execute
+    reply = create_array_not_cached_reply(message)
+
+    # Assert
+    assert reply.has_error()
+    assert reply.error.code == ErrorCode.ARRAY_NOT_CACHED
+    assert reply.metadata.reply_to_message == "mock"
+
+
+def test_restore_before_caching_new_arrays() -> None:
+    """Test that caching new arrays does not evict arrays still to be restored."""
+    # Prepare
+    model = b"\x01" * ARRAY_CACHE_MIN_BYTES
+    update = b"\x02" * ARRAY_CACHE_MIN_BYTES
+    cache = ArrayCache(max_memory_bytes=ARRAY_CACHE_MIN_BYTES)
+    cache.put(model)
+    response = PullTaskInsResponse(
+        task_ins_list=[_make_task_ins([update, b""])],
+        cached_arrays=[
+            CachedArrayRef(
+                task_index=0, record_key="params", array_index=1, sha256=_sha256(model)
+            )
+        ],
+    )
+
+    # Execute
+    restored = restore_and_cache_arrays(response, cache)
+
+    # Assert
+    assert restored
+    record = response.task_ins_list[0].task.recordset.parameters["params"]
+    assert [array.data for array in record.data_values] == [update, model]
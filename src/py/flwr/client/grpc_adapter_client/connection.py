@@ -21,6 +21,7 @@ from typing import Callable, Iterator, Optional, Tuple, Union
 
 from cryptography.hazmat.primitives.asymmetric import ec
 
+from flwr.client.array_cache import ArrayCache
 from flwr.client.grpc_rere_client.connection import grpc_request_response
 from flwr.client.grpc_rere_client.grpc_adapter import GrpcAdapter
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
@@ -40,6 +41,7 @@ def grpc_adapter(  # pylint: disable=R0913
     authentication_keys: Optional[  # pylint: disable=unused-argument
         Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]
     ] = None,
+    array_cache: Optional[ArrayCache] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -72,6 +74,10 @@ def grpc_adapter(  # pylint: disable=R0913
         Flower server. Bytes won't work for the REST API.
     authentication_keys : Optional[Tuple[PrivateKey, PublicKey]] (default: None)
         Client authentication is not supported for this transport type.
+    array_cache : Optional[ArrayCache] (default: None)
+        The cache of arrays received from the server. Arrays the server has sent
+        before are not sent again while they are cached. If `None`, arrays are
+        cached in memory for the duration of the connection.
 
     Returns
     -------
@@ -91,5 +97,6 @@ def grpc_adapter(  # pylint: disable=R0913
         root_certificates=root_certificates,
         authentication_keys=None,  # Authentication is not supported
         adapter_cls=GrpcAdapter,
+        array_cache=array_cache,
     ) as conn:
         yield conn
@@ -21,20 +21,44 @@ from contextlib import contextmanager
 from copy import copy
 from logging import DEBUG, ERROR
 from pathlib import Path
-from typing import Callable, Iterator, Optional, Sequence, Tuple, Type, Union, cast
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 import grpc
 from cryptography.hazmat.primitives.asymmetric import ec
 
+from flwr.client.array_cache import (
+    ArrayCache,
+    create_array_not_cached_reply,
+    get_array_digests,
+    restore_and_cache_arrays,
+)
 from flwr.client.heartbeat import start_ping_loop
 from flwr.client.message_handler.message_handler import validate_out_message
 from flwr.client.message_handler.task_handler import get_task_ins, validate_task_ins
 from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.chunking import (
+    ArrayChunkAssembler,
+    ArrayRef,
+    iter_array_chunks,
+    strip_large_arrays,
+)
 from flwr.common.constant import (
+    ARRAY_CHUNK_SIZE,
     PING_BASE_MULTIPLIER,
     PING_CALL_TIMEOUT,
     PING_DEFAULT_INTERVAL,
     PING_RANDOM_RANGE,
+    PULL_MAX_WAIT,
 )
 from flwr.common.grpc import create_channel
 from flwr.common.logger import log
@@ -52,7 +76,10 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PingRequest,
     PingResponse,
     PullTaskInsRequest,
+    PullTaskInsResponse,
     PushTaskResRequest,
+    PushTaskResResponse,
+    PushTaskResStreamRequest,
 )
 from flwr.proto.fleet_pb2_grpc import FleetStub  # pylint: disable=E0611
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
@@ -79,6 +106,7 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]
     ] = None,
     adapter_cls: Optional[Union[Type[FleetStub], Type[GrpcAdapter]]] = None,
+    array_cache: Optional[ArrayCache] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -117,6 +145,10 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         authentication from the cryptography library.
         Source: https://cryptography.io/en/latest/hazmat/primitives/asymmetric/ec/
         Used to establish an authenticated connection with the server.
+    array_cache : Optional[ArrayCache] (default: None)
+        The cache of arrays received from the server. Arrays the server has sent
+        before are not sent again while they are cached. If `None`, arrays are
+        cached in memory for the duration of the connection.
 
     Returns
     -------
@@ -152,6 +184,11 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
     node: Optional[Node] = None
     ping_thread: Optional[threading.Thread] = None
     ping_stop_event = threading.Event()
+    # Stream large arrays in chunks if the server supports it. Only unary calls
+    # can be authenticated. The GrpcAdapter emulates streams with unary calls.
+    streaming = authentication_keys is None
+    if array_cache is None:
+        array_cache = ArrayCache()
 
     ###########################################################################
     # ping/create_node/delete_node/receive/send/get_run functions
@@ -213,6 +250,42 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         # Cleanup
         node = None
 
+    def pull_task_ins_stream(
+        request: PullTaskInsRequest,
+    ) -> Optional[PullTaskInsResponse]:
+        """Pull TaskIns, reassembling large arrays from chunks."""
+        nonlocal streaming
+        response: Optional[PullTaskInsResponse] = None
+        assembler = ArrayChunkAssembler()
+        try:
+            for stream_response in stub.PullTaskInsStream(request):
+                if stream_response.WhichOneof("payload") == "response":
+                    response = stream_response.response
+                else:
+                    assembler.add(stream_response.chunk)
+        except grpc.RpcError as err:
+            if err.code() != grpc.StatusCode.UNIMPLEMENTED:  # pylint: disable=E1101
+                raise
+            # Fall back to unary calls if the server does not support streaming
+            log(DEBUG, "Streaming not supported by the server")
+            streaming = False
+            return None
+        if response is not None:
+            assembler.assemble(response.task_ins_list)
+        return response
+
+    def push_task_res_stream(
+        request: PushTaskResRequest, stripped: List[Tuple[ArrayRef, bytes]]
+    ) -> PushTaskResResponse:
+        """Push TaskRes, sending stripped arrays in chunks."""
+
+        def request_iterator() -> Iterator[PushTaskResStreamRequest]:
+            yield PushTaskResStreamRequest(request=request)
+            for chunk in iter_array_chunks(stripped, ARRAY_CHUNK_SIZE):
+                yield PushTaskResStreamRequest(chunk=chunk)
+
+        return cast(PushTaskResResponse, stub.PushTaskResStream(request_iterator()))
+
     def receive() -> Optional[Message]:
         """Receive next task from server."""
         # Get Node
@@ -220,11 +293,21 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
             log(ERROR, "Node instance missing")
             return None
 
-        # Request instructions (task) from server
-        request = PullTaskInsRequest(node=node)
-        response = retry_invoker.invoke(stub.PullTaskIns, request=request)
-
-        # Get the current TaskIns
+        # Request instructions (task) from server, waiting for them if none are
+        # available yet, and announce the recent arrays cached by this node
+        request = PullTaskInsRequest(
+            node=node,
+            timeout=PULL_MAX_WAIT,
+            cached_arrays=get_array_digests(array_cache),
+        )
+        response = None
+        if streaming:
+            response = retry_invoker.invoke(pull_task_ins_stream, request)
+        if response is None:
+            response = retry_invoker.invoke(stub.PullTaskIns, request=request)
+
+        # Get the current TaskIns, restoring the arrays left out by the server
+        restored = restore_and_cache_arrays(response, array_cache)
         task_ins: Optional[TaskIns] = get_task_ins(response)
 
         # Discard the current TaskIns if not valid
@@ -241,6 +324,12 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
         nonlocal metadata
         metadata = copy(in_message.metadata) if in_message else None
 
+        # Reply with an error if the arrays of the in message could not be restored,
+        # as the server will not send its TaskIns again
+        if in_message is not None and not restored:
+            send(create_array_not_cached_reply(in_message))
+            in_message = None
+
         # Return the message if available
         return in_message
 
@@ -267,7 +356,11 @@ def grpc_request_response(  # pylint: disable=R0913, R0914, R0915
 
         # Serialize ProtoBuf to bytes
         request = PushTaskResRequest(task_res_list=[task_res])
-        _ = retry_invoker.invoke(stub.PushTaskRes, request)
+        if streaming and request.ByteSize() > ARRAY_CHUNK_SIZE:
+            stripped = strip_large_arrays(request.task_res_list, ARRAY_CHUNK_SIZE)
+            _ = retry_invoker.invoke(push_task_res_stream, request, stripped)
+        else:
+            _ = retry_invoker.invoke(stub.PushTaskRes, request)
 
         # Cleanup
         metadata = None
@@ -17,12 +17,13 @@
 
 import sys
 from logging import DEBUG
-from typing import Any, Type, TypeVar, cast
+from typing import Any, Iterator, Type, TypeVar, cast
 
 import grpc
 from google.protobuf.message import Message as GrpcMessage
 
 from flwr.common import log
+from flwr.common.chunking import ArrayChunkAssembler
 from flwr.common.constant import (
     GRPC_ADAPTER_METADATA_FLOWER_VERSION_KEY,
     GRPC_ADAPTER_METADATA_SHOULD_EXIT_KEY,
@@ -37,8 +38,10 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PingResponse,
     PullTaskInsRequest,
     PullTaskInsResponse,
+    PullTaskInsStreamResponse,
     PushTaskResRequest,
     PushTaskResResponse,
+    PushTaskResStreamRequest,
 )
 from flwr.proto.grpcadapter_pb2 import MessageContainer  # pylint: disable=E0611
 from flwr.proto.grpcadapter_pb2_grpc import GrpcAdapterStub
@@ -131,3 +134,23 @@ class GrpcAdapter:
     ) -> GetRunResponse:
         """."""
         return self._send_and_receive(request, GetRunResponse, **kwargs)
+
+    def PullTaskInsStream(  # pylint: disable=C0103
+        self, request: PullTaskInsRequest, **kwargs: Any
+    ) -> Iterator[PullTaskInsStreamResponse]:
+        """Pull TaskIns in a single (unchunked) message."""
+        yield PullTaskInsStreamResponse(response=self.PullTaskIns(request, **kwargs))
+
+    def PushTaskResStream(  # pylint: disable=C0103
+        self, request_iterator: Iterator[PushTaskResStreamRequest], **kwargs: Any
+    ) -> PushTaskResResponse:
+        """Reassemble the chunked TaskRes and push it in a single message."""
+        request = PushTaskResRequest()
+        assembler = ArrayChunkAssembler()
+        for stream_request in request_iterator:
+            if stream_request.WhichOneof("payload") == "request":
+                request = stream_request.request
+            else:
+                assembler.add(stream_request.chunk)
+        assembler.assemble(request.task_res_list)
+        return self.PushTaskRes(request, **kwargs)
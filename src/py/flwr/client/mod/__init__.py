@@ -17,11 +17,13 @@
 
 from .centraldp_mods import adaptiveclipping_mod, fixedclipping_mod
 from .comms_mods import message_size_mod, parameters_size_mod
+from .compression_mod import CompressionMod
 from .localdp_mod import LocalDpMod
 from .secure_aggregation import secagg_mod, secaggplus_mod
 from .utils import make_ffn
 
 __all__ = [
+    "CompressionMod",
     "LocalDpMod",
     "adaptiveclipping_mod",
     "fixedclipping_mod",
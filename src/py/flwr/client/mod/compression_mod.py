@@ -0,0 +1,138 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Update compression modifier."""
+
+
+from logging import INFO, WARN
+
+from flwr.client.typing import ClientAppCallable
+from flwr.common import parameters_to_ndarrays
+from flwr.common import recordset_compat as compat
+from flwr.common.compression import (
+    COMPRESSION_METHODS,
+    METRICS_COMPRESSED_BYTES,
+    METRICS_UNCOMPRESSED_BYTES,
+    compress_update,
+    compression_metrics,
+)
+from flwr.common.constant import MessageType
+from flwr.common.context import Context
+from flwr.common.logger import log
+from flwr.common.message import Message
+
+
+class CompressionMod:
+    """Modifier for compressing model updates.
+
+    This mod encodes the parameters returned by the client as a lossy delta from the
+    parameters received from the server. The server decodes the update before
+    passing it to the strategy, so no change to the strategy is required.
+
+    It operates on messages of type `MessageType.TRAIN`. The size of the update
+    before and after compression is added to the metrics of the reply.
+
+    Parameters
+    ----------
+    method : str
+        The compression method. One of:
+
+        - "fp16": half precision floats.
+        - "bf16": bfloat16 floats.
+        - "int8": stochastic 8-bit quantization with a per-layer range.
+        - "topk": only the largest `topk_ratio` fraction of the values of each
+          layer are sent, as index/value pairs.
+    topk_ratio : float (default: 0.01)
+        The fraction of values to keep per layer when `method` is "topk".
+
+    Examples
+    --------
+    Create an instance of the compression mod and add it to the client-side mods:
+
+    >>> compression_mod = CompressionMod(method="int8")
+    >>> app = fl.client.ClientApp(
+    >>>     client_fn=client_fn, mods=[compression_mod]
+    >>> )
+    """
+
+    def __init__(self, method: str, topk_ratio: float = 0.01) -> None:
+        if method not in COMPRESSION_METHODS:
+            raise ValueError(
+                f"The compression method should be one of {COMPRESSION_METHODS}."
+            )
+
+        if not 0.0 < topk_ratio <= 1.0:
+            raise ValueError("The top-k ratio should be in (0, 1].")
+
+        self.method = method
+        self.topk_ratio = topk_ratio
+
+    def __call__(
+        self, msg: Message, ctxt: Context, call_next: ClientAppCallable
+    ) -> Message:
+        """Compress the model parameters returned by the client.
+
+        Parameters
+        ----------
+        msg : Message
+            The message received from the server.
+        ctxt : Context
+            The context of the client.
+        call_next : ClientAppCallable
+            The callable to call the next middleware in the chain.
+
+        Returns
+        -------
+        Message
+            The modified message to be sent back to the server.
+        """
+        if msg.metadata.message_type != MessageType.TRAIN:
+            return call_next(msg, ctxt)
+
+        fit_ins = compat.recordset_to_fitins(msg.content, keep_input=True)
+        server_to_client_params = parameters_to_ndarrays(fit_ins.parameters)
+
+        # Call inner app
+        out_msg = call_next(msg, ctxt)
+
+        # Check if the msg has error
+        if out_msg.has_error():
+            return out_msg
+
+        fit_res = compat.recordset_to_fitres(out_msg.content, keep_input=True)
+        client_to_server_params = parameters_to_ndarrays(fit_res.parameters)
+
+        try:
+            compressed = compress_update(
+                client_to_server_params,
+                server_to_client_params,
+                self.method,
+                self.topk_ratio,
+            )
+        except ValueError as err:
+            log(WARN, "CompressionMod: update sent uncompressed: %s", err)
+            return out_msg
+
+        fit_res.parameters = compressed
+        fit_res.metrics.update(compression_metrics(client_to_server_params, compressed))
+        log(
+            INFO,
+            "CompressionMod: %s update of %i bytes compressed to %i bytes.",
+            self.method,
+            fit_res.metrics[METRICS_UNCOMPRESSED_BYTES],
+            fit_res.metrics[METRICS_COMPRESSED_BYTES],
+        )
+
+        out_msg.content = compat.fitres_to_recordset(fit_res, keep_input=True)
+        return out_msg
@@ -15,14 +15,32 @@
 """Node state."""
 
 
+import json
+import os
+import sqlite3
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    OrderedDict,
+    Tuple,
+    cast,
+)
 
 from flwr.common import Context, RecordSet
 from flwr.common.config import get_fused_config, get_fused_config_from_dir
+from flwr.common.serde import recordset_from_proto, recordset_to_proto
 from flwr.common.typing import Run, UserConfig
 
+# pylint: disable-next=E0611
+from flwr.proto.recordset_pb2 import RecordSet as ProtoRecordSet
+
 
 @dataclass()
 class RunInfo:
@@ -32,17 +50,252 @@ class RunInfo:
     initial_run_config: UserConfig
 
 
+class ContextStore:  # pylint: disable=too-many-instance-attributes
+    """Store of the run contexts of many nodes with a bounded number in memory.
+
+    The most recently used contexts are kept in memory. When there are more than
+    `max_contexts_in_memory` of them, the least recently used one is serialized to
+    an SQLite database and read back the next time it is used.
+
+    Parameters
+    ----------
+    max_contexts_in_memory : int
+        The maximum number of contexts kept in memory.
+    database : Optional[str] (default: None)
+        The path to the SQLite database holding the contexts which are not in
+        memory. If `None`, a temporary file is used and removed by `close`.
+    """
+
+    def __init__(
+        self, max_contexts_in_memory: int, database: Optional[str] = None
+    ) -> None:
+        if max_contexts_in_memory < 1:
+            raise ValueError("`max_contexts_in_memory` must be at least 1.")
+        self.max_contexts_in_memory = max_contexts_in_memory
+        self._in_memory: OrderedDict[Tuple[int, int], RunInfo] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._temporary_database: Optional[str] = None
+        if database is None:
+            file_descriptor, database = tempfile.mkstemp(suffix=".db")
+            os.close(file_descriptor)
+            self._temporary_database = database
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        # Contexts are not needed after the simulation ended
+        self._conn.execute("PRAGMA synchronous = OFF;")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS context(
+                node_id INTEGER,
+                run_id  INTEGER,
+                state   BLOB,
+                configs TEXT,
+                PRIMARY KEY (node_id, run_id)
+            );
+            """
+        )
+
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_spilled = 0
+        self.bytes_spilled = 0
+
+    def get(self, node_id: int, run_id: int) -> Optional[RunInfo]:
+        """Return the RunInfo of a node, or `None` if it was never stored."""
+        key = (node_id, run_id)
+        with self._lock:
+            run_info = self._in_memory.get(key)
+            if run_info is not None:
+                self._in_memory.move_to_end(key)
+                self.num_hits += 1
+                return run_info
+
+            row = self._conn.execute(
+                "SELECT state, configs FROM context WHERE node_id = ? AND run_id = ?;",
+                (_to_sint64(node_id), _to_sint64(run_id)),
+            ).fetchone()
+            if row is None:
+                return None
+            self.num_misses += 1
+            run_info = _run_info_from_row(node_id, row[0], row[1])
+            self._store_in_memory(key, run_info)
+            return run_info
+
+    def get_initial_run_config(self, node_id: int, run_id: int) -> Optional[UserConfig]:
+        """Return the initial run_config of a node, or `None` if it was never stored.
+
+        Unlike `get`, this neither counts towards the metrics nor reads back the
+        context into memory.
+        """
+        with self._lock:
+            run_info = self._in_memory.get((node_id, run_id))
+            if run_info is not None:
+                return run_info.initial_run_config
+
+            row = self._conn.execute(
+                "SELECT configs FROM context WHERE node_id = ? AND run_id = ?;",
+                (_to_sint64(node_id), _to_sint64(run_id)),
+            ).fetchone()
+            if row is None:
+                return None
+            _, _, initial_run_config = json.loads(row[0])
+            return cast(UserConfig, initial_run_config)
+
+    def put(self, node_id: int, run_id: int, run_info: RunInfo) -> None:
+        """Store the RunInfo of a node."""
+        with self._lock:
+            self._store_in_memory((node_id, run_id), run_info)
+
+    def contains(self, node_id: int, run_id: int) -> bool:
+        """Return whether a RunInfo is stored for the node and run."""
+        with self._lock:
+            if (node_id, run_id) in self._in_memory:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM context WHERE node_id = ? AND run_id = ?;",
+                (_to_sint64(node_id), _to_sint64(run_id)),
+            ).fetchone()
+            return row is not None
+
+    def delete(self, node_id: int, run_id: int) -> None:
+        """Delete the RunInfo of a node."""
+        with self._lock:
+            self._in_memory.pop((node_id, run_id), None)
+            self._conn.execute(
+                "DELETE FROM context WHERE node_id = ? AND run_id = ?;",
+                (_to_sint64(node_id), _to_sint64(run_id)),
+            )
+
+    def run_ids(self, node_id: int) -> List[int]:
+        """Return the IDs of the runs for which a RunInfo of the node is stored."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id FROM context WHERE node_id = ?;",
+                (_to_sint64(node_id),),
+            ).fetchall()
+            run_ids = {_to_uint64(row[0]) for row in rows}
+            run_ids.update(run for node, run in self._in_memory if node == node_id)
+            return sorted(run_ids)
+
+    def metrics(self) -> Dict[str, float]:
+        """Return the hit rate of the in-memory contexts and the spilled bytes."""
+        with self._lock:
+            num_requests = self.num_hits + self.num_misses
+            return {
+                "contexts_in_memory": len(self._in_memory),
+                "hits": self.num_hits,
+                "misses": self.num_misses,
+                "hit_rate": self.num_hits / num_requests if num_requests else 1.0,
+                "contexts_spilled": self.num_spilled,
+                "bytes_spilled": self.bytes_spilled,
+            }
+
+    def close(self) -> None:
+        """Close the database and remove it if it is a temporary file."""
+        with self._lock:
+            self._conn.close()
+            if self._temporary_database is not None:
+                os.remove(self._temporary_database)
+                self._temporary_database = None
+
+    def _store_in_memory(self, key: Tuple[int, int], run_info: RunInfo) -> None:
+        self._in_memory[key] = run_info
+        self._in_memory.move_to_end(key)
+        while len(self._in_memory) > self.max_contexts_in_memory:
+            (node_id, run_id), spilled = self._in_memory.popitem(last=False)
+            state, configs = _run_info_to_row(spilled)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO context VALUES (?, ?, ?, ?);",
+                (_to_sint64(node_id), _to_sint64(run_id), state, configs),
+            )
+            self.num_spilled += 1
+            self.bytes_spilled += len(state) + len(configs)
+
+
+def _to_sint64(value: int) -> int:
+    """Convert a uint64 ID to a sint64 that fits into an SQLite INTEGER."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _to_uint64(value: int) -> int:
+    """Convert a sint64 read from SQLite back to a uint64 ID."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def _run_info_to_row(run_info: RunInfo) -> Tuple[bytes, str]:
+    context = run_info.context
+    state = recordset_to_proto(context.state).SerializeToString()
+    configs = json.dumps(
+        [context.node_config, context.run_config, run_info.initial_run_config]
+    )
+    return state, configs
+
+
+def _run_info_from_row(node_id: int, state: bytes, configs: str) -> RunInfo:
+    node_config, run_config, initial_run_config = json.loads(configs)
+    return RunInfo(
+        context=Context(
+            node_id=node_id,
+            node_config=node_config,
+            state=recordset_from_proto(ProtoRecordSet.FromString(state)),
+            run_config=run_config,
+        ),
+        initial_run_config=initial_run_config,
+    )
+
+
+class _StoredRunInfos(MutableMapping[int, RunInfo]):
+    """The RunInfo of each run of a node, held by a ContextStore."""
+
+    def __init__(self, context_store: ContextStore, node_id: int) -> None:
+        self._context_store = context_store
+        self._node_id = node_id
+
+    def __getitem__(self, run_id: int) -> RunInfo:
+        run_info = self._context_store.get(self._node_id, run_id)
+        if run_info is None:
+            raise KeyError(run_id)
+        return run_info
+
+    def __setitem__(self, run_id: int, run_info: RunInfo) -> None:
+        self._context_store.put(self._node_id, run_id, run_info)
+
+    def __delitem__(self, run_id: int) -> None:
+        if not self._context_store.contains(self._node_id, run_id):
+            raise KeyError(run_id)
+        self._context_store.delete(self._node_id, run_id)
+
+    def __contains__(self, run_id: object) -> bool:
+        return isinstance(run_id, int) and self._context_store.contains(
+            self._node_id, run_id
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._context_store.run_ids(self._node_id))
+
+    def __len__(self) -> int:
+        return len(self._context_store.run_ids(self._node_id))
+
+
 class NodeState:
-    """State of a node where client nodes execute runs."""
+    """State of a node where client nodes execute runs.
+
+    If a `context_store` is given, the contexts of the node are kept in it, which
+    bounds the number of contexts held in memory across all nodes sharing it.
+    """
 
     def __init__(
         self,
         node_id: int,
         node_config: UserConfig,
+        context_store: Optional[ContextStore] = None,
     ) -> None:
         self.node_id = node_id
         self.node_config = node_config
-        self.run_infos: Dict[int, RunInfo] = {}
+        self.run_infos: MutableMapping[int, RunInfo] = (
+            {} if context_store is None else _StoredRunInfos(context_store, node_id)
+        )
+        self._context_store = context_store
 
     def register_context(
         self,
@@ -79,8 +332,9 @@ class NodeState:
 
     def retrieve_context(self, run_id: int) -> Context:
         """Get run context given a run_id."""
-        if run_id in self.run_infos:
-            return self.run_infos[run_id].context
+        run_info = self.run_infos.get(run_id)
+        if run_info is not None:
+            return run_info.context
 
         raise RuntimeError(
             f"Context for run_id={run_id} doesn't exist."
@@ -90,9 +344,23 @@ class NodeState:
 
     def update_context(self, run_id: int, context: Context) -> None:
         """Update run context."""
-        if context.run_config != self.run_infos[run_id].initial_run_config:
+        initial_run_config = self._get_initial_run_config(run_id)
+        if context.run_config != initial_run_config:
             raise ValueError(
                 "The `run_config` field of the `Context` object cannot be "
                 f"modified (run_id: {run_id})."
             )
-        self.run_infos[run_id].context = context
+        self.run_infos[run_id] = RunInfo(
+            context=context, initial_run_config=initial_run_config
+        )
+
+    def _get_initial_run_config(self, run_id: int) -> UserConfig:
+        """Get the initial run_config of a run without reading back its context."""
+        if self._context_store is None:
+            return self.run_infos[run_id].initial_run_config
+        initial_run_config = self._context_store.get_initial_run_config(
+            self.node_id, run_id
+        )
+        if initial_run_config is None:
+            raise KeyError(run_id)
+        return initial_run_config
@@ -17,8 +17,8 @@
 
 from typing import cast
 
-from flwr.client.node_state import NodeState
-from flwr.common import ConfigsRecord, Context
+from flwr.client.node_state import ContextStore, NodeState
+from flwr.common import ConfigsRecord, Context, RecordSet
 from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
 
 
@@ -64,3 +64,70 @@ def test_multirun_in_node_state() -> None:
             run_info.context.state.configs_records["counter"]["count"]
             == expected_values[run_id]
         )
+
+
+def test_node_states_with_context_store() -> None:
+    """Test NodeState contexts spilled to and read back from a ContextStore."""
+    # Prepare
+    context_store = ContextStore(max_contexts_in_memory=2)
+    node_ids = [1, 2, 2**64 - 1]
+    node_states = [
+        NodeState(
+            node_id=node_id,
+            node_config={"partition-id": idx},
+            context_store=context_store,
+        )
+        for idx, node_id in enumerate(node_ids)
+    ]
+    tasks = [TaskIns(run_id=run_id) for run_id in [0, 1, 1, 0, 1]]
+
+    # Execute
+    for task in tasks:
+        for node_state in node_states:
+            node_state.register_context(run_id=task.run_id)
+            context = node_state.retrieve_context(run_id=task.run_id)
+            context = _run_dummy_task(context)
+            context.state.configs_records["model"] = ConfigsRecord(
+                {"weights": node_state.node_id.to_bytes(8, "little") * 64}
+            )
+            node_state.update_context(run_id=task.run_id, context=context)
+    metrics = context_store.metrics()
+
+    # Assert
+    for node_state in node_states:
+        assert list(node_state.run_infos) == [0, 1]
+        for run_id, expected in [(0, "11"), (1, "111")]:
+            context = node_state.retrieve_context(run_id=run_id)
+            assert context.node_id == node_state.node_id
+            assert context.node_config == node_state.node_config
+            assert context.state.configs_records["counter"]["count"] == expected
+            assert (
+                context.state.configs_records["model"]["weights"]
+                == node_state.node_id.to_bytes(8, "little") * 64
+            )
+    assert metrics["contexts_in_memory"] == 2
+    assert metrics["misses"] > 0
+    assert metrics["bytes_spilled"] > 0
+    context_store.close()
+
+
+def test_update_context_does_not_count_towards_metrics() -> None:
+    """Test that updating a context does not read it back from a ContextStore."""
+    # Prepare
+    context_store = ContextStore(max_contexts_in_memory=1)
+    node_states = [NodeState(node_id, {}, context_store) for node_id in [1, 2]]
+    for node_state in node_states:
+        node_state.register_context(run_id=0)
+
+    # Execute
+    context = node_states[0].retrieve_context(run_id=0)
+    node_states[0].update_context(run_id=0, context=context)
+    node_states[1].update_context(
+        run_id=0,
+        context=Context(node_id=2, node_config={}, state=RecordSet(), run_config={}),
+    )
+    metrics = context_store.metrics()
+
+    # Assert
+    assert (metrics["hits"], metrics["misses"]) == (0, 1)
+    context_store.close()
@@ -26,6 +26,12 @@ from typing import Callable, Iterator, Optional, Tuple, Type, TypeVar, Union
 from cryptography.hazmat.primitives.asymmetric import ec
 from google.protobuf.message import Message as GrpcMessage
 
+from flwr.client.array_cache import (
+    ArrayCache,
+    create_array_not_cached_reply,
+    get_array_digests,
+    restore_and_cache_arrays,
+)
 from flwr.client.heartbeat import start_ping_loop
 from flwr.client.message_handler.message_handler import validate_out_message
 from flwr.client.message_handler.task_handler import get_task_ins, validate_task_ins
@@ -36,6 +42,7 @@ from flwr.common.constant import (
     PING_CALL_TIMEOUT,
     PING_DEFAULT_INTERVAL,
     PING_RANDOM_RANGE,
+    PULL_MAX_WAIT,
 )
 from flwr.common.logger import log
 from flwr.common.message import Message, Metadata
@@ -90,6 +97,7 @@ def http_request_response(  # pylint: disable=,R0913, R0914, R0915
     authentication_keys: Optional[  # pylint: disable=unused-argument
         Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]
     ] = None,
+    array_cache: Optional[ArrayCache] = None,
 ) -> Iterator[
     Tuple[
         Callable[[], Optional[Message]],
@@ -124,6 +132,10 @@ def http_request_response(  # pylint: disable=,R0913, R0914, R0915
         Flower server. Bytes won't work for the REST API.
     authentication_keys : Optional[Tuple[PrivateKey, PublicKey]] (default: None)
         Client authentication is not supported for this transport type.
+    array_cache : Optional[ArrayCache] (default: None)
+        The cache of arrays received from the server. Arrays the server has sent
+        before are not sent again while they are cached. If `None`, arrays are
+        cached in memory for the duration of the connection.
 
     Returns
     -------
@@ -159,6 +171,9 @@ def http_request_response(  # pylint: disable=,R0913, R0914, R0915
     if authentication_keys is not None:
         log(ERROR, "Client authentication is not supported for this transport type.")
 
+    if array_cache is None:
+        array_cache = ArrayCache()
+
     # Shared variables for inner functions
     metadata: Optional[Metadata] = None
     node: Optional[Node] = None
@@ -286,15 +301,21 @@ def http_request_response(  # pylint: disable=,R0913, R0914, R0915
             log(ERROR, "Node instance missing")
             return None
 
-        # Request instructions (task) from server
-        req = PullTaskInsRequest(node=node)
+        # Request instructions (task) from server, waiting for them if none are
+        # available yet, and announce the recent arrays cached by this node
+        req = PullTaskInsRequest(
+            node=node,
+            timeout=PULL_MAX_WAIT,
+            cached_arrays=get_array_digests(array_cache),
+        )
 
         # Send the request
         res = _request(req, PullTaskInsResponse, PATH_PULL_TASK_INS)
         if res is None:
             return None
 
-        # Get the current TaskIns
+        # Get the current TaskIns, restoring the arrays left out by the server
+        restored = restore_and_cache_arrays(res, array_cache)
         task_ins: Optional[TaskIns] = get_task_ins(res)
 
         # Discard the current TaskIns if not valid
@@ -311,6 +332,12 @@ def http_request_response(  # pylint: disable=,R0913, R0914, R0915
             message = message_from_taskins(task_ins)
             metadata = copy(message.metadata)
             log(INFO, "[Node] POST /%s: success", PATH_PULL_TASK_INS)
+
+        # Reply with an error if the arrays of the message could not be restored, as
+        # the server will not send its TaskIns again
+        if message is not None and not restored:
+            send(create_array_not_cached_reply(message))
+            message = None
         return message
 
     def send(message: Message) -> None:
@@ -79,6 +79,9 @@ def run_supernode() -> None:
         max_wait_time=args.max_wait_time,
         node_config=parse_config_args([args.node_config]),
         flwr_path=get_flwr_dir(args.flwr_dir),
+        array_cache_dir=(
+            Path(args.array_cache_dir) if args.array_cache_dir is not None else None
+        ),
     )
 
     # Graceful shutdown
@@ -275,6 +278,13 @@ def _parse_args_run_supernode() -> argparse.ArgumentParser:
         - `$HOME/.flwr/` in all other cases
     """,
     )
+    parser.add_argument(
+        "--array-cache-dir",
+        default=None,
+        help="A directory in which arrays received from the SuperLink are cached, "
+        "in addition to memory, so that unchanged arrays (e.g., model parameters) "
+        "are not received again. By default, arrays are only cached in memory.",
+    )
 
     return parser
 
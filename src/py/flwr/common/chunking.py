@@ -0,0 +1,161 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Split large arrays in TaskIns/TaskRes into bounded chunks and reassemble them."""
+
+
+from bisect import bisect
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from flwr.proto.fleet_pb2 import ArrayChunk  # pylint: disable=E0611
+from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
+
+# Location of an array: (task index, ParametersRecord key, array index)
+ArrayRef = Tuple[int, str, int]
+
+
+def strip_large_arrays(
+    tasks: Sequence[Union[TaskIns, TaskRes]], chunk_size: int
+) -> List[Tuple[ArrayRef, bytes]]:
+    """Remove the data of all arrays larger than `chunk_size` from `tasks`.
+
+    Parameters
+    ----------
+    tasks : Sequence[Union[TaskIns, TaskRes]]
+        The tasks to strip. They are modified in place.
+    chunk_size : int
+        The maximum number of bytes an array may hold to be kept in its task.
+
+    Returns
+    -------
+    stripped : List[Tuple[ArrayRef, bytes]]
+        The location and data of each array that has been stripped.
+    """
+    stripped: List[Tuple[ArrayRef, bytes]] = []
+    for task_index, task in enumerate(tasks):
+        for record_key, record in task.task.recordset.parameters.items():
+            for array_index, array in enumerate(record.data_values):
+                data = array.data
+                if len(data) > chunk_size:
+                    stripped.append(((task_index, record_key, array_index), data))
+                    array.ClearField("data")
+    return stripped
+
+
+def iter_array_chunks(
+    stripped: List[Tuple[ArrayRef, bytes]], chunk_size: int
+) -> Iterator[ArrayChunk]:
+    """Yield the data of stripped arrays in chunks of at most `chunk_size` bytes."""
+    for (task_index, record_key, array_index), data in stripped:
+        view = memoryview(data)
+        for offset in range(0, len(data), chunk_size):
+            yield ArrayChunk(
+                task_index=task_index,
+                record_key=record_key,
+                array_index=array_index,
+                offset=offset,
+                total_size=len(data),
+                data=bytes(view[offset : offset + chunk_size]),
+            )
+
+
+class ArrayChunkAssembler:
+    """Reassemble chunked arrays incrementally into preallocated buffers.
+
+    Parameters
+    ----------
+    max_bytes : Optional[int] (default: None)
+        The maximum total size of all arrays to reassemble. Chunks of arrays
+        exceeding it are rejected before any memory is allocated for them. If
+        `None`, the size is not limited.
+    max_array_bytes : Optional[int] (default: None)
+        The maximum size of a single array. Chunks of larger arrays are rejected
+        before any memory is allocated for them. If `None`, the size is not
+        limited.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, max_array_bytes: Optional[int] = None
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._max_array_bytes = max_array_bytes
+        self._allocated = 0
+        self._buffers: Dict[ArrayRef, bytearray] = {}
+        # Disjoint byte ranges received for each array, sorted by offset
+        self._ranges: Dict[ArrayRef, List[Tuple[int, int]]] = {}
+
+    def add(self, chunk: ArrayChunk) -> None:
+        """Copy the data of `chunk` into the buffer of its array.
+
+        Raises
+        ------
+        ValueError
+            If the chunk exceeds its array, overlaps a chunk received before, or
+            its array exceeds `max_array_bytes` or the remaining `max_bytes`.
+        """
+        ref = (chunk.task_index, chunk.record_key, chunk.array_index)
+        buffer = self._buffers.get(ref)
+        if buffer is None:
+            if (
+                self._max_array_bytes is not None
+                and chunk.total_size > self._max_array_bytes
+            ):
+                raise ValueError(f"Array {ref} exceeds the maximum array size.")
+            if (
+                self._max_bytes is not None
+                and self._allocated + chunk.total_size > self._max_bytes
+            ):
+                raise ValueError(f"Array {ref} exceeds the maximum size.")
+            buffer = self._buffers[ref] = bytearray(chunk.total_size)
+            self._allocated += chunk.total_size
+            self._ranges[ref] = []
+
+        data = chunk.data
+        start, end = chunk.offset, chunk.offset + len(data)
+        if len(buffer) != chunk.total_size or end > len(buffer):
+            raise ValueError(f"Chunk of array {ref} is out of bounds.")
+        if start == end:
+            return
+        ranges = self._ranges[ref]
+        index = bisect(ranges, (start, end))
+        if (index > 0 and ranges[index - 1][1] > start) or (
+            index < len(ranges) and ranges[index][0] < end
+        ):
+            raise ValueError(f"Chunk of array {ref} overlaps a previous chunk.")
+        ranges.insert(index, (start, end))
+        buffer[start:end] = data
+
+    def assemble(self, tasks: Sequence[Union[TaskIns, TaskRes]]) -> None:
+        """Write all reassembled arrays back into `tasks`.
+
+        Raises
+        ------
+        ValueError
+            If an array has not been received completely or does not exist in
+            `tasks`.
+        """
+        while self._buffers:
+            ref, buffer = self._buffers.popitem()
+            ranges = self._ranges.pop(ref)
+            if sum(end - start for start, end in ranges) != len(buffer):
+                raise ValueError(f"Array {ref} has not been received completely.")
+            task_index, record_key, array_index = ref
+            if task_index >= len(tasks):
+                raise ValueError(f"Array {ref} refers to an unknown task.")
+            records = tasks[task_index].task.recordset.parameters
+            if record_key not in records or array_index >= len(
+                records[record_key].data_values
+            ):
+                raise ValueError(f"Array {ref} refers to an unknown array.")
+            records[record_key].data_values[array_index].data = bytes(buffer)
@@ -0,0 +1,153 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for splitting and reassembling large arrays in tasks."""
+
+
+from typing import List
+
+import pytest
+
+from flwr.proto.recordset_pb2 import (  # pylint: disable=E0611
+    Array,
+    ParametersRecord,
+    RecordSet,
+)
+from flwr.proto.task_pb2 import Task, TaskIns  # pylint: disable=E0611
+
+from .chunking import ArrayChunkAssembler, iter_array_chunks, strip_large_arrays
+
+
+def _make_task_ins(sizes: List[int]) -> TaskIns:
+    """Create a TaskIns holding one array of each size."""
+    record = ParametersRecord(
+        data_keys=[str(idx) for idx in range(len(sizes))],
+        data_values=[
+            Array(
+                dtype="uint8",
+                shape=[size],
+                stype="raw",
+                data=bytes(idx % 256 for idx in range(size)),
+            )
+            for size in sizes
+        ],
+    )
+    return TaskIns(
+        task_id="mock",
+        task=Task(recordset=RecordSet(parameters={"params": record})),
+    )
+
+
+def test_strip_chunk_and_assemble() -> None:
+    """Test that arrays survive being split into chunks and reassembled."""
+    # Prepare
+    tasks = [_make_task_ins([1024, 10]), _make_task_ins([300])]
+    expected = [TaskIns.FromString(task.SerializeToString()) for task in tasks]
+    chunk_size = 100
+
+    # Execute
+    stripped = strip_large_arrays(tasks, chunk_size)
+    chunks = list(iter_array_chunks(stripped, chunk_size))
+    assembler = ArrayChunkAssembler()
+    for chunk in reversed(chunks):
+        assembler.add(chunk)
+    assembler.assemble(tasks)
+
+    # Assert
+    assert len(stripped) == 2
+    assert len(chunks) == 11 + 3
+    assert all(len(chunk.data) <= chunk_size for chunk in chunks)
+    assert tasks == expected
+
+
+def test_strip_keeps_small_arrays() -> None:
+    """Test that arrays not exceeding the chunk size are kept in place."""
+    # Prepare
+    tasks = [_make_task_ins([10, 20])]
+    expected = TaskIns.FromString(tasks[0].SerializeToString())
+
+    # Execute
+    stripped = strip_large_arrays(tasks, 20)
+
+    # Assert
+    assert not stripped
+    assert tasks[0] == expected
+
+
+def test_assemble_incomplete_array() -> None:
+    """Test that an incomplete array cannot be assembled."""
+    # Prepare
+    tasks = [_make_task_ins([1024])]
+    stripped = strip_large_arrays(tasks, 100)
+    chunks = list(iter_array_chunks(stripped, 100))
+    assembler = ArrayChunkAssembler()
+    for chunk in chunks[:-1]:
+        assembler.add(chunk)
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        assembler.assemble(tasks)
+
+
+def test_add_out_of_bounds_chunk() -> None:
+    """Test that a chunk exceeding its array is rejected."""
+    # Prepare
+    tasks = [_make_task_ins([1024])]
+    chunk = next(iter_array_chunks(strip_large_arrays(tasks, 100), 100))
+    chunk.offset = 1000
+    assembler = ArrayChunkAssembler()
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        assembler.add(chunk)
+
+
+def test_add_duplicate_chunk() -> None:
+    """Test that a chunk overlapping a previous one is rejected."""
+    # Prepare
+    tasks = [_make_task_ins([1024])]
+    chunks = list(iter_array_chunks(strip_large_arrays(tasks, 100), 100))
+    assembler = ArrayChunkAssembler()
+    assembler.add(chunks[0])
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        assembler.add(chunks[0])
+
+
+def test_add_chunk_exceeding_max_bytes() -> None:
+    """Test that arrays exceeding the maximum size are not allocated."""
+    # Prepare
+    tasks = [_make_task_ins([1024, 1024])]
+    chunks = list(iter_array_chunks(strip_large_arrays(tasks, 100), 100))
+    assembler = ArrayChunkAssembler(max_bytes=1500)
+    assembler.add(chunks[0])
+    chunks[-1].total_size = 2**62
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        assembler.add(chunks[-1])
+
+
+def test_add_chunk_exceeding_max_array_bytes() -> None:
+    """Test that arrays larger than the maximum array size are not allocated."""
+    # Prepare
+    tasks = [_make_task_ins([1024, 2048])]
+    chunks = list(iter_array_chunks(strip_large_arrays(tasks, 100), 100))
+    assembler = ArrayChunkAssembler(max_array_bytes=1024)
+    assembler.add(chunks[0])
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        assembler.add(chunks[-1])
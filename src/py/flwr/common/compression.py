@@ -0,0 +1,281 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Lossy compression of model updates relative to a reference model."""
+
+
+import math
+import threading
+from logging import INFO
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .logger import log
+from .parameter import (
+    ndarray_to_raw_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+    raw_bytes_to_ndarray,
+)
+from .secure_aggregation.quantization import dequantize, quantize
+from .typing import FitRes, Metrics, NDArray, NDArrays, Parameters, Scalar
+
+COMPRESSED_TENSOR_TYPE_PREFIX = "compressed."
+COMPRESSION_METHODS = ("fp16", "bf16", "int8", "topk")
+
+# Keys of the metrics reporting the size of a compressed update
+METRICS_COMPRESSED_BYTES = "compression.compressed_bytes"
+METRICS_UNCOMPRESSED_BYTES = "compression.uncompressed_bytes"
+
+# Number of tensors used to encode a single layer
+_TENSORS_PER_LAYER = {"fp16": 1, "bf16": 1, "int8": 2, "topk": 2}
+_INT8_TARGET_RANGE = 254
+
+
+def is_compressed(parameters: Parameters) -> bool:
+    """Check if the parameters hold a compressed update."""
+    return parameters.tensor_type.startswith(COMPRESSED_TENSOR_TYPE_PREFIX)
+
+
+def compress_update(
+    ndarrays: NDArrays,
+    reference: NDArrays,
+    method: str,
+    topk_ratio: float = 0.01,
+) -> Parameters:
+    """Encode NumPy ndarrays as a compressed delta from a reference model.
+
+    Floating point layers are encoded as the difference to the respective layer of
+    `reference`. Other layers (e.g. counters) are sent as-is.
+
+    Parameters
+    ----------
+    ndarrays : NDArrays
+        The updated model.
+    reference : NDArrays
+        The model from which `ndarrays` was derived, usually the global model
+        received from the server.
+    method : str
+        One of "fp16" (half precision), "bf16" (bfloat16), "int8" (stochastic
+        8-bit quantization), or "topk" (the largest `topk_ratio` fraction of the
+        values of each layer, as index/value pairs).
+    topk_ratio : float (default: 0.01)
+        The fraction of values to keep per layer when `method` is "topk".
+
+    Returns
+    -------
+    compressed : Parameters
+        The compressed update, which can be decoded with `decompress_update`.
+    """
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(f"Unsupported compression method: '{method}'")
+    if not 0.0 < topk_ratio <= 1.0:
+        raise ValueError("The top-k ratio should be in (0, 1].")
+    _check_compatible(ndarrays, reference)
+
+    tensors: List[bytes] = []
+    for ndarray, ref in zip(ndarrays, reference):
+        if not np.issubdtype(ref.dtype, np.floating):
+            tensors.append(ndarray_to_raw_bytes(ndarray))
+            tensors.extend([b""] * (_TENSORS_PER_LAYER[method] - 1))
+            continue
+        delta = np.subtract(ndarray, ref, dtype=np.float32)
+        tensors.extend(_ENCODERS[method](delta, topk_ratio))
+    return Parameters(
+        tensors=tensors, tensor_type=f"{COMPRESSED_TENSOR_TYPE_PREFIX}{method}"
+    )
+
+
+def decompress_update(parameters: Parameters, reference: NDArrays) -> NDArrays:
+    """Decode a compressed update and apply it to the reference model."""
+    if not is_compressed(parameters):
+        raise ValueError(f"Not a compressed update: '{parameters.tensor_type}'")
+    method = parameters.tensor_type[len(COMPRESSED_TENSOR_TYPE_PREFIX) :]
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(f"Unsupported compression method: '{method}'")
+    per_layer = _TENSORS_PER_LAYER[method]
+    if len(parameters.tensors) != per_layer * len(reference):
+        raise ValueError(
+            f"Expected {per_layer * len(reference)} tensors for {len(reference)} "
+            f"layers, got {len(parameters.tensors)}."
+        )
+
+    ndarrays: NDArrays = []
+    for idx, ref in enumerate(reference):
+        tensors = parameters.tensors[idx * per_layer : (idx + 1) * per_layer]
+        if not np.issubdtype(ref.dtype, np.floating):
+            ndarrays.append(raw_bytes_to_ndarray(tensors[0]).copy())
+            continue
+        delta = _DECODERS[method](tensors, ref.size).reshape(ref.shape)
+        ndarrays.append((ref + delta).astype(ref.dtype, copy=False))
+    return ndarrays
+
+
+def decompress_fit_res(fit_res: FitRes, reference: NDArrays) -> None:
+    """Replace a compressed update in `fit_res` by the decoded model in place."""
+    ndarrays = decompress_update(fit_res.parameters, reference)
+    fit_res.parameters = ndarrays_to_parameters(ndarrays)
+
+
+class ReferenceCache:
+    """Decode the reference models of a round once, on first use.
+
+    Strategies usually send the same `Parameters` object to all clients of a round,
+    so it only needs to be decoded once to decompress all of their updates.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Keep the `Parameters` alive so that their id is not reused
+        self._decoded: Dict[int, Tuple[Parameters, NDArrays]] = {}
+
+    def get(self, parameters: Parameters) -> NDArrays:
+        """Return `parameters` as NumPy ndarrays, decoding them only once."""
+        with self._lock:
+            entry = self._decoded.get(id(parameters))
+            if entry is None:
+                entry = (parameters, parameters_to_ndarrays(parameters))
+                self._decoded[id(parameters)] = entry
+            return entry[1]
+
+
+def compression_metrics(ndarrays: NDArrays, parameters: Parameters) -> Metrics:
+    """Return the size of a compressed update and of the model it encodes."""
+    return {
+        METRICS_COMPRESSED_BYTES: sum(len(tensor) for tensor in parameters.tensors),
+        METRICS_UNCOMPRESSED_BYTES: sum(ndarray.nbytes for ndarray in ndarrays),
+    }
+
+
+def aggregate_compression_metrics(metrics: List[Metrics]) -> Dict[str, Scalar]:
+    """Sum and log the compression metrics reported by the clients of a round.
+
+    Returns an empty dict if none of the clients compressed its update.
+    """
+    compressed, uncompressed = 0, 0
+    for client_metrics in metrics:
+        if METRICS_COMPRESSED_BYTES not in client_metrics:
+            continue
+        compressed += int(client_metrics[METRICS_COMPRESSED_BYTES])
+        uncompressed += int(client_metrics.get(METRICS_UNCOMPRESSED_BYTES, 0))
+    if compressed == 0:
+        return {}
+    log(
+        INFO,
+        "aggregate_fit: received compressed updates of %s bytes (%s bytes "
+        "uncompressed)",
+        compressed,
+        uncompressed,
+    )
+    return {
+        METRICS_COMPRESSED_BYTES: compressed,
+        METRICS_UNCOMPRESSED_BYTES: uncompressed,
+    }
+
+
+def _check_compatible(ndarrays: NDArrays, reference: NDArrays) -> None:
+    if len(ndarrays) != len(reference):
+        raise ValueError(
+            f"Expected {len(reference)} layers, got {len(ndarrays)} layers."
+        )
+    for idx, (ndarray, ref) in enumerate(zip(ndarrays, reference)):
+        if ndarray.shape != ref.shape:
+            raise ValueError(
+                f"Layer {idx} has shape {ndarray.shape}, expected {ref.shape}."
+            )
+
+
+def _encode_fp16(delta: NDArray, _: float) -> List[bytes]:
+    return [ndarray_to_raw_bytes(delta.astype(np.float16))]
+
+
+def _decode_fp16(tensors: List[bytes], _: int) -> NDArray:
+    return raw_bytes_to_ndarray(tensors[0]).astype(np.float32)
+
+
+def _encode_bf16(delta: NDArray, _: float) -> List[bytes]:
+    # Keep the upper 16 bits of each float32, rounding to nearest even
+    bits = delta.view(np.uint32)
+    rounding = np.uint32(0x7FFF) + ((bits >> np.uint32(16)) & np.uint32(1))
+    upper = ((bits + rounding) >> np.uint32(16)).astype(np.uint16)
+    return [ndarray_to_raw_bytes(upper)]
+
+
+def _decode_bf16(tensors: List[bytes], _: int) -> NDArray:
+    upper = raw_bytes_to_ndarray(tensors[0])
+    return (upper.astype(np.uint32) << np.uint32(16)).view(np.float32)
+
+
+def _encode_int8(delta: NDArray, _: float) -> List[bytes]:
+    clipping_range = float(np.max(np.abs(delta))) if delta.size else 0.0
+    if clipping_range == 0.0:
+        quantized = np.zeros(delta.shape, dtype=np.int8)
+    else:
+        # Stochastic rounding keeps the quantized update unbiased
+        shifted = quantize([delta], clipping_range, _INT8_TARGET_RANGE)[0]
+        quantized = (shifted - _INT8_TARGET_RANGE // 2).astype(np.int8)
+    return [
+        ndarray_to_raw_bytes(np.array([clipping_range], dtype=np.float64)),
+        ndarray_to_raw_bytes(quantized),
+    ]
+
+
+def _decode_int8(tensors: List[bytes], _: int) -> NDArray:
+    clipping_range = float(raw_bytes_to_ndarray(tensors[0])[0])
+    quantized = raw_bytes_to_ndarray(tensors[1])
+    if clipping_range == 0.0:
+        return np.zeros(quantized.shape, dtype=np.float32)
+    shifted = quantized.astype(np.int32) + _INT8_TARGET_RANGE // 2
+    return dequantize([shifted], clipping_range, _INT8_TARGET_RANGE)[0].astype(
+        np.float32
+    )
+
+
+def _encode_topk(delta: NDArray, topk_ratio: float) -> List[bytes]:
+    flat = delta.reshape(-1)
+    k = min(flat.size, max(1, math.ceil(topk_ratio * flat.size)))
+    if k < flat.size:
+        indices = np.sort(np.argpartition(np.abs(flat), -k)[-k:])
+    else:
+        indices = np.arange(flat.size)
+    index_dtype = np.uint32 if flat.size <= np.iinfo(np.uint32).max else np.int64
+    return [
+        ndarray_to_raw_bytes(indices.astype(index_dtype)),
+        ndarray_to_raw_bytes(flat[indices]),
+    ]
+
+
+def _decode_topk(tensors: List[bytes], size: int) -> NDArray:
+    indices = raw_bytes_to_ndarray(tensors[0])
+    values = raw_bytes_to_ndarray(tensors[1])
+    if indices.size and int(indices.max()) >= size:
+        raise ValueError("Top-k index out of bounds.")
+    delta = np.zeros(size, dtype=np.float32)
+    delta[indices] = values
+    return delta
+
+
+_ENCODERS = {
+    "fp16": _encode_fp16,
+    "bf16": _encode_bf16,
+    "int8": _encode_int8,
+    "topk": _encode_topk,
+}
+_DECODERS = {
+    "fp16": _decode_fp16,
+    "bf16": _decode_bf16,
+    "int8": _decode_int8,
+    "topk": _decode_topk,
+}
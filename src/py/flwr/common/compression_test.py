@@ -0,0 +1,169 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for update compression."""
+
+
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from .compression import (
+    METRICS_COMPRESSED_BYTES,
+    METRICS_UNCOMPRESSED_BYTES,
+    ReferenceCache,
+    aggregate_compression_metrics,
+    compress_update,
+    compression_metrics,
+    decompress_update,
+    is_compressed,
+)
+from .parameter import ndarrays_to_parameters
+from .typing import Metrics, NDArrays
+
+
+def _models() -> Tuple[NDArrays, NDArrays]:
+    rng = np.random.default_rng(42)
+    reference: NDArrays = [
+        rng.standard_normal((8, 16)).astype(np.float32),
+        rng.standard_normal(16),
+        np.array(7, dtype=np.int64),
+    ]
+    updated: NDArrays = [
+        reference[0] + rng.standard_normal((8, 16)).astype(np.float32) * 0.1,
+        reference[1] + rng.standard_normal(16) * 0.1,
+        np.array(8, dtype=np.int64),
+    ]
+    return updated, reference
+
+
+@pytest.mark.parametrize(
+    "method, atol", [("fp16", 1e-3), ("bf16", 2e-3), ("int8", 5e-3)]
+)
+def test_compress_roundtrip(method: str, atol: float) -> None:
+    """Test lossy compression stays close to the original update."""
+    # Prepare
+    updated, reference = _models()
+
+    # Execute
+    parameters = compress_update(updated, reference, method)
+    decoded = decompress_update(parameters, reference)
+
+    # Assert
+    assert is_compressed(parameters)
+    assert len(decoded) == len(updated)
+    for dec, upd in zip(decoded, updated):
+        assert dec.dtype == upd.dtype
+        assert dec.shape == upd.shape
+        np.testing.assert_allclose(dec, upd, atol=atol)
+    assert decoded[2] == 8
+
+
+def test_compress_topk_keeps_largest_values() -> None:
+    """Test top-k compression keeps the values with the largest change."""
+    # Prepare
+    reference: NDArrays = [np.zeros((4, 5), dtype=np.float32)]
+    delta = np.zeros(20, dtype=np.float32)
+    delta[[3, 11, 17]] = [5.0, -7.0, 0.5]
+    delta[[0, 1]] = [0.1, -0.1]
+    updated: NDArrays = [delta.reshape(4, 5)]
+
+    # Execute
+    parameters = compress_update(updated, reference, "topk", topk_ratio=0.15)
+    decoded = decompress_update(parameters, reference)
+
+    # Assert
+    expected = np.zeros(20, dtype=np.float32)
+    expected[[3, 11, 17]] = [5.0, -7.0, 0.5]
+    np.testing.assert_array_equal(decoded[0], expected.reshape(4, 5))
+
+
+def test_compress_reduces_size() -> None:
+    """Test the reported size of a compressed update."""
+    # Prepare
+    updated, reference = _models()
+
+    # Execute
+    parameters = compress_update(updated, reference, "int8")
+    metrics = compression_metrics(updated, parameters)
+
+    # Assert
+    assert metrics[METRICS_UNCOMPRESSED_BYTES] == sum(x.nbytes for x in updated)
+    assert int(metrics[METRICS_COMPRESSED_BYTES]) < int(
+        metrics[METRICS_UNCOMPRESSED_BYTES]
+    )
+
+
+def test_compress_incompatible_models() -> None:
+    """Test compression rejects a model that does not match the reference."""
+    # Prepare
+    updated, reference = _models()
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        compress_update(updated[:2], reference, "fp16")
+    with pytest.raises(ValueError):
+        compress_update([np.zeros(3), *updated[1:]], reference, "fp16")
+    with pytest.raises(ValueError):
+        compress_update(updated, reference, "zip")
+
+
+def test_decompress_uncompressed_parameters() -> None:
+    """Test decoding parameters which do not hold a compressed update."""
+    # Prepare
+    updated, reference = _models()
+
+    # Execute & Assert
+    with pytest.raises(ValueError):
+        decompress_update(ndarrays_to_parameters(updated), reference)
+
+
+def test_aggregate_compression_metrics() -> None:
+    """Test summing the compression metrics of a round."""
+    # Prepare
+    metrics: List[Metrics] = [
+        {METRICS_COMPRESSED_BYTES: 10, METRICS_UNCOMPRESSED_BYTES: 40},
+        {"accuracy": 0.5},
+        {METRICS_COMPRESSED_BYTES: 5, METRICS_UNCOMPRESSED_BYTES: 40},
+    ]
+
+    # Execute
+    aggregated = aggregate_compression_metrics(metrics)
+
+    # Assert
+    assert aggregated == {
+        METRICS_COMPRESSED_BYTES: 15,
+        METRICS_UNCOMPRESSED_BYTES: 80,
+    }
+    assert not aggregate_compression_metrics([{"accuracy": 0.5}])
+
+
+def test_reference_cache() -> None:
+    """Test that each reference model is decoded only once."""
+    # Prepare
+    _, reference = _models()
+    parameters = ndarrays_to_parameters(reference)
+    references = ReferenceCache()
+
+    # Execute
+    first = references.get(parameters)
+    second = references.get(parameters)
+    other = references.get(ndarrays_to_parameters(reference))
+
+    # Assert
+    assert first is second
+    assert other is not first
+    for ndarray, ref in zip(first, reference):
+        np.testing.assert_array_equal(ndarray, ref)
@@ -46,6 +46,16 @@ PING_BASE_MULTIPLIER = 0.8
 PING_RANDOM_RANGE = (-0.1, 0.1)
 PING_MAX_INTERVAL = 1e300
 
+# Constants for streaming large arrays over the Fleet API
+ARRAY_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MiB
+ARRAY_STREAM_MAX_BYTES = 4 * 1024 * 1024 * 1024  # 4 GiB, total of all arrays
+
+# Maximum time in seconds the SuperLink blocks a single long-polling request
+PULL_MAX_WAIT = 10.0
+# Maximum number of long-polling requests the SuperLink blocks at once. Further
+# requests are answered right away
+PULL_MAX_WAITERS = 256
+
 # IDs
 RUN_ID_NUM_BYTES = 8
 NODE_ID_NUM_BYTES = 8
@@ -92,6 +102,7 @@ class SType:
     """Serialisation type."""
 
     NUMPY = "numpy.ndarray"
+    NUMPY_RAW = "numpy.raw"
 
     def __new__(cls) -> SType:
         """Prevent instantiation."""
@@ -105,6 +116,7 @@ class ErrorCode:
     LOAD_CLIENT_APP_EXCEPTION = 1
     CLIENT_APP_RAISED_EXCEPTION = 2
     NODE_UNAVAILABLE = 3
+    ARRAY_NOT_CACHED = 4
 
     def __new__(cls) -> ErrorCode:
         """Prevent instantiation."""
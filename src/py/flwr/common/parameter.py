@@ -16,22 +16,48 @@
 
 
 from io import BytesIO
-from typing import cast
+from typing import Any, Callable, Dict, Tuple, cast
 
 import numpy as np
 
+from .constant import SType
 from .typing import NDArray, NDArrays, Parameters
 
+# Header of the raw format: length prefix, then "<dtype>;<dim>,<dim>,..." in ASCII,
+# padded with spaces such that the data buffer starts at an aligned offset
+RAW_HEADER_LEN_BYTES = 4
+RAW_HEADER_ALIGNMENT = 16
 
-def ndarrays_to_parameters(ndarrays: NDArrays) -> Parameters:
-    """Convert NumPy ndarrays to parameters object."""
-    tensors = [ndarray_to_bytes(ndarray) for ndarray in ndarrays]
-    return Parameters(tensors=tensors, tensor_type="numpy.ndarray")
+
+def ndarrays_to_parameters(
+    ndarrays: NDArrays, tensor_type: str = SType.NUMPY
+) -> Parameters:
+    """Convert NumPy ndarrays to parameters object.
+
+    Parameters
+    ----------
+    ndarrays : NDArrays
+        The NumPy ndarrays to serialize.
+    tensor_type : str (default: "numpy.ndarray")
+        The serialization format. Use `SType.NUMPY` ("numpy.ndarray") for the
+        `np.save` format or `SType.NUMPY_RAW` ("numpy.raw") to send the contiguous
+        buffer of each array as-is, which is decoded without copying.
+    """
+    if tensor_type not in _SERIALIZERS:
+        raise ValueError(f"Unsupported tensor type: '{tensor_type}'")
+    serialize = _SERIALIZERS[tensor_type]
+    tensors = [serialize(ndarray) for ndarray in ndarrays]
+    return Parameters(tensors=tensors, tensor_type=tensor_type)
 
 
 def parameters_to_ndarrays(parameters: Parameters) -> NDArrays:
-    """Convert parameters object to NumPy ndarrays."""
-    return [bytes_to_ndarray(tensor) for tensor in parameters.tensors]
+    """Convert parameters object to NumPy ndarrays.
+
+    Tensors of type `SType.NUMPY_RAW` are returned as read-only views over the
+    serialized bytes. Any other tensor type is read using `np.load`.
+    """
+    deserialize = _DESERIALIZERS.get(parameters.tensor_type, bytes_to_ndarray)
+    return [deserialize(tensor) for tensor in parameters.tensors]
 
 
 def ndarray_to_bytes(ndarray: NDArray) -> bytes:
@@ -52,3 +78,56 @@ def bytes_to_ndarray(tensor: bytes) -> NDArray:
     # Source: https://numpy.org/doc/stable/reference/generated/numpy.load.html
     ndarray_deserialized = np.load(bytes_io, allow_pickle=False)
     return cast(NDArray, ndarray_deserialized)
+
+
+def ndarray_to_raw_bytes(ndarray: NDArray) -> bytes:
+    """Serialize NumPy ndarray to a raw buffer prefixed by its dtype and shape.
+
+    Unlike `ndarray_to_bytes`, the data of a C-contiguous array is copied only once.
+    """
+    if ndarray.dtype.hasobject or ndarray.dtype.fields is not None:
+        raise TypeError(f"Unsupported dtype for raw serialization: {ndarray.dtype}")
+    shape = ",".join(str(dim) for dim in ndarray.shape)
+    header = f"{ndarray.dtype.str};{shape}".encode("ascii")
+    padding = -(RAW_HEADER_LEN_BYTES + len(header)) % RAW_HEADER_ALIGNMENT
+    header += b" " * padding
+    return b"".join(
+        [
+            len(header).to_bytes(RAW_HEADER_LEN_BYTES, "little"),
+            header,
+            np.ascontiguousarray(ndarray).reshape(-1).view(np.uint8).data,
+        ]
+    )
+
+
+def raw_bytes_to_ndarray(tensor: bytes) -> NDArray:
+    """Deserialize NumPy ndarray from a raw buffer without copying.
+
+    The returned array is a read-only view over `tensor`.
+    """
+    dtype, shape, offset = parse_raw_bytes_header(tensor)
+    ndarray = np.frombuffer(tensor, dtype=dtype, offset=offset)
+    return ndarray.reshape(shape)
+
+
+def parse_raw_bytes_header(tensor: bytes) -> Tuple[Any, Tuple[int, ...], int]:
+    """Return dtype, shape, and data offset of a raw buffer."""
+    header_len = int.from_bytes(tensor[:RAW_HEADER_LEN_BYTES], "little")
+    offset = RAW_HEADER_LEN_BYTES + header_len
+    header = tensor[RAW_HEADER_LEN_BYTES:offset].decode("ascii").rstrip()
+    dtype_str, shape_str = header.split(";")
+    dtype = np.dtype(dtype_str)
+    if dtype.hasobject:
+        raise TypeError(f"Unsupported dtype for raw deserialization: {dtype}")
+    shape = tuple(int(dim) for dim in shape_str.split(",") if dim)
+    return dtype, shape, offset
+
+
+_SERIALIZERS: Dict[str, Callable[[NDArray], bytes]] = {
+    SType.NUMPY: ndarray_to_bytes,
+    SType.NUMPY_RAW: ndarray_to_raw_bytes,
+}
+_DESERIALIZERS: Dict[str, Callable[[bytes], NDArray]] = {
+    SType.NUMPY: bytes_to_ndarray,
+    SType.NUMPY_RAW: raw_bytes_to_ndarray,
+}
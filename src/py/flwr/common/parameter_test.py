@@ -21,7 +21,16 @@ tests.
 import numpy as np
 import pytest
 
-from .parameter import bytes_to_ndarray, ndarray_to_bytes
+from .constant import SType
+from .parameter import (
+    bytes_to_ndarray,
+    ndarray_to_bytes,
+    ndarray_to_raw_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
+    raw_bytes_to_ndarray,
+)
+from .typing import NDArray, NDArrays
 
 
 def test_serialisation_deserialisation() -> None:
@@ -37,3 +46,56 @@ def test_serialisation_deserialisation() -> None:
     # Test false positive
     with pytest.raises(AssertionError, match="Arrays are not equal"):
         np.testing.assert_equal(arr_deserialized, np.ones((3, 2)))
+
+
+@pytest.mark.parametrize(
+    "arr",
+    [
+        np.array([[1, 2], [3, 4], [5, 6]]),
+        np.arange(12, dtype=">i4").reshape((3, 4)),
+        np.random.randn(5, 6).astype(np.float16)[:, ::2],
+        np.zeros((0, 3), dtype=np.float32),
+        np.array(3.14),
+        np.array([True, False, True]),
+    ],
+)
+def test_raw_serialisation_deserialisation(arr: NDArray) -> None:
+    """Test if the np.ndarray is identical after raw (de-)serialization."""
+    # Execute
+    arr_serialized = ndarray_to_raw_bytes(arr)
+    arr_deserialized = raw_bytes_to_ndarray(arr_serialized)
+
+    # Assert
+    assert arr_deserialized.dtype == arr.dtype
+    assert arr_deserialized.shape == arr.shape
+    np.testing.assert_equal(arr_deserialized, arr)
+    # Deserialized array is a view over the serialized bytes
+    assert not arr_deserialized.flags.writeable
+
+
+def test_raw_serialisation_object_dtype() -> None:
+    """Test that object arrays cannot be serialized with the raw format."""
+    with pytest.raises(TypeError):
+        ndarray_to_raw_bytes(np.array([{"a": 1}], dtype=object))
+
+
+@pytest.mark.parametrize("tensor_type", [SType.NUMPY, SType.NUMPY_RAW])
+def test_ndarrays_to_parameters_and_back(tensor_type: str) -> None:
+    """Test conversion NDArrays --> Parameters --> NDArrays."""
+    # Prepare
+    ndarrays: NDArrays = [np.random.randn(3, 4), np.arange(7, dtype=np.int8)]
+
+    # Execute
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=tensor_type)
+    ndarrays_ = parameters_to_ndarrays(parameters)
+
+    # Assert
+    assert parameters.tensor_type == tensor_type
+    for arr, arr_ in zip(ndarrays, ndarrays_):
+        np.testing.assert_equal(arr, arr_)
+
+
+def test_ndarrays_to_parameters_unsupported_tensor_type() -> None:
+    """Test that an unknown tensor type raises an error."""
+    with pytest.raises(ValueError):
+        ndarrays_to_parameters([np.ones(3)], tensor_type="unknown")
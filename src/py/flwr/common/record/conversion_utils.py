@@ -20,21 +20,31 @@ from io import BytesIO
 import numpy as np
 
 from ..constant import SType
+from ..parameter import ndarray_to_raw_bytes
 from ..typing import NDArray
 from .parametersrecord import Array
 
 
-def array_from_numpy(ndarray: NDArray) -> Array:
-    """Create Array from NumPy ndarray."""
-    buffer = BytesIO()
-    # WARNING: NEVER set allow_pickle to true.
-    # Reason: loading pickled data can execute arbitrary code
-    # Source: https://numpy.org/doc/stable/reference/generated/numpy.save.html
-    np.save(buffer, ndarray, allow_pickle=False)
-    data = buffer.getvalue()
+def array_from_numpy(ndarray: NDArray, stype: str = SType.NUMPY) -> Array:
+    """Create Array from NumPy ndarray.
+
+    Set `stype` to `SType.NUMPY_RAW` to store the contiguous buffer of the ndarray
+    as-is instead of using the `np.save` format.
+    """
+    if stype == SType.NUMPY_RAW:
+        data = ndarray_to_raw_bytes(ndarray)
+    elif stype == SType.NUMPY:
+        buffer = BytesIO()
+        # WARNING: NEVER set allow_pickle to true.
+        # Reason: loading pickled data can execute arbitrary code
+        # Source: https://numpy.org/doc/stable/reference/generated/numpy.save.html
+        np.save(buffer, ndarray, allow_pickle=False)
+        data = buffer.getvalue()
+    else:
+        raise ValueError(f"Unsupported serialization type: '{stype}'")
     return Array(
         dtype=str(ndarray.dtype),
         shape=list(ndarray.shape),
-        stype=SType.NUMPY,
+        stype=stype,
         data=data,
     )
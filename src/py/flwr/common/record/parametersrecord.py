@@ -21,6 +21,7 @@ from typing import List, Optional, OrderedDict, cast
 import numpy as np
 
 from ..constant import SType
+from ..parameter import raw_bytes_to_ndarray
 from ..typing import NDArray
 from .typeddict import TypedDict
 
@@ -56,7 +57,13 @@ class Array:
     data: bytes
 
     def numpy(self) -> NDArray:
-        """Return the array as a NumPy array."""
+        """Return the array as a NumPy array.
+
+        Arrays serialized with `SType.NUMPY_RAW` are returned as read-only views over
+        `data`, without copying.
+        """
+        if self.stype == SType.NUMPY_RAW:
+            return raw_bytes_to_ndarray(self.data)
         if self.stype != SType.NUMPY:
             raise TypeError(
                 f"Unsupported serialization type for numpy conversion: '{self.stype}'"
@@ -26,6 +26,7 @@ from flwr.common import ndarray_to_bytes
 
 from ..constant import SType
 from ..typing import NDArray
+from .conversion_utils import array_from_numpy
 from .parametersrecord import Array, ParametersRecord
 
 
@@ -58,6 +59,20 @@ class TestArray(unittest.TestCase):
         # Assert
         np.testing.assert_array_equal(converted_array, original_array)
 
+    def test_numpy_conversion_raw(self) -> None:
+        """Test the numpy method with a raw Array instance."""
+        # Prepare
+        original_array = np.arange(6, dtype=np.float32).reshape((2, 3))
+        array_instance = array_from_numpy(original_array, stype=SType.NUMPY_RAW)
+
+        # Execute
+        converted_array = array_instance.numpy()
+
+        # Assert
+        assert array_instance.shape == [2, 3]
+        assert array_instance.dtype == "float32"
+        np.testing.assert_array_equal(converted_array, original_array)
+
     def test_numpy_conversion_invalid(self) -> None:
         """Test the numpy method with invalid Array instance."""
         # Prepare
@@ -18,6 +18,8 @@
 from typing import Dict, Mapping, OrderedDict, Tuple, Union, cast, get_args
 
 from . import Array, ConfigsRecord, MetricsRecord, ParametersRecord, RecordSet
+from .constant import SType
+from .parameter import parse_raw_bytes_header
 from .typing import (
     Code,
     ConfigsRecordValues,
@@ -82,7 +84,8 @@ def parameters_to_parametersrecord(
 
     Because there is no concept of names in the legacy Parameters, arbitrary keys will
     be used when constructing the ParametersRecord. Similarly, the shape and data type
-    won't be recorded in the Array objects.
+    won't be recorded in the Array objects, unless the tensors are of type
+    `SType.NUMPY_RAW`, which carry this metadata.
 
     Parameters
     ----------
@@ -102,8 +105,14 @@ def parameters_to_parametersrecord(
             tensor = parameters.tensors[idx]
         else:
             tensor = parameters.tensors.pop(0)
+        dtype, shape = "", []
+        if tensor_type == SType.NUMPY_RAW:
+            # Raw tensors carry their metadata, which can be read without
+            # touching (or copying) the data
+            raw_dtype, raw_shape, _ = parse_raw_bytes_header(tensor)
+            dtype, shape = str(raw_dtype), list(raw_shape)
         ordered_dict[str(idx)] = Array(
-            data=tensor, dtype="", stype=tensor_type, shape=[]
+            data=tensor, dtype=dtype, stype=tensor_type, shape=shape
         )
 
     if num_arrays == 0:
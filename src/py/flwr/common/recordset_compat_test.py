@@ -20,7 +20,8 @@ from typing import Callable, Dict
 import numpy as np
 import pytest
 
-from .parameter import ndarrays_to_parameters
+from .constant import SType
+from .parameter import ndarrays_to_parameters, parameters_to_ndarrays
 from .recordset_compat import (
     evaluateins_to_recordset,
     evaluateres_to_recordset,
@@ -30,6 +31,8 @@ from .recordset_compat import (
     getparametersres_to_recordset,
     getpropertiesins_to_recordset,
     getpropertiesres_to_recordset,
+    parameters_to_parametersrecord,
+    parametersrecord_to_parameters,
     recordset_to_evaluateins,
     recordset_to_evaluateres,
     recordset_to_fitins,
@@ -312,3 +315,24 @@ def test_get_parameters_res_to_recordset_and_back(
     assert validate_freed_fn(
         getparameteres_res, getparameters_res_copy, getparameteres_res_
     )
+
+
+def test_raw_parameters_to_parametersrecord_and_back() -> None:
+    """Test conversion of raw Parameters --> ParametersRecord --> Parameters."""
+    # Prepare
+    ndarrays = get_ndarrays()
+    parameters = ndarrays_to_parameters(ndarrays, tensor_type=SType.NUMPY_RAW)
+
+    # Execute
+    record = parameters_to_parametersrecord(parameters, keep_input=True)
+    parameters_ = parametersrecord_to_parameters(record, keep_input=True)
+
+    # Assert
+    for arr, array in zip(ndarrays, record.values()):
+        assert array.stype == SType.NUMPY_RAW
+        assert array.shape == list(arr.shape)
+        assert array.dtype == str(arr.dtype)
+        np.testing.assert_array_equal(array.numpy(), arr)
+    assert parameters_ == parameters
+    for arr, arr_ in zip(ndarrays, parameters_to_ndarrays(parameters_)):
+        np.testing.assert_array_equal(arr, arr_)
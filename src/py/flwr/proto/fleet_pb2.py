@@ -17,7 +17,7 @@ from flwr.proto import task_pb2 as flwr_dot_proto_dot_task__pb2
 from flwr.proto import run_pb2 as flwr_dot_proto_dot_run__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x66lwr/proto/fleet.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\x1a\x14\x66lwr/proto/run.proto\"*\n\x11\x43reateNodeRequest\x12\x15\n\rping_interval\x18\x01 \x01(\x01\"4\n\x12\x43reateNodeResponse\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"3\n\x11\x44\x65leteNodeRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"\x14\n\x12\x44\x65leteNodeResponse\"D\n\x0bPingRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x15\n\rping_interval\x18\x02 \x01(\x01\"\x1f\n\x0cPingResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"F\n\x12PullTaskInsRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"k\n\x13PullTaskInsResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12*\n\rtask_ins_list\x18\x02 \x03(\x0b\x32\x13.flwr.proto.TaskIns\"@\n\x12PushTaskResRequest\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes\"\xae\x01\n\x13PushTaskResResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12=\n\x07results\x18\x02 \x03(\x0b\x32,.flwr.proto.PushTaskResResponse.ResultsEntry\x1a.\n\x0cResultsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\r:\x02\x38\x01\"\x1e\n\tReconnect\x12\x11\n\treconnect\x18\x01 \x01(\x04\x32\xc9\x03\n\x05\x46leet\x12M\n\nCreateNode\x12\x1d.flwr.proto.CreateNodeRequest\x1a\x1e.flwr.proto.CreateNodeResponse\"\x00\x12M\n\nDeleteNode\x12\x1d.flwr.proto.DeleteNodeRequest\x1a\x1e.flwr.proto.DeleteNodeResponse\"\x00\x12;\n\x04Ping\x12\x17.flwr.proto.PingRequest\x1a\x18.flwr.proto.PingResponse\"\x00\x12P\n\x0bPullTaskIns\x12\x1e.flwr.proto.PullTaskInsRequest\x1a\x1f.flwr.proto.PullTaskInsResponse\"\x00\x12P\n\x0bPushTaskRes\x12\x1e.flwr.proto.PushTaskResRequest\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00\x12\x41\n\x06GetRun\x12\x19.flwr.proto.GetRunRequest\x1a\x1a.flwr.proto.GetRunResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x66lwr/proto/fleet.proto\x12\nflwr.proto\x1a\x15\x66lwr/proto/node.proto\x1a\x15\x66lwr/proto/task.proto\x1a\x14\x66lwr/proto/run.proto\"*\n\x11\x43reateNodeRequest\x12\x15\n\rping_interval\x18\x01 \x01(\x01\"4\n\x12\x43reateNodeResponse\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"3\n\x11\x44\x65leteNodeRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\"\x14\n\x12\x44\x65leteNodeResponse\"D\n\x0bPingRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x15\n\rping_interval\x18\x02 \x01(\x01\"\x1f\n\x0cPingResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x87\x01\n\x12PullTaskInsRequest\x12\x1e\n\x04node\x18\x01 \x01(\x0b\x32\x10.flwr.proto.Node\x12\x10\n\x08task_ids\x18\x02 \x03(\t\x12\x0f\n\x07timeout\x18\x03 \x01(\x01\x12.\n\rcached_arrays\x18\x04 \x03(\x0b\x32\x17.flwr.proto.ArrayDigest\"\x9e\x01\n\x13PullTaskInsResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12*\n\rtask_ins_list\x18\x02 \x03(\x0b\x32\x13.flwr.proto.TaskIns\x12\x31\n\rcached_arrays\x18\x03 \x03(\x0b\x32\x1a.flwr.proto.CachedArrayRef\"@\n\x12PushTaskResRequest\x12*\n\rtask_res_list\x18\x01 \x03(\x0b\x32\x13.flwr.proto.TaskRes\"\xae\x01\n\x13PushTaskResResponse\x12(\n\treconnect\x18\x01 \x01(\x0b\x32\x15.flwr.proto.Reconnect\x12=\n\x07results\x18\x02 \x03(\x0b\x32,.flwr.proto.PushTaskResResponse.ResultsEntry\x1a.\n\x0cResultsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\r:\x02\x38\x01\"\x1e\n\tReconnect\x12\x11\n\treconnect\x18\x01 \x01(\x04\"+\n\x0b\x41rrayDigest\x12\x0e\n\x06sha256\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\"]\n\x0e\x43\x61\x63hedArrayRef\x12\x12\n\ntask_index\x18\x01 \x01(\r\x12\x12\n\nrecord_key\x18\x02 \x01(\t\x12\x13\n\x0b\x61rray_index\x18\x03 \x01(\r\x12\x0e\n\x06sha256\x18\x04 \x01(\t\"{\n\nArrayChunk\x12\x12\n\ntask_index\x18\x01 \x01(\r\x12\x12\n\nrecord_key\x18\x02 \x01(\t\x12\x13\n\x0b\x61rray_index\x18\x03 \x01(\r\x12\x0e\n\x06offset\x18\x04 \x01(\x04\x12\x12\n\ntotal_size\x18\x05 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x06 \x01(\x0c\"\x84\x01\n\x19PullTaskInsStreamResponse\x12\x33\n\x08response\x18\x01 \x01(\x0b\x32\x1f.flwr.proto.PullTaskInsResponseH\x00\x12\'\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x16.flwr.proto.ArrayChunkH\x00\x42\t\n\x07payload\"\x81\x01\n\x18PushTaskResStreamRequest\x12\x31\n\x07request\x18\x01 \x01(\x0b\x32\x1e.flwr.proto.PushTaskResRequestH\x00\x12\'\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x16.flwr.proto.ArrayChunkH\x00\x42\t\n\x07payload2\x89\x05\n\x05\x46leet\x12M\n\nCreateNode\x12\x1d.flwr.proto.CreateNodeRequest\x1a\x1e.flwr.proto.CreateNodeResponse\"\x00\x12M\n\nDeleteNode\x12\x1d.flwr.proto.DeleteNodeRequest\x1a\x1e.flwr.proto.DeleteNodeResponse\"\x00\x12;\n\x04Ping\x12\x17.flwr.proto.PingRequest\x1a\x18.flwr.proto.PingResponse\"\x00\x12P\n\x0bPullTaskIns\x12\x1e.flwr.proto.PullTaskInsRequest\x1a\x1f.flwr.proto.PullTaskInsResponse\"\x00\x12P\n\x0bPushTaskRes\x12\x1e.flwr.proto.PushTaskResRequest\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00\x12^\n\x11PullTaskInsStream\x12\x1e.flwr.proto.PullTaskInsRequest\x1a%.flwr.proto.PullTaskInsStreamResponse\"\x00\x30\x01\x12^\n\x11PushTaskResStream\x12$.flwr.proto.PushTaskResStreamRequest\x1a\x1f.flwr.proto.PushTaskResResponse\"\x00(\x01\x12\x41\n\x06GetRun\x12\x19.flwr.proto.GetRunRequest\x1a\x1a.flwr.proto.GetRunResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -38,18 +38,28 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_PINGREQUEST']._serialized_end=347
   _globals['_PINGRESPONSE']._serialized_start=349
   _globals['_PINGRESPONSE']._serialized_end=380
-  _globals['_PULLTASKINSREQUEST']._serialized_start=382
-  _globals['_PULLTASKINSREQUEST']._serialized_end=452
-  _globals['_PULLTASKINSRESPONSE']._serialized_start=454
-  _globals['_PULLTASKINSRESPONSE']._serialized_end=561
-  _globals['_PUSHTASKRESREQUEST']._serialized_start=563
-  _globals['_PUSHTASKRESREQUEST']._serialized_end=627
-  _globals['_PUSHTASKRESRESPONSE']._serialized_start=630
-  _globals['_PUSHTASKRESRESPONSE']._serialized_end=804
-  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_start=758
-  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_end=804
-  _globals['_RECONNECT']._serialized_start=806
-  _globals['_RECONNECT']._serialized_end=836
-  _globals['_FLEET']._serialized_start=839
-  _globals['_FLEET']._serialized_end=1296
+  _globals['_PULLTASKINSREQUEST']._serialized_start=383
+  _globals['_PULLTASKINSREQUEST']._serialized_end=518
+  _globals['_PULLTASKINSRESPONSE']._serialized_start=521
+  _globals['_PULLTASKINSRESPONSE']._serialized_end=679
+  _globals['_PUSHTASKRESREQUEST']._serialized_start=681
+  _globals['_PUSHTASKRESREQUEST']._serialized_end=745
+  _globals['_PUSHTASKRESRESPONSE']._serialized_start=748
+  _globals['_PUSHTASKRESRESPONSE']._serialized_end=922
+  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_start=876
+  _globals['_PUSHTASKRESRESPONSE_RESULTSENTRY']._serialized_end=922
+  _globals['_RECONNECT']._serialized_start=924
+  _globals['_RECONNECT']._serialized_end=954
+  _globals['_ARRAYDIGEST']._serialized_start=956
+  _globals['_ARRAYDIGEST']._serialized_end=999
+  _globals['_CACHEDARRAYREF']._serialized_start=1001
+  _globals['_CACHEDARRAYREF']._serialized_end=1094
+  _globals['_ARRAYCHUNK']._serialized_start=1096
+  _globals['_ARRAYCHUNK']._serialized_end=1219
+  _globals['_PULLTASKINSSTREAMRESPONSE']._serialized_start=1222
+  _globals['_PULLTASKINSSTREAMRESPONSE']._serialized_end=1354
+  _globals['_PUSHTASKRESSTREAMREQUEST']._serialized_start=1357
+  _globals['_PUSHTASKRESSTREAMREQUEST']._serialized_end=1486
+  _globals['_FLEET']._serialized_start=1489
+  _globals['_FLEET']._serialized_end=2138
 # @@protoc_insertion_point(module_scope)
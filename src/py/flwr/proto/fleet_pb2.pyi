@@ -91,34 +91,53 @@ class PullTaskInsRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     NODE_FIELD_NUMBER: builtins.int
     TASK_IDS_FIELD_NUMBER: builtins.int
+    TIMEOUT_FIELD_NUMBER: builtins.int
+    CACHED_ARRAYS_FIELD_NUMBER: builtins.int
     @property
     def node(self) -> flwr.proto.node_pb2.Node: ...
     @property
     def task_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[typing.Text]: ...
+    timeout: builtins.float
+    """Maximum time in seconds to wait for a TaskIns if none is available yet.
+    The SuperLink may return earlier. 0 returns immediately.
+    """
+
+    @property
+    def cached_arrays(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___ArrayDigest]:
+        """Arrays cached by the SuperNode. The SuperLink leaves the data of these
+        arrays out of the response and lists them in `cached_arrays` instead.
+        """
+        pass
     def __init__(self,
         *,
         node: typing.Optional[flwr.proto.node_pb2.Node] = ...,
         task_ids: typing.Optional[typing.Iterable[typing.Text]] = ...,
+        timeout: builtins.float = ...,
+        cached_arrays: typing.Optional[typing.Iterable[global___ArrayDigest]] = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["node",b"node"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["node",b"node","task_ids",b"task_ids"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["cached_arrays",b"cached_arrays","node",b"node","task_ids",b"task_ids","timeout",b"timeout"]) -> None: ...
 global___PullTaskInsRequest = PullTaskInsRequest
 
 class PullTaskInsResponse(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     RECONNECT_FIELD_NUMBER: builtins.int
     TASK_INS_LIST_FIELD_NUMBER: builtins.int
+    CACHED_ARRAYS_FIELD_NUMBER: builtins.int
     @property
     def reconnect(self) -> global___Reconnect: ...
     @property
     def task_ins_list(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[flwr.proto.task_pb2.TaskIns]: ...
+    @property
+    def cached_arrays(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___CachedArrayRef]: ...
     def __init__(self,
         *,
         reconnect: typing.Optional[global___Reconnect] = ...,
         task_ins_list: typing.Optional[typing.Iterable[flwr.proto.task_pb2.TaskIns]] = ...,
+        cached_arrays: typing.Optional[typing.Iterable[global___CachedArrayRef]] = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal["reconnect",b"reconnect"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["reconnect",b"reconnect","task_ins_list",b"task_ins_list"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["cached_arrays",b"cached_arrays","reconnect",b"reconnect","task_ins_list",b"task_ins_list"]) -> None: ...
 global___PullTaskInsResponse = PullTaskInsResponse
 
 class PushTaskResRequest(google.protobuf.message.Message):
@@ -174,3 +193,114 @@ class Reconnect(google.protobuf.message.Message):
         ) -> None: ...
     def ClearField(self, field_name: typing_extensions.Literal["reconnect",b"reconnect"]) -> None: ...
 global___Reconnect = Reconnect
+
+class ArrayDigest(google.protobuf.message.Message):
+    """Cached arrays
+
+    Arrays are identified by the hex-encoded SHA-256 hash of their data. A
+    CachedArrayRef identifies an array whose data has been left out by the index
+    of the task in the task list, the key of the ParametersRecord in the task's
+    RecordSet, and the index of the array in that ParametersRecord.
+    """
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    SHA256_FIELD_NUMBER: builtins.int
+    SIZE_FIELD_NUMBER: builtins.int
+    sha256: typing.Text
+    size: builtins.int
+    def __init__(self,
+        *,
+        sha256: typing.Text = ...,
+        size: builtins.int = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["sha256",b"sha256","size",b"size"]) -> None: ...
+global___ArrayDigest = ArrayDigest
+
+class CachedArrayRef(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    TASK_INDEX_FIELD_NUMBER: builtins.int
+    RECORD_KEY_FIELD_NUMBER: builtins.int
+    ARRAY_INDEX_FIELD_NUMBER: builtins.int
+    SHA256_FIELD_NUMBER: builtins.int
+    task_index: builtins.int
+    record_key: typing.Text
+    array_index: builtins.int
+    sha256: typing.Text
+    def __init__(self,
+        *,
+        task_index: builtins.int = ...,
+        record_key: typing.Text = ...,
+        array_index: builtins.int = ...,
+        sha256: typing.Text = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["array_index",b"array_index","record_key",b"record_key","sha256",b"sha256","task_index",b"task_index"]) -> None: ...
+global___CachedArrayRef = CachedArrayRef
+
+class ArrayChunk(google.protobuf.message.Message):
+    """Streaming messages
+
+    The first message of a stream contains the tasks, in which the data of large
+    arrays is left empty. It is followed by the chunks of those arrays, each
+    identifying the array by the index of the task in the task list, the key of
+    the ParametersRecord in the task's RecordSet, and the index of the array in
+    that ParametersRecord.
+    """
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    TASK_INDEX_FIELD_NUMBER: builtins.int
+    RECORD_KEY_FIELD_NUMBER: builtins.int
+    ARRAY_INDEX_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    TOTAL_SIZE_FIELD_NUMBER: builtins.int
+    DATA_FIELD_NUMBER: builtins.int
+    task_index: builtins.int
+    record_key: typing.Text
+    array_index: builtins.int
+    offset: builtins.int
+    total_size: builtins.int
+    data: builtins.bytes
+    def __init__(self,
+        *,
+        task_index: builtins.int = ...,
+        record_key: typing.Text = ...,
+        array_index: builtins.int = ...,
+        offset: builtins.int = ...,
+        total_size: builtins.int = ...,
+        data: builtins.bytes = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["array_index",b"array_index","data",b"data","offset",b"offset","record_key",b"record_key","task_index",b"task_index","total_size",b"total_size"]) -> None: ...
+global___ArrayChunk = ArrayChunk
+
+class PullTaskInsStreamResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    RESPONSE_FIELD_NUMBER: builtins.int
+    CHUNK_FIELD_NUMBER: builtins.int
+    @property
+    def response(self) -> global___PullTaskInsResponse: ...
+    @property
+    def chunk(self) -> global___ArrayChunk: ...
+    def __init__(self,
+        *,
+        response: typing.Optional[global___PullTaskInsResponse] = ...,
+        chunk: typing.Optional[global___ArrayChunk] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["chunk",b"chunk","payload",b"payload","response",b"response"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["chunk",b"chunk","payload",b"payload","response",b"response"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["payload",b"payload"]) -> typing.Optional[typing_extensions.Literal["response","chunk"]]: ...
+global___PullTaskInsStreamResponse = PullTaskInsStreamResponse
+
+class PushTaskResStreamRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    REQUEST_FIELD_NUMBER: builtins.int
+    CHUNK_FIELD_NUMBER: builtins.int
+    @property
+    def request(self) -> global___PushTaskResRequest: ...
+    @property
+    def chunk(self) -> global___ArrayChunk: ...
+    def __init__(self,
+        *,
+        request: typing.Optional[global___PushTaskResRequest] = ...,
+        chunk: typing.Optional[global___ArrayChunk] = ...,
+        ) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["chunk",b"chunk","payload",b"payload","request",b"request"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["chunk",b"chunk","payload",b"payload","request",b"request"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["payload",b"payload"]) -> typing.Optional[typing_extensions.Literal["request","chunk"]]: ...
+global___PushTaskResStreamRequest = PushTaskResStreamRequest
@@ -40,6 +40,16 @@ class FleetStub(object):
                 request_serializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResRequest.SerializeToString,
                 response_deserializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResResponse.FromString,
                 )
+        self.PullTaskInsStream = channel.unary_stream(
+                '/flwr.proto.Fleet/PullTaskInsStream',
+                request_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.SerializeToString,
+                response_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsStreamResponse.FromString,
+                )
+        self.PushTaskResStream = channel.stream_unary(
+                '/flwr.proto.Fleet/PushTaskResStream',
+                request_serializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResStreamRequest.SerializeToString,
+                response_deserializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResResponse.FromString,
+                )
         self.GetRun = channel.unary_unary(
                 '/flwr.proto.Fleet/GetRun',
                 request_serializer=flwr_dot_proto_dot_run__pb2.GetRunRequest.SerializeToString,
@@ -86,6 +96,20 @@ class FleetServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PullTaskInsStream(self, request, context):
+        """Retrieve one or more tasks, with large arrays split into bounded chunks
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PushTaskResStream(self, request_iterator, context):
+        """Complete one or more tasks, with large arrays split into bounded chunks
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetRun(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -120,6 +144,16 @@ def add_FleetServicer_to_server(servicer, server):
                     request_deserializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResRequest.FromString,
                     response_serializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResResponse.SerializeToString,
             ),
+            'PullTaskInsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.PullTaskInsStream,
+                    request_deserializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.FromString,
+                    response_serializer=flwr_dot_proto_dot_fleet__pb2.PullTaskInsStreamResponse.SerializeToString,
+            ),
+            'PushTaskResStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.PushTaskResStream,
+                    request_deserializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResStreamRequest.FromString,
+                    response_serializer=flwr_dot_proto_dot_fleet__pb2.PushTaskResResponse.SerializeToString,
+            ),
             'GetRun': grpc.unary_unary_rpc_method_handler(
                     servicer.GetRun,
                     request_deserializer=flwr_dot_proto_dot_run__pb2.GetRunRequest.FromString,
@@ -220,6 +254,40 @@ class Fleet(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def PullTaskInsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/flwr.proto.Fleet/PullTaskInsStream',
+            flwr_dot_proto_dot_fleet__pb2.PullTaskInsRequest.SerializeToString,
+            flwr_dot_proto_dot_fleet__pb2.PullTaskInsStreamResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def PushTaskResStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/flwr.proto.Fleet/PushTaskResStream',
+            flwr_dot_proto_dot_fleet__pb2.PushTaskResStreamRequest.SerializeToString,
+            flwr_dot_proto_dot_fleet__pb2.PushTaskResResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def GetRun(request,
             target,
@@ -6,6 +6,7 @@ import abc
 import flwr.proto.fleet_pb2
 import flwr.proto.run_pb2
 import grpc
+import typing
 
 class FleetStub:
     def __init__(self, channel: grpc.Channel) -> None: ...
@@ -37,6 +38,16 @@ class FleetStub:
     HTTP API path: /api/v1/fleet/push-task-res
     """
 
+    PullTaskInsStream: grpc.UnaryStreamMultiCallable[
+        flwr.proto.fleet_pb2.PullTaskInsRequest,
+        flwr.proto.fleet_pb2.PullTaskInsStreamResponse]
+    """Retrieve one or more tasks, with large arrays split into bounded chunks"""
+
+    PushTaskResStream: grpc.StreamUnaryMultiCallable[
+        flwr.proto.fleet_pb2.PushTaskResStreamRequest,
+        flwr.proto.fleet_pb2.PushTaskResResponse]
+    """Complete one or more tasks, with large arrays split into bounded chunks"""
+
     GetRun: grpc.UnaryUnaryMultiCallable[
         flwr.proto.run_pb2.GetRunRequest,
         flwr.proto.run_pb2.GetRunResponse]
@@ -83,6 +94,22 @@ class FleetServicer(metaclass=abc.ABCMeta):
         """
         pass
 
+    @abc.abstractmethod
+    def PullTaskInsStream(self,
+        request: flwr.proto.fleet_pb2.PullTaskInsRequest,
+        context: grpc.ServicerContext,
+    ) -> typing.Iterator[flwr.proto.fleet_pb2.PullTaskInsStreamResponse]:
+        """Retrieve one or more tasks, with large arrays split into bounded chunks"""
+        pass
+
+    @abc.abstractmethod
+    def PushTaskResStream(self,
+        request_iterator: typing.Iterator[flwr.proto.fleet_pb2.PushTaskResStreamRequest],
+        context: grpc.ServicerContext,
+    ) -> flwr.proto.fleet_pb2.PushTaskResResponse:
+        """Complete one or more tasks, with large arrays split into bounded chunks"""
+        pass
+
     @abc.abstractmethod
     def GetRun(self,
         request: flwr.proto.run_pb2.GetRunRequest,
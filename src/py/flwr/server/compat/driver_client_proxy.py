@@ -15,7 +15,6 @@
 """Flower ClientProxy implementation for Driver API."""
 
 
-import time
 from typing import Optional
 
 from flwr import common
@@ -25,8 +24,6 @@ from flwr.server.client_proxy import ClientProxy
 
 from ..driver.driver import Driver
 
-SLEEP_TIME = 1
-
 
 class DriverClientProxy(ClientProxy):
     """Flower client proxy which delegates work using the Driver API."""
@@ -131,20 +128,16 @@ class DriverClientProxy(ClientProxy):
         if message_id == "":
             raise ValueError(f"Failed to send message to node {self.node_id}")
 
-        if timeout:
-            start_time = time.time()
-
-        while True:
-            messages = list(self.driver.pull_messages(message_ids))
-            if len(messages) == 1:
-                msg: Message = messages[0]
-                if msg.has_error():
-                    raise ValueError(
-                        f"Message contains an Error (reason: {msg.error.reason}). "
-                        "It originated during client-side execution of a message."
-                    )
-                return msg.content
-
-            if timeout is not None and time.time() > start_time + timeout:
-                raise RuntimeError("Timeout reached")
-            time.sleep(SLEEP_TIME)
+        # Wait for the reply
+        messages = list(
+            self.driver.pull_messages_with_wait(message_ids, timeout=timeout)
+        )
+        if len(messages) != 1:
+            raise RuntimeError("Timeout reached")
+        msg: Message = messages[0]
+        if msg.has_error():
+            raise ValueError(
+                f"Message contains an Error (reason: {msg.error.reason}). "
+                "It originated during client-side execution of a message."
+            )
+        return msg.content
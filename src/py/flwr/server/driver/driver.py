@@ -15,6 +15,7 @@
 """Driver (abstract base class)."""
 
 
+import time
 from abc import ABC, abstractmethod
 from typing import Iterable, List, Optional
 
@@ -110,6 +111,40 @@ class Driver(ABC):
             An iterable of messages received.
         """
 
+    def pull_messages_with_wait(
+        self, message_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterable[Message]:
+        """Pull messages based on message IDs, waiting for at least one of them.
+
+        This method returns as soon as reply messages to any of the given message IDs
+        are available, or when the timeout duration is exceeded. Drivers should
+        override this method to get notified of replies instead of polling for them.
+
+        Parameters
+        ----------
+        message_ids : Iterable[str]
+            An iterable of message IDs for which reply messages are to be retrieved.
+        timeout : Optional[float] (default: None)
+            The timeout duration in seconds. If `None`, there is no time limit and the
+            method will wait until at least one reply message is received.
+
+        Returns
+        -------
+        messages : Iterable[Message]
+            An iterable of messages received, which is empty if the timeout duration
+            was exceeded.
+        """
+        message_ids = list(message_ids)
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            messages = list(self.pull_messages(message_ids))
+            if messages or (end_time is not None and time.time() >= end_time):
+                return messages
+            # Sleep
+            time.sleep(
+                3 if end_time is None else max(0, min(3, end_time - time.time()))
+            )
+
     @abstractmethod
     def send_and_receive(
         self,
@@ -22,6 +22,7 @@ from typing import Iterable, List, Optional, cast
 import grpc
 
 from flwr.common import DEFAULT_TTL, EventType, Message, Metadata, RecordSet, event
+from flwr.common.constant import PULL_MAX_WAIT
 from flwr.common.grpc import create_channel
 from flwr.common.logger import log
 from flwr.common.serde import (
@@ -240,6 +241,34 @@ class GrpcDriver(Driver):
         msgs = [message_from_taskres(taskres) for taskres in res.task_res_list]
         return msgs
 
+    def pull_messages_with_wait(
+        self, message_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterable[Message]:
+        """Pull messages based on message IDs, waiting for at least one of them.
+
+        The SuperLink holds each request until a reply is available, for at most
+        `PULL_MAX_WAIT` seconds.
+        """
+        self._init_run()
+        message_ids = list(message_ids)
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            wait = PULL_MAX_WAIT
+            if end_time is not None:
+                wait = max(0.0, min(wait, end_time - time.time()))
+            start_time = time.time()
+            # Call GrpcDriverStub method
+            res: PullTaskResResponse = self._stub.PullTaskRes(
+                PullTaskResRequest(node=self.node, task_ids=message_ids, timeout=wait)
+            )
+            msgs = [message_from_taskres(taskres) for taskres in res.task_res_list]
+            if msgs or (end_time is not None and time.time() >= end_time):
+                return msgs
+            # A SuperLink without long-polling support returns immediately
+            remaining_wait = wait - (time.time() - start_time)
+            if remaining_wait > 0:
+                time.sleep(min(3, remaining_wait))
+
     def send_and_receive(
         self,
         messages: Iterable[Message],
@@ -255,19 +284,19 @@ class GrpcDriver(Driver):
         # Push messages
         msg_ids = set(self.push_messages(messages))
 
-        # Pull messages
+        # Pull messages as soon as they are available
         end_time = time.time() + (timeout if timeout is not None else 0.0)
         ret: List[Message] = []
-        while timeout is None or time.time() < end_time:
-            res_msgs = self.pull_messages(msg_ids)
+        while msg_ids and (timeout is None or time.time() < end_time):
+            res_msgs = list(
+                self.pull_messages_with_wait(
+                    msg_ids, None if timeout is None else end_time - time.time()
+                )
+            )
             ret.extend(res_msgs)
             msg_ids.difference_update(
                 {msg.metadata.reply_to_message for msg in res_msgs}
             )
-            if len(msg_ids) == 0:
-                break
-            # Sleep
-            time.sleep(3)
         return ret
 
     def close(self) -> None:
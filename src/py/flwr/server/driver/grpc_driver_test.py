@@ -20,6 +20,7 @@ import unittest
 from unittest.mock import Mock, patch
 
 from flwr.common import DEFAULT_TTL, RecordSet
+from flwr.common.constant import PULL_MAX_WAIT
 from flwr.common.message import Error
 from flwr.common.serde import error_to_proto, recordset_to_proto
 from flwr.proto.driver_pb2 import (  # pylint: disable=E0611
@@ -183,6 +184,28 @@ class TestGrpcDriver(unittest.TestCase):
         self.assertLess(time.time() - start_time, 0.2)
         self.assertEqual(len(ret_msgs), 0)
 
+    def test_send_and_receive_messages_long_polls(self) -> None:
+        """Test that pulling replies asks the SuperLink to wait for them."""
+        # Prepare
+        mock_response = Mock(task_ids=["id1"])
+        self.mock_stub.PushTaskIns.return_value = mock_response
+        error_proto = error_to_proto(Error(code=0))
+        mock_response = Mock(
+            task_res_list=[TaskRes(task=Task(ancestry=["id1"], error=error_proto))]
+        )
+        self.mock_stub.PullTaskRes.return_value = mock_response
+        msgs = [self.driver.create_message(RecordSet(), "", 0, "", DEFAULT_TTL)]
+
+        # Execute
+        ret_msgs = list(self.driver.send_and_receive(msgs, timeout=30))
+        args, _ = self.mock_stub.PullTaskRes.call_args
+
+        # Assert
+        self.assertEqual(len(ret_msgs), 1)
+        self.mock_stub.PullTaskRes.assert_called_once()
+        self.assertGreater(args[0].timeout, 0)
+        self.assertLessEqual(args[0].timeout, PULL_MAX_WAIT)
+
     def test_del_with_initialized_driver(self) -> None:
         """Test cleanup behavior when Driver is initialized."""
         # Execute
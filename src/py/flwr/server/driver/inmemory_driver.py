@@ -21,6 +21,7 @@ from typing import Iterable, List, Optional, cast
 from uuid import UUID
 
 from flwr.common import DEFAULT_TTL, Message, Metadata, RecordSet
+from flwr.common.constant import PULL_MAX_WAIT
 from flwr.common.serde import message_from_taskres, message_to_taskins
 from flwr.common.typing import Run
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
@@ -152,6 +153,25 @@ class InMemoryDriver(Driver):
         msgs = [message_from_taskres(taskres) for taskres in task_res_list]
         return msgs
 
+    def pull_messages_with_wait(
+        self, message_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterable[Message]:
+        """Pull messages based on message IDs, waiting for at least one of them.
+
+        The state notifies this method as soon as a reply is stored.
+        """
+        message_ids = list(message_ids)
+        msg_ids = {UUID(msg_id) for msg_id in message_ids}
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            msgs = list(self.pull_messages(message_ids))
+            if msgs or (end_time is not None and time.time() >= end_time):
+                return msgs
+            wait = PULL_MAX_WAIT
+            if end_time is not None:
+                wait = max(0.0, min(wait, end_time - time.time()))
+            self.state.wait_for_task_res(task_ids=msg_ids, timeout=wait)
+
     def send_and_receive(
         self,
         messages: Iterable[Message],
@@ -167,17 +187,17 @@ class InMemoryDriver(Driver):
         # Push messages
         msg_ids = set(self.push_messages(messages))
 
-        # Pull messages
+        # Pull messages as soon as they are available
         end_time = time.time() + (timeout if timeout is not None else 0.0)
         ret: List[Message] = []
-        while timeout is None or time.time() < end_time:
-            res_msgs = self.pull_messages(msg_ids)
+        while msg_ids and (timeout is None or time.time() < end_time):
+            res_msgs = list(
+                self.pull_messages_with_wait(
+                    msg_ids, None if timeout is None else end_time - time.time()
+                )
+            )
             ret.extend(res_msgs)
             msg_ids.difference_update(
                 {msg.metadata.reply_to_message for msg in res_msgs}
             )
-            if len(msg_ids) == 0:
-                break
-            # Sleep
-            time.sleep(3)
         return ret
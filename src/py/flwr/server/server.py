@@ -19,7 +19,7 @@ import concurrent.futures
 import io
 import timeit
 from logging import INFO, WARN
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from flwr.common import (
     Code,
@@ -32,6 +32,12 @@ from flwr.common import (
     ReconnectIns,
     Scalar,
 )
+from flwr.common.compression import (
+    ReferenceCache,
+    aggregate_compression_metrics,
+    decompress_fit_res,
+    is_compressed,
+)
 from flwr.common.logger import log
 from flwr.common.typing import GetParametersIns
 from flwr.server.client_manager import ClientManager, SimpleClientManager
@@ -228,12 +234,16 @@ class Server:
             self._client_manager.num_available(),
         )
 
-        # Collect `fit` results from all clients participating in this round
+        # Collect `fit` results from all clients participating in this round,
+        # allowing the strategy to aggregate each result as soon as it arrives
         results, failures = fit_clients(
             client_instructions=client_instructions,
             max_workers=self.max_workers,
             timeout=timeout,
             group_id=server_round,
+            aggregate_fn=lambda result: self.strategy.aggregate_fit_partial(
+                server_round, result
+            ),
         )
         log(
             INFO,
@@ -249,6 +259,9 @@ class Server:
         ] = self.strategy.aggregate_fit(server_round, results, failures)
 
         parameters_aggregated, metrics_aggregated = aggregated_result
+        metrics_aggregated.update(
+            aggregate_compression_metrics([res.metrics for _, res in results])
+        )
         return parameters_aggregated, metrics_aggregated, (results, failures)
 
     def disconnect_all_clients(self, timeout: Optional[float]) -> None:
@@ -341,33 +354,50 @@ def fit_clients(
     max_workers: Optional[int],
     timeout: Optional[float],
     group_id: int,
+    aggregate_fn: Optional[Callable[[Tuple[ClientProxy, FitRes]], bool]] = None,
 ) -> FitResultsAndFailures:
-    """Refine parameters concurrently on all selected clients."""
+    """Refine parameters concurrently on all selected clients.
+
+    If `aggregate_fn` is provided, it is called with each successful result as soon
+    as it is received. If it returns `True`, the parameters of that result are
+    released right away.
+    """
+    results: List[Tuple[ClientProxy, FitRes]] = []
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    references = ReferenceCache()
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         submitted_fs = {
-            executor.submit(fit_client, client_proxy, ins, timeout, group_id)
+            executor.submit(
+                fit_client, client_proxy, ins, timeout, group_id, references
+            )
             for client_proxy, ins in client_instructions
         }
-        finished_fs, _ = concurrent.futures.wait(
-            fs=submitted_fs,
-            timeout=None,  # Handled in the respective communication stack
-        )
-
-    # Gather results
-    results: List[Tuple[ClientProxy, FitRes]] = []
-    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
-    for future in finished_fs:
-        _handle_finished_future_after_fit(
-            future=future, results=results, failures=failures
-        )
+        # Gather results as they complete
+        # (timeout is handled in the respective communication stack)
+        for future in concurrent.futures.as_completed(fs=submitted_fs, timeout=None):
+            _handle_finished_future_after_fit(
+                future=future,
+                results=results,
+                failures=failures,
+                aggregate_fn=aggregate_fn,
+            )
     return results, failures
 
 
 def fit_client(
-    client: ClientProxy, ins: FitIns, timeout: Optional[float], group_id: int
+    client: ClientProxy,
+    ins: FitIns,
+    timeout: Optional[float],
+    group_id: int,
+    references: Optional[ReferenceCache] = None,
 ) -> Tuple[ClientProxy, FitRes]:
     """Refine parameters on a single client."""
     fit_res = client.fit(ins, timeout=timeout, group_id=group_id)
+    if fit_res.status.code == Code.OK and is_compressed(fit_res.parameters):
+        # The client sent a compressed delta from the parameters it received
+        if references is None:
+            references = ReferenceCache()
+        decompress_fit_res(fit_res, references.get(ins.parameters))
     return client, fit_res
 
 
@@ -375,6 +405,7 @@ def _handle_finished_future_after_fit(
     future: concurrent.futures.Future,  # type: ignore
     results: List[Tuple[ClientProxy, FitRes]],
     failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+    aggregate_fn: Optional[Callable[[Tuple[ClientProxy, FitRes]], bool]] = None,
 ) -> None:
     """Convert finished future into either a result or a failure."""
     # Check if there was an exception
@@ -389,6 +420,11 @@ def _handle_finished_future_after_fit(
 
     # Check result status code
     if res.status.code == Code.OK:
+        if aggregate_fn is not None and aggregate_fn(result):
+            # The result is already aggregated, drop its parameters
+            res.parameters = Parameters(
+                tensors=[], tensor_type=res.parameters.tensor_type
+            )
         results.append(result)
         return
 
@@ -19,7 +19,7 @@ import argparse
 import csv
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 from cryptography.hazmat.primitives.asymmetric import ec
@@ -47,7 +47,10 @@ from flwr.common import (
     ReconnectIns,
     Status,
     ndarray_to_bytes,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
 )
+from flwr.common.compression import METRICS_COMPRESSED_BYTES, compress_update
 from flwr.common.secure_aggregation.crypto.symmetric_encryption import (
     generate_key_pairs,
     private_key_to_bytes,
@@ -91,7 +94,8 @@ class SuccessClient(ClientProxy):
     def evaluate(
         self, ins: EvaluateIns, timeout: Optional[float], group_id: Optional[int]
     ) -> EvaluateRes:
-        """Simulate evaluate by returning a success EvaluateRes with loss 1.0."""
+        """Simulate evaluate by returning a success EvaluateRes with loss
+        1.0."""
         return EvaluateRes(
             status=Status(code=Code.OK, message="Success"),
             loss=1.0,
@@ -106,6 +110,24 @@ class SuccessClient(ClientProxy):
         return DisconnectRes(reason="UNKNOWN")
 
 
+class CompressingClient(SuccessClient):
+    """Test class."""
+
+    def fit(
+        self, ins: FitIns, timeout: Optional[float], group_id: Optional[int]
+    ) -> FitRes:
+        """Simulate fit by returning a compressed update of the received weights."""
+        reference = parameters_to_ndarrays(ins.parameters)
+        updated = [layer + 1.0 for layer in reference]
+        parameters = compress_update(updated, reference, "fp16")
+        return FitRes(
+            status=Status(code=Code.OK, message="Success"),
+            parameters=parameters,
+            num_examples=1,
+            metrics={METRICS_COMPRESSED_BYTES: len(parameters.tensors[0])},
+        )
+
+
 class FailingClient(ClientProxy):
     """Test class."""
 
@@ -161,6 +183,55 @@ def test_fit_clients() -> None:
     assert results[0][1].num_examples == 1
 
 
+def test_fit_clients_with_aggregate_fn() -> None:
+    """Test fit_clients with a function aggregating results on arrival."""
+    # Prepare
+    clients: List[ClientProxy] = [
+        FailingClient("0"),
+        SuccessClient("1"),
+        SuccessClient("2"),
+    ]
+    ins: FitIns = FitIns(Parameters(tensors=[], tensor_type=""), {})
+    client_instructions = [(c, ins) for c in clients]
+    aggregated: List[str] = []
+
+    def aggregate_fn(result: Tuple[ClientProxy, FitRes]) -> bool:
+        aggregated.append(result[0].cid)
+        return True
+
+    # Execute
+    results, failures = fit_clients(
+        client_instructions, None, None, 0, aggregate_fn=aggregate_fn
+    )
+
+    # Assert
+    assert sorted(aggregated) == ["1", "2"]
+    assert len(results) == 2
+    assert len(failures) == 1
+    for _, fit_res in results:
+        assert fit_res.num_examples == 1
+        assert not fit_res.parameters.tensors
+
+
+def test_fit_clients_decompresses_updates() -> None:
+    """Test fit_clients decoding compressed updates against their instructions."""
+    # Prepare
+    clients: List[ClientProxy] = [CompressingClient("0")]
+    arr = np.array([[1.0, 2.0], [3.0, 4.0]], dtype=np.float32)
+    ins = FitIns(ndarrays_to_parameters([arr]), {})
+    client_instructions = [(c, ins) for c in clients]
+
+    # Execute
+    results, failures = fit_clients(client_instructions, None, None, 0)
+
+    # Assert
+    assert not failures
+    fit_res = results[0][1]
+    updated = parameters_to_ndarrays(fit_res.parameters)
+    assert updated[0].dtype == np.float32
+    np.testing.assert_array_equal(updated[0], arr + 1.0)
+
+
 def test_eval_clients() -> None:
     """Test eval_clients."""
     # Prepare
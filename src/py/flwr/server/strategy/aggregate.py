@@ -15,66 +15,249 @@
 """Aggregation functions for strategy implementations."""
 # mypy: disallow_untyped_calls=False
 
-from functools import reduce
-from typing import Any, Callable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
 from flwr.common import FitRes, NDArray, NDArrays, parameters_to_ndarrays
 from flwr.server.client_proxy import ClientProxy
 
+# Upper bound on the size of the temporary arrays used by `_compute_distances`
+_DISTANCE_CHUNK_BYTES = 64 * 1024 * 1024
 
-def aggregate(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute weighted average."""
-    # Calculate the total number of examples used during training
-    num_examples_total = sum(num_examples for (_, num_examples) in results)
+# Default size of the client values stacked at once by coordinate-wise aggregators
+DEFAULT_MAX_CHUNK_BYTES = 64 * 1024 * 1024
 
-    # Create a list of weights, each multiplied by the related number of examples
-    weighted_weights = [
-        [layer * num_examples for layer in weights] for weights, num_examples in results
-    ]
+# Number of values of a layer processed as one task by parallel aggregation
+_PARALLEL_SLICE_SIZE = 1024 * 1024
 
-    # Compute average weights of each layer
-    weights_prime: NDArrays = [
-        reduce(np.add, layer_updates) / num_examples_total
-        for layer_updates in zip(*weighted_weights)
-    ]
-    return weights_prime
 
+class WeightedAverageAccumulator:
+    """Streaming weighted average over NDArrays.
 
-def aggregate_inplace(results: List[Tuple[ClientProxy, FitRes]]) -> NDArrays:
-    """Compute in-place weighted average."""
-    # Count total examples
-    num_examples_total = sum(fit_res.num_examples for (_, fit_res) in results)
+    Results are folded into preallocated float64 buffers one at a time, which means
+    that peak memory is one accumulator plus the result currently being added,
+    independent of the number of results.
 
-    # Compute scaling factors for each result
-    scaling_factors = [
-        fit_res.num_examples / num_examples_total for _, fit_res in results
-    ]
+    If `num_workers` is greater than one, layers are split into slices which are
+    processed by a pool of `num_workers` threads. The result does not depend on
+    the number of workers.
 
-    # Let's do in-place aggregation
-    # Get first result, then add up each other
-    params = [
-        scaling_factors[0] * x for x in parameters_to_ndarrays(results[0][1].parameters)
-    ]
-    for i, (_, fit_res) in enumerate(results[1:]):
-        res = (
-            scaling_factors[i + 1] * x
-            for x in parameters_to_ndarrays(fit_res.parameters)
+    Examples
+    --------
+    >>> accumulator = WeightedAverageAccumulator()
+    >>> for ndarrays, num_examples in results:
+    >>>     accumulator.add(ndarrays, num_examples)
+    >>> weights_prime = accumulator.aggregate()
+    """
+
+    def __init__(self, num_workers: int = 1) -> None:
+        self.num_workers = num_workers
+        self._buffers: List[NDArray] = []
+        self._dtypes: List[Any] = []
+        self._scratch: NDArray = np.empty(0, dtype=np.float64)
+        self.num_examples_total: int = 0
+        self.num_results: int = 0
+
+    def add(self, ndarrays: NDArrays, num_examples: int) -> None:
+        """Fold one result, weighted by `num_examples`, into the accumulator."""
+        if not self._buffers:
+            self._buffers = [
+                np.zeros(layer.shape, dtype=np.float64) for layer in ndarrays
+            ]
+            self._dtypes = [_averaged_dtype(layer) for layer in ndarrays]
+            # A single scratch buffer, large enough for the largest layer, holds
+            # `layer * num_examples` so that no per-layer temporaries are allocated
+            max_size = max((layer.size for layer in ndarrays), default=0)
+            self._scratch = np.empty(max_size, dtype=np.float64)
+        elif len(ndarrays) != len(self._buffers):
+            raise ValueError(
+                f"Expected {len(self._buffers)} layers, but got {len(ndarrays)}."
+            )
+
+        for buffer, layer in zip(self._buffers, ndarrays):
+            if layer.shape != buffer.shape:
+                raise ValueError(
+                    f"Expected a layer of shape {buffer.shape}, "
+                    f"but got {layer.shape}."
+                )
+
+        if self.num_workers > 1:
+            _run_on_slices(
+                partial(_fold_slice, weight=num_examples),
+                list(zip(self._buffers, ndarrays)),
+                self.num_workers,
+            )
+        else:
+            for buffer, layer in zip(self._buffers, ndarrays):
+                scratch = self._scratch[: layer.size].reshape(layer.shape)
+                np.multiply(layer, num_examples, out=scratch)
+                np.add(buffer, scratch, out=buffer)
+
+        self.num_examples_total += num_examples
+        self.num_results += 1
+
+    def aggregate(self) -> NDArrays:
+        """Return the weighted average and reset the accumulator.
+
+        Layers keep the floating point dtype of the results that were added; integer
+        layers are averaged to float64.
+        """
+        weights_prime: NDArrays = []
+        if self.num_workers > 1:
+            weights_prime = [
+                buffer if dtype == np.float64 else np.empty(buffer.shape, dtype=dtype)
+                for buffer, dtype in zip(self._buffers, self._dtypes)
+            ]
+            _run_on_slices(
+                partial(_divide_slice, total=self.num_examples_total),
+                list(zip(self._buffers, weights_prime)),
+                self.num_workers,
+            )
+        else:
+            for buffer, dtype in zip(self._buffers, self._dtypes):
+                np.divide(buffer, self.num_examples_total, out=buffer)
+                weights_prime.append(buffer.astype(dtype, copy=False))
+        self._buffers, self._dtypes = [], []
+        self._scratch = np.empty(0, dtype=np.float64)
+        self.num_examples_total, self.num_results = 0, 0
+        return weights_prime
+
+
+def _averaged_dtype(layer: NDArray) -> Any:
+    """Return the dtype of the weighted average of `layer`."""
+    if np.issubdtype(layer.dtype, np.floating):
+        return layer.dtype
+    return np.float64
+
+
+def _fold_slice(buffer: NDArray, layer: NDArray, columns: slice, weight: int) -> None:
+    """Add `weight` times a slice of a layer to the same slice of a buffer."""
+    scratch = np.empty(columns.stop - columns.start, dtype=np.float64)
+    np.multiply(layer[columns], weight, out=scratch)
+    np.add(buffer[columns], scratch, out=buffer[columns])
+
+
+def _divide_slice(buffer: NDArray, out: NDArray, columns: slice, total: int) -> None:
+    """Divide a slice of a buffer by `total` and write it to the same slice of `out`."""
+    np.divide(buffer[columns], total, out=buffer[columns])
+    if out is not buffer:
+        out[columns] = buffer[columns]
+
+
+def _slices(size: int) -> Iterator[slice]:
+    """Split `size` values into slices of at most `_PARALLEL_SLICE_SIZE` values."""
+    for start in range(0, size, _PARALLEL_SLICE_SIZE):
+        yield slice(start, min(start + _PARALLEL_SLICE_SIZE, size))
+
+
+def _run_on_slices(
+    fn: Callable[[NDArray, NDArray, slice], None],
+    layer_pairs: List[Tuple[NDArray, NDArray]],
+    num_workers: int,
+) -> None:
+    """Call `fn` on each slice of the flattened layer pairs, using a thread pool.
+
+    The layers of each pair have the same size. They are flattened to views that
+    `fn` can write to. NumPy releases the GIL in most operations on arrays, so the
+    slices are processed in parallel.
+    """
+    tasks: List[Tuple[NDArray, NDArray, slice]] = []
+    for first, second in layer_pairs:
+        first, second = first.reshape(-1), second.reshape(-1)
+        tasks.extend((first, second, columns) for columns in _slices(first.size))
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # Consume the iterator to propagate exceptions
+        list(executor.map(lambda task: fn(*task), tasks))
+
+
+def map_layers(
+    fn: Callable[..., NDArray], *layer_lists: NDArrays, num_workers: int = 1
+) -> NDArrays:
+    """Apply an element-wise function to the layers at each position.
+
+    Returns `[fn(*layers) for layers in zip(*layer_lists)]`. If `num_workers` is
+    greater than one, layers are split into slices which are processed by a pool of
+    `num_workers` threads. `fn` must operate element-wise on arrays of the same
+    shape (scalars may be broadcast), so that the result does not depend on the
+    slicing.
+    """
+    if num_workers <= 1:
+        return [fn(*layers) for layers in zip(*layer_lists)]
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = []
+        for layers in zip(*layer_lists):
+            if np.size(layers[0]) <= _PARALLEL_SLICE_SIZE:
+                futures.append([executor.submit(fn, *layers)])
+                continue
+            flat = [np.ravel(layer) for layer in layers]
+            futures.append(
+                [
+                    executor.submit(fn, *[x[columns] for x in flat])
+                    for columns in _slices(flat[0].size)
+                ]
+            )
+
+        results: NDArrays = []
+        for layers, layer_futures in zip(zip(*layer_lists), futures):
+            parts = [future.result() for future in layer_futures]
+            if len(parts) == 1:
+                results.append(parts[0])
+            else:
+                results.append(np.concatenate(parts).reshape(np.shape(layers[0])))
+    return results
+
+
+def aggregate(results: List[Tuple[NDArrays, int]], num_workers: int = 1) -> NDArrays:
+    """Compute weighted average."""
+    accumulator = WeightedAverageAccumulator(num_workers=num_workers)
+    for weights, num_examples in results:
+        accumulator.add(weights, num_examples)
+    return accumulator.aggregate()
+
+
+def aggregate_inplace(
+    results: List[Tuple[ClientProxy, FitRes]], num_workers: int = 1
+) -> NDArrays:
+    """Compute in-place weighted average.
+
+    Parameters are deserialized one result at a time and folded into a single
+    accumulator, so only one client's NDArrays are held in memory at once.
+    """
+    accumulator = WeightedAverageAccumulator(num_workers=num_workers)
+    for _, fit_res in results:
+        accumulator.add(
+            parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples
         )
-        params = [reduce(np.add, layer_updates) for layer_updates in zip(params, res)]
+    return accumulator.aggregate()
 
-    return params
 
+def aggregate_median(
+    results: List[Tuple[NDArrays, int]],
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    num_workers: int = 1,
+) -> NDArrays:
+    """Compute median.
 
-def aggregate_median(results: List[Tuple[NDArrays, int]]) -> NDArrays:
-    """Compute median."""
+    Each layer is processed in chunks of columns, so that at most `max_chunk_bytes`
+    of client values are stacked at once per worker. If `num_workers` is greater
+    than one, chunks are processed by a pool of `num_workers` threads.
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
     # Compute median weight of each layer
     median_w: NDArrays = [
-        np.median(np.asarray(layer), axis=0) for layer in zip(*weights)
+        _aggregate_layer_in_chunks(
+            list(layer),
+            lambda chunk, _: np.median(chunk, axis=0),
+            max_chunk_bytes,
+            num_workers,
+        )
+        for layer in zip(*weights)
     ]
     return median_w
 
@@ -92,20 +275,28 @@ def aggregate_krum(
     # Compute distances between vectors
     distance_matrix = _compute_distances(weights)
 
-    # For each client, take the n-f-2 closest parameters vectors
-    num_closest = max(1, len(weights) - num_malicious - 2)
-    closest_indices = []
-    for distance in distance_matrix:
-        closest_indices.append(
-            np.argsort(distance)[1 : num_closest + 1].tolist()  # noqa: E203
-        )
+    return _aggregate_krum_from_distances(
+        results, distance_matrix, num_malicious, to_keep
+    )
+
+
+def _aggregate_krum_from_distances(
+    results: List[Tuple[NDArrays, int]],
+    distance_matrix: NDArray,
+    num_malicious: int,
+    to_keep: int,
+) -> NDArrays:
+    """Apply Krum given the squared distances between the parameter vectors."""
+    # For each client, take the n-f-2 closest parameters vectors. The closest
+    # vector to each client is the client itself, which is skipped.
+    num_closest = max(1, len(results) - num_malicious - 2)
+    closest_distances = np.sort(distance_matrix, axis=1)[
+        :, 1 : num_closest + 1  # noqa: E203
+    ]
 
     # Compute the score for each client, that is the sum of the distances
     # of the n-f-2 closest parameters vectors
-    scores = [
-        np.sum(distance_matrix[i, closest_indices[i]])
-        for i in range(len(distance_matrix))
-    ]
+    scores = [np.sum(distances) for distances in closest_distances]
 
     if to_keep > 0:
         # Choose to_keep clients and return their average (MultiKrum)
@@ -114,7 +305,7 @@ def aggregate_krum(
         return aggregate(best_results)
 
     # Return the model parameters that minimize the score (Krum)
-    return weights[np.argmin(scores)]
+    return results[int(np.argmin(scores))][0]
 
 
 # pylint: disable=too-many-locals
@@ -122,6 +313,9 @@ def aggregate_bulyan(
     results: List[Tuple[NDArrays, int]],
     num_malicious: int,
     aggregation_rule: Callable,  # type: ignore
+    *,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    num_workers: int = 1,
     **aggregation_rule_kwargs: Any,
 ) -> NDArrays:
     """Perform Bulyan aggregation.
@@ -134,6 +328,11 @@ def aggregate_bulyan(
         The maximum number of malicious clients.
     aggregation_rule: Callable
         Byzantine resilient aggregation rule used as the first step of the Bulyan
+    max_chunk_bytes: int (default: DEFAULT_MAX_CHUNK_BYTES)
+        The maximum size of the client values stacked at once per worker by the
+        coordinate-wise steps of the Bulyan aggregation.
+    num_workers: int (default: 1)
+        The number of threads used by the coordinate-wise steps.
     aggregation_rule_kwargs: Any
         The arguments to the aggregation rule.
 
@@ -160,10 +359,27 @@ def aggregate_bulyan(
     theta = len(results) - 2 * num_malicious
     beta = theta - 2 * num_malicious
 
+    # Krum only depends on the distances between the remaining models, so they are
+    # computed once and the rows/columns of the selected models are dropped
+    distance_matrix: Optional[NDArray] = None
+    if aggregation_rule is aggregate_krum:
+        distance_matrix = _compute_distances([weights for weights, _ in results])
+    remaining_indices = list(range(num_clients))
+
     for _ in range(theta):
-        best_model = aggregation_rule(
-            results=results, num_malicious=num_malicious, **aggregation_rule_kwargs
-        )
+        if distance_matrix is not None:
+            best_model = _aggregate_krum_from_distances(
+                results,
+                distance_matrix[np.ix_(remaining_indices, remaining_indices)],
+                num_malicious=num_malicious,
+                **aggregation_rule_kwargs,
+            )
+        else:
+            best_model = aggregation_rule(
+                results=results,
+                num_malicious=num_malicious,
+                **aggregation_rule_kwargs,
+            )
         list_of_weights = [weights for weights, num_samples in results]
         # This group gives exact result
         if aggregation_rule in byzantine_resilient_single_ret_model_aggregation:
@@ -188,14 +404,21 @@ def aggregate_bulyan(
 
         # remove idx from tracker and weights_results
         results.pop(best_idx)
+        remaining_indices.pop(best_idx)
 
     # Compute median parameter vector across selected_models_set
-    median_vect = aggregate_median(selected_models_set)
+    median_vect = aggregate_median(
+        selected_models_set, max_chunk_bytes=max_chunk_bytes, num_workers=num_workers
+    )
 
     # Take the averaged beta parameters of the closest distance to the median
     # (coordinate-wise)
     parameters_aggregated = _aggregate_n_closest_weights(
-        median_vect, selected_models_set, beta_closest=beta
+        median_vect,
+        selected_models_set,
+        beta_closest=beta,
+        max_chunk_bytes=max_chunk_bytes,
+        num_workers=num_workers,
     )
     return parameters_aggregated
 
@@ -208,21 +431,30 @@ def weighted_loss_avg(results: List[Tuple[int, float]]) -> float:
 
 
 def aggregate_qffl(
-    parameters: NDArrays, deltas: List[NDArrays], hs_fll: List[NDArrays]
+    parameters: NDArrays,
+    deltas: List[NDArrays],
+    hs_fll: List[NDArrays],
+    num_workers: int = 1,
 ) -> NDArrays:
     """Compute weighted average based on Q-FFL paper."""
     demominator: float = np.sum(np.asarray(hs_fll))
-    scaled_deltas = []
-    for client_delta in deltas:
-        scaled_deltas.append([layer * 1.0 / demominator for layer in client_delta])
-    updates = []
-    for i in range(len(deltas[0])):
-        tmp = scaled_deltas[0][i]
-        for j in range(1, len(deltas)):
-            tmp += scaled_deltas[j][i]
-        updates.append(tmp)
-    new_parameters = [(u - v) * 1.0 for u, v in zip(parameters, updates)]
-    return new_parameters
+    return map_layers(
+        partial(_qffl_layer, demominator=demominator),
+        parameters,
+        *deltas,
+        num_workers=num_workers,
+    )
+
+
+def _qffl_layer(
+    parameter: NDArray, *client_deltas: NDArray, demominator: float
+) -> NDArray:
+    """Apply the scaled sum of the client deltas of one layer."""
+    update = client_deltas[0] * 1.0 / demominator
+    for client_delta in client_deltas[1:]:
+        update += client_delta * 1.0 / demominator
+    new_parameter: NDArray = (parameter - update) * 1.0
+    return new_parameter
 
 
 def _compute_distances(weights: List[NDArrays]) -> NDArray:
@@ -230,15 +462,62 @@ def _compute_distances(weights: List[NDArrays]) -> NDArray:
 
     Input: weights - list of weights vectors
     Output: distances - matrix distance_matrix of squared distances between the vectors
+
+    The squared distances are derived from the Gram matrix of the vectors, using
+    ||w_i - w_j||^2 = ||w_i||^2 + ||w_j||^2 - 2 <w_i, w_j>. The Gram matrix is
+    accumulated in float64 over chunks of each layer, so that no copy of all
+    flattened vectors is held in memory.
+    """
+    num_vectors = len(weights)
+    gram = np.zeros((num_vectors, num_vectors))
+    if num_vectors == 0:
+        return gram
+
+    # Number of values per vector in each chunk
+    chunk_size = max(1, _DISTANCE_CHUNK_BYTES // (8 * num_vectors))
+    for layers in zip(*weights):
+        flat_layers = [np.ravel(layer) for layer in layers]
+        for start in range(0, flat_layers[0].size, chunk_size):
+            chunk = np.stack(
+                [layer[start : start + chunk_size] for layer in flat_layers]
+            ).astype(np.float64, copy=False)
+            # Distances do not depend on the origin; centering the chunk limits
+            # the cancellation error for vectors with a large norm
+            chunk -= chunk.mean(axis=0)
+            gram += chunk @ chunk.T
+
+    squared_norms = np.diag(gram).copy()
+    distance_matrix: NDArray = (
+        squared_norms[:, np.newaxis] + squared_norms[np.newaxis, :] - 2 * gram
+    )
+    np.maximum(distance_matrix, 0.0, out=distance_matrix)
+    np.fill_diagonal(distance_matrix, 0.0)
+    return _merge_identical_vectors(weights, distance_matrix, squared_norms)
+
+
+def _merge_identical_vectors(
+    weights: List[NDArrays], distance_matrix: NDArray, squared_norms: NDArray
+) -> NDArray:
+    """Give identical vectors identical rows and columns in `distance_matrix`.
+
+    Rounding errors in the Gram matrix can make the distances of two identical vectors
+    to a third one differ slightly, which changes how ties are broken when ranking them.
+    Candidates are the pairs with a (nearly) zero distance, which are then compared
+    exactly.
     """
-    flat_w = np.array([np.concatenate(p, axis=None).ravel() for p in weights])
-    distance_matrix = np.zeros((len(weights), len(weights)))
-    for i, flat_w_i in enumerate(flat_w):
-        for j, flat_w_j in enumerate(flat_w):
-            delta = flat_w_i - flat_w_j
-            norm = np.linalg.norm(delta)
-            distance_matrix[i, j] = norm**2
-    return distance_matrix
+    tolerance = 1e-6 * (squared_norms[:, np.newaxis] + squared_norms[np.newaxis, :])
+    candidates = np.argwhere(np.triu(distance_matrix <= tolerance, k=1))
+    if len(candidates) == 0:
+        return distance_matrix
+
+    representatives = np.arange(len(weights))
+    for i, j in candidates:
+        if representatives[j] != j or representatives[i] != i:
+            continue
+        if _check_weights_equality(weights[i], weights[j]):
+            representatives[j] = i
+    merged: NDArray = distance_matrix[np.ix_(representatives, representatives)]
+    return merged
 
 
 def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
@@ -265,14 +544,25 @@ def _trim_mean(array: NDArray, proportiontocut: float) -> NDArray:
 
 
 def aggregate_trimmed_avg(
-    results: List[Tuple[NDArrays, int]], proportiontocut: float
+    results: List[Tuple[NDArrays, int]],
+    proportiontocut: float,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    num_workers: int = 1,
 ) -> NDArrays:
-    """Compute trimmed average."""
+    """Compute trimmed average.
+
+    Each layer is processed in chunks of columns, as in `aggregate_median`.
+    """
     # Create a list of weights and ignore the number of examples
     weights = [weights for weights, _ in results]
 
     trimmed_w: NDArrays = [
-        _trim_mean(np.asarray(layer), proportiontocut=proportiontocut)
+        _aggregate_layer_in_chunks(
+            list(layer),
+            lambda chunk, _: _trim_mean(chunk, proportiontocut=proportiontocut),
+            max_chunk_bytes,
+            num_workers,
+        )
         for layer in zip(*weights)
     ]
 
@@ -320,7 +610,11 @@ def _find_reference_weights(
 
 
 def _aggregate_n_closest_weights(
-    reference_weights: NDArrays, results: List[Tuple[NDArrays, int]], beta_closest: int
+    reference_weights: NDArrays,
+    results: List[Tuple[NDArrays, int]],
+    beta_closest: int,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    num_workers: int = 1,
 ) -> NDArrays:
     """Calculate element-wise mean of the `N` closest values.
 
@@ -336,6 +630,10 @@ def _aggregate_n_closest_weights(
         The weights from models
     beta_closest: int
         The number of the closest distance weights that will be averaged
+    max_chunk_bytes: int (default: DEFAULT_MAX_CHUNK_BYTES)
+        The maximum size of the client values stacked at once per worker
+    num_workers: int (default: 1)
+        The number of threads processing the chunks of each layer
 
     Returns
     -------
@@ -347,20 +645,78 @@ def _aggregate_n_closest_weights(
     aggregated_weights = []
 
     for layer_id, layer_weights in enumerate(reference_weights):
-        other_weights_layer_list = []
-        for other_w in list_of_weights:
-            other_weights_layer = other_w[layer_id]
-            other_weights_layer_list.append(other_weights_layer)
-        other_weights_layer_np = np.array(other_weights_layer_list)
-        diff_np = np.abs(layer_weights - other_weights_layer_np)
-        # Create indices of the smallest differences
-        # We do not need the exact order but just the beta closest weights
-        # therefore np.argpartition is used instead of np.argsort
-        indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
-        # Take the weights (coordinate-wise) corresponding to the beta of the
-        # closest distances
-        beta_closest_weights = np.take_along_axis(
-            other_weights_layer_np, indices=indices, axis=0
-        )[:beta_closest]
-        aggregated_weights.append(np.mean(beta_closest_weights, axis=0))
+        aggregated_weights.append(
+            _aggregate_layer_in_chunks(
+                [other_w[layer_id] for other_w in list_of_weights],
+                partial(
+                    _mean_of_n_closest,
+                    flat_reference=np.ravel(layer_weights),
+                    beta_closest=beta_closest,
+                ),
+                max_chunk_bytes,
+                num_workers,
+            )
+        )
     return aggregated_weights
+
+
+def _mean_of_n_closest(
+    other_weights_layer_np: NDArray,
+    columns: slice,
+    flat_reference: NDArray,
+    beta_closest: int,
+) -> NDArray:
+    """Average the `beta_closest` values closest to the reference, per column."""
+    diff_np = np.abs(flat_reference[columns] - other_weights_layer_np)
+    # Create indices of the smallest differences
+    # We do not need the exact order but just the beta closest weights
+    # therefore np.argpartition is used instead of np.argsort
+    indices = np.argpartition(diff_np, kth=beta_closest - 1, axis=0)
+    # Take the weights (coordinate-wise) corresponding to the beta of the
+    # closest distances
+    beta_closest_weights = np.take_along_axis(
+        other_weights_layer_np, indices=indices, axis=0
+    )[:beta_closest]
+    mean: NDArray = np.mean(beta_closest_weights, axis=0)
+    return mean
+
+
+def _aggregate_layer_in_chunks(
+    layers: List[NDArray],
+    aggregate_fn: Callable[[NDArray, slice], NDArray],
+    max_chunk_bytes: int,
+    num_workers: int,
+) -> NDArray:
+    """Aggregate one layer of all clients coordinate-wise, in chunks of columns.
+
+    `aggregate_fn` receives the stacked values of all clients for a range of
+    coordinates of the flattened layer, with shape `(len(layers), chunk_size)`,
+    along with the slice of that range. It must reduce the values along axis 0.
+    Since the coordinates are independent, the result is the same as for the
+    whole layer at once.
+    """
+    flat_layers = [np.ravel(layer) for layer in layers]
+    size = flat_layers[0].size
+    itemsize = max(layer.itemsize for layer in flat_layers)
+    # NumPy reduces single columns with pairwise summation but wider arrays row by
+    # row, so chunks have at least two columns to round as the whole layer does
+    chunk_size = max(2, max_chunk_bytes // (itemsize * len(flat_layers)))
+    boundaries = list(range(0, size, chunk_size)) + [size]
+    if len(boundaries) > 2 and boundaries[-1] - boundaries[-2] == 1:
+        del boundaries[-2]
+    column_slices = [
+        slice(start, stop) for start, stop in zip(boundaries[:-1], boundaries[1:])
+    ] or [slice(0, 0)]
+
+    def _aggregate_chunk(columns: slice) -> NDArray:
+        chunk = np.stack([layer[columns] for layer in flat_layers])
+        return aggregate_fn(chunk, columns)
+
+    if num_workers > 1 and len(column_slices) > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            chunks = list(executor.map(_aggregate_chunk, column_slices))
+    else:
+        chunks = [_aggregate_chunk(columns) for columns in column_slices]
+
+    aggregated: NDArray = np.concatenate(chunks).reshape(layers[0].shape)
+    return aggregated
@@ -16,14 +16,27 @@
 
 
 from typing import List, Tuple
+from unittest.mock import patch
 
 import numpy as np
+import pytest
+
+from flwr.common import NDArrays
 
 from .aggregate import (
+    WeightedAverageAccumulator,
     _aggregate_n_closest_weights,
     _check_weights_equality,
+    _compute_distances,
     _find_reference_weights,
+    _trim_mean,
     aggregate,
+    aggregate_bulyan,
+    aggregate_krum,
+    aggregate_median,
+    aggregate_qffl,
+    aggregate_trimmed_avg,
+    map_layers,
     weighted_loss_avg,
 )
 
@@ -46,6 +59,104 @@ def test_aggregate() -> None:
     np.testing.assert_equal(expected, actual)
 
 
+def test_weighted_average_accumulator() -> None:
+    """Test streaming weighted average against a direct computation."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    results: List[Tuple[NDArrays, int]] = [
+        ([rng.random((3, 4)).astype(np.float32), rng.random(5)], num_examples)
+        for num_examples in [1, 7, 3]
+    ]
+    expected = [
+        sum(weights[i].astype(np.float64) * num for weights, num in results) / 11
+        for i in range(2)
+    ]
+    accumulator = WeightedAverageAccumulator()
+
+    # Execute
+    for weights, num_examples in results:
+        accumulator.add(weights, num_examples)
+    actual = accumulator.aggregate()
+
+    # Assert
+    assert accumulator.num_results == 0
+    assert actual[0].dtype == np.float32
+    assert actual[1].dtype == np.float64
+    np.testing.assert_allclose(actual[0], expected[0], rtol=1e-6)
+    np.testing.assert_allclose(actual[1], expected[1])
+
+
+def test_weighted_average_accumulator_parallel() -> None:
+    """Test parallel weighted average matches the sequential one exactly."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    results: List[Tuple[NDArrays, int]] = [
+        (
+            [
+                rng.random((3, 4)).astype(np.float32),
+                rng.random(5),
+                rng.integers(10, size=(2, 3)),
+            ],
+            num_examples,
+        )
+        for num_examples in [1, 7, 3]
+    ]
+    expected = aggregate(results)
+
+    # Execute
+    with patch("flwr.server.strategy.aggregate._PARALLEL_SLICE_SIZE", 4):
+        actual = aggregate(results, num_workers=3)
+
+    # Assert
+    for actual_layer, expected_layer in zip(actual, expected):
+        assert actual_layer.dtype == expected_layer.dtype
+        np.testing.assert_array_equal(actual_layer, expected_layer)
+
+
+def test_map_layers_parallel() -> None:
+    """Test parallel element-wise functions match the sequential ones exactly."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    parameters: NDArrays = [rng.standard_normal((3, 5)), np.array(0.5)]
+    deltas: List[NDArrays] = [
+        [rng.standard_normal((3, 5)), np.array(rng.standard_normal())] for _ in range(4)
+    ]
+    hs_ffl: List[NDArrays] = [[np.array(rng.random())] for _ in range(4)]
+
+    # Execute
+    with patch("flwr.server.strategy.aggregate._PARALLEL_SLICE_SIZE", 4):
+        mapped = map_layers(
+            lambda x, y: 0.9 * x + np.sqrt(np.abs(y)),
+            parameters,
+            deltas[0],
+            num_workers=3,
+        )
+        qffl = aggregate_qffl(parameters, deltas, hs_ffl, num_workers=3)
+
+    # Assert
+    for layer_id, layer in enumerate(parameters):
+        expected = 0.9 * layer + np.sqrt(np.abs(deltas[0][layer_id]))
+        assert mapped[layer_id].shape == layer.shape
+        np.testing.assert_array_equal(mapped[layer_id], expected)
+    for actual_layer, expected_layer in zip(
+        qffl, aggregate_qffl(parameters, deltas, hs_ffl)
+    ):
+        np.testing.assert_array_equal(actual_layer, expected_layer)
+
+
+def test_weighted_average_accumulator_shape_mismatch() -> None:
+    """Test that results with mismatching layers are rejected."""
+    # Prepare
+    accumulator = WeightedAverageAccumulator()
+    accumulator.add([np.ones((2, 2))], 1)
+
+    # Execute & assert
+    with pytest.raises(ValueError):
+        accumulator.add([np.ones((2, 3))], 1)
+    with pytest.raises(ValueError):
+        accumulator.add([np.ones((2, 2)), np.ones(2)], 1)
+
+
 def test_weighted_loss_avg_single_value() -> None:
     """Test weighted loss averaging."""
     # Prepare
@@ -139,3 +250,82 @@ def test_aggregate_n_closest_weights_mean() -> None:
             for expected, result in zip(expected_averaged, beta_closest_weights)
         )
     )
+
+
+def test_compute_distances() -> None:
+    """Test squared distances against a pairwise computation."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    weights: List[NDArrays] = [
+        [rng.standard_normal((3, 4)).astype(np.float32), rng.standard_normal(5) * 100]
+        for _ in range(6)
+    ]
+    weights.append([layer.copy() for layer in weights[2]])
+    flat = [np.concatenate([layer.ravel() for layer in w]) for w in weights]
+    expected = np.array([[np.sum((a - b) ** 2) for b in flat] for a in flat])
+
+    # Execute
+    with patch("flwr.server.strategy.aggregate._DISTANCE_CHUNK_BYTES", 8 * 7 * 2):
+        distance_matrix = _compute_distances(weights)
+
+    # Assert
+    np.testing.assert_allclose(distance_matrix, expected, rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(distance_matrix[2], distance_matrix[6])
+    assert distance_matrix[2, 6] == 0.0
+
+
+def test_aggregate_bulyan_computes_distances_once() -> None:
+    """Test Bulyan reuses the distances between models across Krum selections."""
+    # Prepare
+    rng = np.random.default_rng(0)
+    results: List[Tuple[NDArrays, int]] = [
+        ([rng.standard_normal(4)], 1) for _ in range(11)
+    ]
+
+    # Execute
+    with patch(
+        "flwr.server.strategy.aggregate._compute_distances",
+        wraps=_compute_distances,
+    ) as compute_distances:
+        aggregated = aggregate_bulyan(list(results), 1, aggregate_krum, to_keep=0)
+
+    # Assert
+    compute_distances.assert_called_once()
+    assert aggregated[0].shape == (4,)
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_coordinate_wise_aggregation_in_chunks(num_workers: int) -> None:
+    """Test chunked coordinate-wise aggregation matches whole-layer aggregation."""
+    # Prepare
+    rng = np.random.default_rng(42)
+    results: List[Tuple[NDArrays, int]] = [
+        (
+            [
+                rng.standard_normal((7, 5)).astype(np.float32),
+                rng.standard_normal(9),
+                np.array(rng.integers(10)),
+            ],
+            1,
+        )
+        for _ in range(11)
+    ]
+    layers = [np.stack(layer) for layer in zip(*[w for w, _ in results])]
+    chunking = {"max_chunk_bytes": 3 * 8 * 11, "num_workers": num_workers}
+
+    # Execute
+    median = aggregate_median(results, **chunking)
+    trimmed = aggregate_trimmed_avg(results, 0.2, **chunking)
+    closest = _aggregate_n_closest_weights(median, results, 4, **chunking)
+
+    # Assert
+    for layer_id, layer in enumerate(layers):
+        np.testing.assert_array_equal(median[layer_id], np.median(layer, axis=0))
+        np.testing.assert_array_equal(
+            trimmed[layer_id], _trim_mean(layer, proportiontocut=0.2)
+        )
+        assert closest[layer_id].shape == layer.shape[1:]
+    np.testing.assert_array_equal(
+        closest[1],
+        _aggregate_n_closest_weights(median, results, 4, max_chunk_bytes=2**20)[1],
+    )
@@ -33,7 +33,7 @@ from flwr.common import (
 from flwr.common.logger import log
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate_bulyan, aggregate_krum
+from .aggregate import DEFAULT_MAX_CHUNK_BYTES, aggregate_bulyan, aggregate_krum
 from .fedavg import FedAvg
 
 
@@ -70,6 +70,11 @@ class Bulyan(FedAvg):
         Initial global model parameters.
     first_aggregation_rule: Callable
         Byzantine resilient aggregation rule that is used as the first step of the Bulyan (e.g., Krum)
+    num_aggregation_workers : int, optional
+        Number of threads used by the coordinate-wise steps of the aggregation. Defaults to 1.
+    max_chunk_bytes : int, optional
+        Maximum size of the client values stacked at once per aggregation worker.
+        Defaults to DEFAULT_MAX_CHUNK_BYTES (64 MiB).
     **aggregation_rule_kwargs: Any
         arguments to the first_aggregation rule
     """
@@ -97,6 +102,8 @@ class Bulyan(FedAvg):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         first_aggregation_rule: Callable = aggregate_krum,  # type: ignore
+        num_aggregation_workers: int = 1,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
         **aggregation_rule_kwargs: Any,
     ) -> None:
         super().__init__(
@@ -112,7 +119,9 @@ class Bulyan(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            num_aggregation_workers=num_aggregation_workers,
         )
+        self.max_chunk_bytes = max_chunk_bytes
         self.num_malicious_clients = num_malicious_clients
         self.first_aggregation_rule = first_aggregation_rule
         self.aggregation_rule_kwargs = aggregation_rule_kwargs
@@ -147,6 +156,8 @@ class Bulyan(FedAvg):
                 weights_results,
                 self.num_malicious_clients,
                 self.first_aggregation_rule,
+                max_chunk_bytes=self.max_chunk_bytes,
+                num_workers=self.num_aggregation_workers,
                 **self.aggregation_rule_kwargs,
             )
         )
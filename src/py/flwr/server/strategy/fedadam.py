@@ -35,6 +35,7 @@ from flwr.common import (
 )
 from flwr.server.client_proxy import ClientProxy
 
+from .aggregate import map_layers
 from .fedopt import FedOpt
 
 
@@ -80,6 +81,8 @@ class FedAdam(FedOpt):
         Second moment parameter. Defaults to 0.99.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    num_aggregation_workers : int, optional
+        Number of threads used to aggregate model updates. Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals
@@ -108,6 +111,7 @@ class FedAdam(FedOpt):
         beta_1: float = 0.9,
         beta_2: float = 0.99,
         tau: float = 1e-9,
+        num_aggregation_workers: int = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -127,6 +131,7 @@ class FedAdam(FedOpt):
             beta_1=beta_1,
             beta_2=beta_2,
             tau=tau,
+            num_aggregation_workers=num_aggregation_workers,
         )
 
     def __repr__(self) -> str:
@@ -150,30 +155,40 @@ class FedAdam(FedOpt):
         fedavg_weights_aggregate = parameters_to_ndarrays(fedavg_parameters_aggregated)
 
         # Adam
-        delta_t: NDArrays = [
-            x - y for x, y in zip(fedavg_weights_aggregate, self.current_weights)
-        ]
+        delta_t: NDArrays = map_layers(
+            np.subtract,
+            fedavg_weights_aggregate,
+            self.current_weights,
+            num_workers=self.num_aggregation_workers,
+        )
 
         # m_t
         if not self.m_t:
             self.m_t = [np.zeros_like(x) for x in delta_t]
-        self.m_t = [
-            np.multiply(self.beta_1, x) + (1 - self.beta_1) * y
-            for x, y in zip(self.m_t, delta_t)
-        ]
+        self.m_t = map_layers(
+            lambda x, y: np.multiply(self.beta_1, x) + (1 - self.beta_1) * y,
+            self.m_t,
+            delta_t,
+            num_workers=self.num_aggregation_workers,
+        )
 
         # v_t
         if not self.v_t:
             self.v_t = [np.zeros_like(x) for x in delta_t]
-        self.v_t = [
-            self.beta_2 * x + (1 - self.beta_2) * np.multiply(y, y)
-            for x, y in zip(self.v_t, delta_t)
-        ]
-
-        new_weights = [
-            x + self.eta * y / (np.sqrt(z) + self.tau)
-            for x, y, z in zip(self.current_weights, self.m_t, self.v_t)
-        ]
+        self.v_t = map_layers(
+            lambda x, y: self.beta_2 * x + (1 - self.beta_2) * np.multiply(y, y),
+            self.v_t,
+            delta_t,
+            num_workers=self.num_aggregation_workers,
+        )
+
+        new_weights = map_layers(
+            lambda x, y, z: x + self.eta * y / (np.sqrt(z) + self.tau),
+            self.current_weights,
+            self.m_t,
+            self.v_t,
+            num_workers=self.num_aggregation_workers,
+        )
 
         self.current_weights = new_weights
 
@@ -19,7 +19,7 @@ Paper: arxiv.org/abs/1602.05629
 
 
 from logging import WARNING
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 from flwr.common import (
     EvaluateIns,
@@ -37,7 +37,12 @@ from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate, aggregate_inplace, weighted_loss_avg
+from .aggregate import (
+    WeightedAverageAccumulator,
+    aggregate,
+    aggregate_inplace,
+    weighted_loss_avg,
+)
 from .strategy import Strategy
 
 WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW = """
@@ -86,9 +91,19 @@ class FedAvg(Strategy):
         Metrics aggregation function, optional.
     inplace : bool (default: True)
         Enable (True) or disable (False) in-place aggregation of model updates.
+    incremental : bool (default: False)
+        Enable (True) or disable (False) aggregation of model updates as soon as
+        they are received (see `aggregate_fit_partial`). When enabled, the
+        parameters of aggregated results are released before `aggregate_fit` is
+        called, so it cannot be enabled for subclasses that override
+        `aggregate_fit`.
+    num_aggregation_workers : int (default: 1)
+        Number of threads used to aggregate model updates. Large layers are split
+        into slices which are aggregated in parallel. The aggregated model does not
+        depend on the number of threads.
     """
 
-    # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
     def __init__(
         self,
         *,
@@ -110,6 +125,8 @@ class FedAvg(Strategy):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         inplace: bool = True,
+        incremental: bool = False,
+        num_aggregation_workers: int = 1,
     ) -> None:
         super().__init__()
 
@@ -119,6 +136,12 @@ class FedAvg(Strategy):
         ):
             log(WARNING, WARNING_MIN_AVAILABLE_CLIENTS_TOO_LOW)
 
+        if incremental and type(self).aggregate_fit is not FedAvg.aggregate_fit:
+            raise ValueError(
+                f"{type(self).__name__} overrides `aggregate_fit`, which requires the "
+                "parameters of all results, so `incremental` must be disabled."
+            )
+
         self.fraction_fit = fraction_fit
         self.fraction_evaluate = fraction_evaluate
         self.min_fit_clients = min_fit_clients
@@ -132,6 +155,12 @@ class FedAvg(Strategy):
         self.fit_metrics_aggregation_fn = fit_metrics_aggregation_fn
         self.evaluate_metrics_aggregation_fn = evaluate_metrics_aggregation_fn
         self.inplace = inplace
+        self.incremental = incremental
+        self.num_aggregation_workers = num_aggregation_workers
+        self._partial_round: Optional[int] = None
+        self._partial_accumulator: Optional[WeightedAverageAccumulator] = None
+        # The `cid` of each client whose result is in `_partial_accumulator`
+        self._partial_cids: Set[str] = set()
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -217,6 +246,29 @@ class FedAvg(Strategy):
         # Return client/config pairs
         return [(client, evaluate_ins) for client in clients]
 
+    def aggregate_fit_partial(
+        self,
+        server_round: int,
+        result: Tuple[ClientProxy, FitRes],
+    ) -> bool:
+        """Add a single fit result to the weighted average of the round."""
+        if not self.incremental:
+            return False
+
+        if self._partial_accumulator is None or self._partial_round != server_round:
+            self._partial_round = server_round
+            self._partial_accumulator = WeightedAverageAccumulator(
+                num_workers=self.num_aggregation_workers
+            )
+            self._partial_cids = set()
+
+        client, fit_res = result
+        self._partial_accumulator.add(
+            parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples
+        )
+        self._partial_cids.add(client.cid)
+        return True
+
     def aggregate_fit(
         self,
         server_round: int,
@@ -224,22 +276,37 @@ class FedAvg(Strategy):
         failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
     ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
         """Aggregate fit results using weighted average."""
+        accumulator, aggregated_cids = self._pop_partial_accumulator(server_round)
         if not results:
             return None, {}
         # Do not aggregate if there are failures and failures are not accepted
         if not self.accept_failures and failures:
             return None, {}
 
-        if self.inplace:
+        if accumulator is not None:
+            # Add results which have not been aggregated on arrival; the
+            # parameters of all others have been released by the caller
+            for client, fit_res in results:
+                if client.cid not in aggregated_cids:
+                    accumulator.add(
+                        parameters_to_ndarrays(fit_res.parameters),
+                        fit_res.num_examples,
+                    )
+            aggregated_ndarrays = accumulator.aggregate()
+        elif self.inplace:
             # Does in-place weighted average of results
-            aggregated_ndarrays = aggregate_inplace(results)
+            aggregated_ndarrays = aggregate_inplace(
+                results, num_workers=self.num_aggregation_workers
+            )
         else:
             # Convert results
             weights_results = [
                 (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
                 for _, fit_res in results
             ]
-            aggregated_ndarrays = aggregate(weights_results)
+            aggregated_ndarrays = aggregate(
+                weights_results, num_workers=self.num_aggregation_workers
+            )
 
         parameters_aggregated = ndarrays_to_parameters(aggregated_ndarrays)
 
@@ -253,6 +320,20 @@ class FedAvg(Strategy):
 
         return parameters_aggregated, metrics_aggregated
 
+    def _pop_partial_accumulator(
+        self, server_round: int
+    ) -> Tuple[Optional[WeightedAverageAccumulator], Set[str]]:
+        """Return the partial aggregate of `server_round` and reset it.
+
+        Also returns the `cid` of each client whose result is in the aggregate.
+        """
+        accumulator, cids = self._partial_accumulator, self._partial_cids
+        if self._partial_round != server_round:
+            accumulator, cids = None, set()
+        self._partial_round, self._partial_accumulator = None, None
+        self._partial_cids = set()
+        return accumulator, cids
+
     def aggregate_evaluate(
         self,
         server_round: int,
@@ -15,13 +15,14 @@
 """FedAvg tests."""
 
 
-from typing import List, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from unittest.mock import MagicMock
 
 import numpy as np
+import pytest
 from numpy.testing import assert_allclose
 
-from flwr.common import Code, FitRes, Status, parameters_to_ndarrays
+from flwr.common import Code, FitRes, Parameters, Scalar, Status, parameters_to_ndarrays
 from flwr.common.parameter import ndarrays_to_parameters
 from flwr.server.client_proxy import ClientProxy
 
@@ -178,3 +179,61 @@ def test_inplace_aggregate_fit_equivalence() -> None:
     # Assert
     for ref, inp in zip(reference_np, inplace_np):
         assert_allclose(ref, inp)
+
+
+def test_incremental_aggregate_fit_equivalence() -> None:
+    """Test aggregate_fit equivalence between FedAvg and its incremental version."""
+    # Prepare
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters(
+                    [np.random.randn(100, 64), np.random.randn(31, 62, 3)]
+                ),
+                num_examples=num_examples,
+                metrics={},
+            ),
+        )
+        for num_examples in [1, 5, 3]
+    ]
+    failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    fedavg_reference = FedAvg()
+    fedavg_incremental = FedAvg(incremental=True)
+    reference, _ = fedavg_reference.aggregate_fit(1, results, failures)
+
+    # Execute
+    # Aggregate the first two results on arrival and release their parameters
+    for client, fit_res in results[:2]:
+        assert fedavg_incremental.aggregate_fit_partial(1, (client, fit_res))
+        fit_res.parameters = Parameters(tensors=[], tensor_type="")
+    incremental, _ = fedavg_incremental.aggregate_fit(1, results, failures)
+
+    # Assert
+    assert reference
+    assert incremental
+    assert not FedAvg().aggregate_fit_partial(1, results[2])
+    for ref, inc in zip(
+        parameters_to_ndarrays(reference), parameters_to_ndarrays(incremental)
+    ):
+        assert_allclose(ref, inc)
+
+
+def test_incremental_requires_fedavg_aggregate_fit() -> None:
+    """Test that incremental aggregation is rejected if aggregate_fit is replaced."""
+
+    # Prepare
+    class _Strategy(FedAvg):
+        def aggregate_fit(
+            self,
+            server_round: int,
+            results: List[Tuple[ClientProxy, FitRes]],
+            failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]],
+        ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+            return None, {}
+
+    # Execute & assert
+    with pytest.raises(ValueError):
+        _Strategy(incremental=True)
+    assert not _Strategy().incremental
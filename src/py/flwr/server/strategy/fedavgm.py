@@ -34,7 +34,7 @@ from flwr.common.logger import log
 from flwr.server.client_manager import ClientManager
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate
+from .aggregate import aggregate_inplace
 from .fedavg import FedAvg
 
 
@@ -141,13 +141,8 @@ class FedAvgM(FedAvg):
         # Do not aggregate if there are failures and failures are not accepted
         if not self.accept_failures and failures:
             return None, {}
-        # Convert results
-        weights_results = [
-            (parameters_to_ndarrays(fit_res.parameters), fit_res.num_examples)
-            for _, fit_res in results
-        ]
-
-        fedavg_result = aggregate(weights_results)
+        # Compute weighted average, deserializing one result at a time
+        fedavg_result = aggregate_inplace(results)
         # following convention described in
         # https://pytorch.org/docs/stable/generated/torch.optim.SGD.html
         if self.server_opt:
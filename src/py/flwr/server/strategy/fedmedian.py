@@ -19,7 +19,7 @@ Paper: arxiv.org/pdf/1803.01498v1.pdf
 
 
 from logging import WARNING
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from flwr.common import (
     FitRes,
@@ -31,12 +31,27 @@ from flwr.common import (
 from flwr.common.logger import log
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate_median
+from .aggregate import DEFAULT_MAX_CHUNK_BYTES, aggregate_median
 from .fedavg import FedAvg
 
 
 class FedMedian(FedAvg):
-    """Configurable FedMedian strategy implementation."""
+    """Configurable FedMedian strategy implementation.
+
+    Parameters
+    ----------
+    max_chunk_bytes : int (default: DEFAULT_MAX_CHUNK_BYTES)
+        The maximum size of the client values stacked at once per aggregation
+        worker. Smaller values lower the peak memory of the aggregation.
+    **kwargs : Any
+        Arguments passed to `FedAvg`.
+    """
+
+    def __init__(
+        self, *, max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.max_chunk_bytes = max_chunk_bytes
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -62,7 +77,11 @@ class FedMedian(FedAvg):
             for _, fit_res in results
         ]
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_median(weights_results)
+            aggregate_median(
+                weights_results,
+                max_chunk_bytes=self.max_chunk_bytes,
+                num_workers=self.num_aggregation_workers,
+            )
         )
 
         # Aggregate custom metrics if aggregation fn was provided
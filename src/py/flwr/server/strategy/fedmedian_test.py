@@ -16,7 +16,7 @@
 
 
 from typing import List, Tuple
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from numpy import array, float32
 
@@ -32,6 +32,7 @@ from flwr.common import (
 from flwr.server.client_proxy import ClientProxy
 from flwr.server.superlink.fleet.grpc_bidi.grpc_client_proxy import GrpcClientProxy
 
+from .aggregate import aggregate_median
 from .fedmedian import FedMedian
 
 
@@ -198,3 +199,34 @@ def test_aggregate_fit() -> None:
         actual_list = parameters_to_ndarrays(actual_aggregated)
         actual = actual_list[0]
     assert (actual == expected[0]).all()
+
+
+def test_aggregate_fit_forwards_memory_options() -> None:
+    """Test that the chunk size and number of workers reach the aggregation."""
+    # Prepare
+    strategy = FedMedian(max_chunk_bytes=8, num_aggregation_workers=2)
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            MagicMock(),
+            FitRes(
+                status=Status(code=Code.OK, message="Success"),
+                parameters=ndarrays_to_parameters([array([value] * 4, dtype=float32)]),
+                num_examples=5,
+                metrics={},
+            ),
+        )
+        for value in (0.2, 1.0, 0.5, 0.3, 0.4)
+    ]
+
+    # Execute
+    with patch(
+        "flwr.server.strategy.fedmedian.aggregate_median", wraps=aggregate_median
+    ) as aggregate_mock:
+        actual_aggregated, _ = strategy.aggregate_fit(
+            server_round=1, results=results, failures=[]
+        )
+
+    # Assert
+    assert actual_aggregated is not None
+    assert aggregate_mock.call_args.kwargs["max_chunk_bytes"] == 8
+    assert aggregate_mock.call_args.kwargs["num_workers"] == 2
@@ -73,6 +73,8 @@ class FedOpt(FedAvg):
         Second moment parameter. Defaults to 0.0.
     tau : float, optional
         Controls the algorithm's degree of adaptability. Defaults to 1e-9.
+    num_aggregation_workers : int, optional
+        Number of threads used to aggregate model updates. Defaults to 1.
     """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
@@ -101,6 +103,7 @@ class FedOpt(FedAvg):
         beta_1: float = 0.0,
         beta_2: float = 0.0,
         tau: float = 1e-9,
+        num_aggregation_workers: int = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -115,6 +118,7 @@ class FedOpt(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            num_aggregation_workers=num_aggregation_workers,
         )
         self.current_weights = parameters_to_ndarrays(initial_parameters)
         self.eta = eta
@@ -31,7 +31,7 @@ from flwr.common import (
 from flwr.common.logger import log
 from flwr.server.client_proxy import ClientProxy
 
-from .aggregate import aggregate_trimmed_avg
+from .aggregate import DEFAULT_MAX_CHUNK_BYTES, aggregate_trimmed_avg
 from .fedavg import FedAvg
 
 
@@ -65,9 +65,14 @@ class FedTrimmedAvg(FedAvg):
         Initial global model parameters.
     beta : float, optional
         Fraction to cut off of both tails of the distribution. Defaults to 0.2.
+    num_aggregation_workers : int, optional
+        Number of threads used to aggregate model updates. Defaults to 1.
+    max_chunk_bytes : int, optional
+        Maximum size of the client values stacked at once per aggregation worker.
+        Defaults to DEFAULT_MAX_CHUNK_BYTES (64 MiB).
     """
 
-    # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
+    # pylint: disable=too-many-arguments,too-many-instance-attributes,too-many-locals, line-too-long
     def __init__(
         self,
         *,
@@ -89,6 +94,8 @@ class FedTrimmedAvg(FedAvg):
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         beta: float = 0.2,
+        num_aggregation_workers: int = 1,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -103,8 +110,10 @@ class FedTrimmedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            num_aggregation_workers=num_aggregation_workers,
         )
         self.beta = beta
+        self.max_chunk_bytes = max_chunk_bytes
 
     def __repr__(self) -> str:
         """Compute a string representation of the strategy."""
@@ -130,7 +139,12 @@ class FedTrimmedAvg(FedAvg):
             for _, fit_res in results
         ]
         parameters_aggregated = ndarrays_to_parameters(
-            aggregate_trimmed_avg(weights_results, self.beta)
+            aggregate_trimmed_avg(
+                weights_results,
+                self.beta,
+                max_chunk_bytes=self.max_chunk_bytes,
+                num_workers=self.num_aggregation_workers,
+            )
         )
 
         # Aggregate custom metrics if aggregation fn was provided
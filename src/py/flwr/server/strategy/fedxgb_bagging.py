@@ -27,7 +27,11 @@ from .fedavg import FedAvg
 
 
 class FedXgbBagging(FedAvg):
-    """Configurable FedXgbBagging strategy implementation."""
+    """Configurable FedXgbBagging strategy implementation.
+
+    The global model is kept as a parsed tree ensemble across rounds, so that only the
+    trees received from clients are parsed when aggregating a round.
+    """
 
     # pylint: disable=too-many-arguments,too-many-instance-attributes, line-too-long
     def __init__(
@@ -42,6 +46,7 @@ class FedXgbBagging(FedAvg):
     ):
         self.evaluate_function = evaluate_function
         self.global_model: Optional[bytes] = None
+        self._ensemble: Optional[_TreeEnsemble] = None
         super().__init__(**kwargs)
 
     def __repr__(self) -> str:
@@ -62,13 +67,22 @@ class FedXgbBagging(FedAvg):
         if not self.accept_failures and failures:
             return None, {}
 
+        # Parse the global model again only if it was replaced since the last round
+        ensemble = self._ensemble
+        if ensemble is None or ensemble.to_bytes() is not self.global_model:
+            ensemble = _TreeEnsemble(self.global_model) if self.global_model else None
+
         # Aggregate all the client trees
-        global_model = self.global_model
         for _, fit_res in results:
             update = fit_res.parameters.tensors
             for bst in update:
-                global_model = aggregate(global_model, bst)
+                if ensemble is None:
+                    ensemble = _TreeEnsemble(bst)
+                else:
+                    ensemble.append(bst)
 
+        self._ensemble = ensemble
+        global_model = ensemble.to_bytes() if ensemble is not None else None
         self.global_model = global_model
 
         return (
@@ -121,49 +135,68 @@ def aggregate(
     if not bst_prev_org:
         return bst_curr_org
 
-    # Get the tree numbers
-    tree_num_prev, _ = _get_tree_nums(bst_prev_org)
-    _, paral_tree_num_curr = _get_tree_nums(bst_curr_org)
-
-    bst_prev = json.loads(bytearray(bst_prev_org))
-    bst_curr = json.loads(bytearray(bst_curr_org))
-
-    bst_prev["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-        "num_trees"
-    ] = str(tree_num_prev + paral_tree_num_curr)
-    iteration_indptr = bst_prev["learner"]["gradient_booster"]["model"][
-        "iteration_indptr"
-    ]
-    bst_prev["learner"]["gradient_booster"]["model"]["iteration_indptr"].append(
-        iteration_indptr[-1] + paral_tree_num_curr
-    )
-
-    # Aggregate new trees
-    trees_curr = bst_curr["learner"]["gradient_booster"]["model"]["trees"]
-    for tree_count in range(paral_tree_num_curr):
-        trees_curr[tree_count]["id"] = tree_num_prev + tree_count
-        bst_prev["learner"]["gradient_booster"]["model"]["trees"].append(
-            trees_curr[tree_count]
+    ensemble = _TreeEnsemble(bst_prev_org)
+    ensemble.append(bst_curr_org)
+    return ensemble.to_bytes()
+
+
+class _TreeEnsemble:
+    """XGBoost JSON model to which the trees of other models can be appended.
+
+    The trees are stored as serialized JSON, separately from the rest of the model.
+    Appending a model only parses that model, and serializing the ensemble joins the
+    stored trees, so neither depends on the number of trees already in the ensemble.
+    """
+
+    # Placeholder for the trees in the serialized model
+    _TREES_PLACEHOLDER = "__trees__"
+
+    def __init__(self, xgb_model_org: bytes) -> None:
+        self._model = json.loads(bytearray(xgb_model_org))
+        gbtree_model = self._model["learner"]["gradient_booster"]["model"]
+        self._trees = [json.dumps(tree) for tree in gbtree_model["trees"]]
+        gbtree_model["trees"] = self._TREES_PLACEHOLDER
+        self._serialized: Optional[bytes] = xgb_model_org
+
+    @property
+    def _gbtree_model(self) -> Dict[str, Any]:
+        return cast(Dict[str, Any], self._model["learner"]["gradient_booster"]["model"])
+
+    def append(self, xgb_model_org: bytes) -> None:
+        """Append the trees of the last boosting round of a model."""
+        tree_num_prev = int(self._gbtree_model["gbtree_model_param"]["num_trees"])
+        gbtree_model_curr = json.loads(bytearray(xgb_model_org))["learner"][
+            "gradient_booster"
+        ]["model"]
+        paral_tree_num_curr = int(
+            gbtree_model_curr["gbtree_model_param"]["num_parallel_tree"]
+        )
+
+        self._gbtree_model["gbtree_model_param"]["num_trees"] = str(
+            tree_num_prev + paral_tree_num_curr
         )
-        bst_prev["learner"]["gradient_booster"]["model"]["tree_info"].append(0)
-
-    bst_prev_bytes = bytes(json.dumps(bst_prev), "utf-8")
-
-    return bst_prev_bytes
-
-
-def _get_tree_nums(xgb_model_org: bytes) -> Tuple[int, int]:
-    xgb_model = json.loads(bytearray(xgb_model_org))
-    # Get the number of trees
-    tree_num = int(
-        xgb_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "num_trees"
-        ]
-    )
-    # Get the number of parallel trees
-    paral_tree_num = int(
-        xgb_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "num_parallel_tree"
-        ]
-    )
-    return tree_num, paral_tree_num
+        iteration_indptr = self._gbtree_model["iteration_indptr"]
+        iteration_indptr.append(iteration_indptr[-1] + paral_tree_num_curr)
+
+        # Aggregate new trees
+        trees_curr = gbtree_model_curr["trees"]
+        for tree_count in range(paral_tree_num_curr):
+            trees_curr[tree_count]["id"] = tree_num_prev + tree_count
+            self._trees.append(json.dumps(trees_curr[tree_count]))
+            self._gbtree_model["tree_info"].append(0)
+
+        self._serialized = None
+
+    def to_bytes(self) -> bytes:
+        """Serialize the ensemble to an XGBoost JSON model.
+
+        The same object is returned until more trees are appended.
+        """
+        if self._serialized is None:
+            model_json = json.dumps(self._model)
+            trees_json = "[" + ", ".join(self._trees) + "]"
+            self._serialized = bytes(
+                model_json.replace(json.dumps(self._TREES_PLACEHOLDER), trees_json, 1),
+                "utf-8",
+            )
+        return self._serialized
@@ -0,0 +1,113 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""FedXgbBagging tests."""
+
+
+import json
+from typing import Any, Dict, List, Tuple
+from unittest.mock import MagicMock, patch
+
+from flwr.common import Code, FitRes, Parameters, Status
+from flwr.server.client_proxy import ClientProxy
+
+from .fedxgb_bagging import FedXgbBagging, aggregate
+
+
+def _xgb_model(num_trees: int, num_parallel_tree: int, first_leaf: int) -> bytes:
+    """Create a minimal XGBoost JSON model with `num_trees` trees."""
+    model: Dict[str, Any] = {
+        "learner": {
+            "attributes": {},
+            "gradient_booster": {
+                "model": {
+                    "gbtree_model_param": {
+                        "num_parallel_tree": str(num_parallel_tree),
+                        "num_trees": str(num_trees),
+                    },
+                    "iteration_indptr": list(
+                        range(0, num_trees + 1, num_parallel_tree)
+                    ),
+                    "tree_info": [0] * num_trees,
+                    "trees": [
+                        {"base_weights": [float(first_leaf + idx)], "id": idx}
+                        for idx in range(num_trees)
+                    ],
+                },
+                "name": "gbtree",
+            },
+        },
+        "version": [2, 0, 0],
+    }
+    return json.dumps(model, separators=(",", ":")).encode("utf-8")
+
+
+def _fit_res(bst: bytes) -> Tuple[ClientProxy, FitRes]:
+    return (
+        MagicMock(),
+        FitRes(
+            status=Status(code=Code.OK, message="Success"),
+            parameters=Parameters(tensor_type="", tensors=[bst]),
+            num_examples=1,
+            metrics={},
+        ),
+    )
+
+
+def test_aggregate() -> None:
+    """Test appending the trees of a client model to the global model."""
+    # Prepare
+    bst_prev = _xgb_model(num_trees=2, num_parallel_tree=1, first_leaf=0)
+    bst_curr = _xgb_model(num_trees=1, num_parallel_tree=1, first_leaf=10)
+
+    # Execute
+    aggregated = json.loads(aggregate(bst_prev, bst_curr))
+
+    # Assert
+    model = aggregated["learner"]["gradient_booster"]["model"]
+    assert model["gbtree_model_param"]["num_trees"] == "3"
+    assert model["iteration_indptr"] == [0, 1, 2, 3]
+    assert model["tree_info"] == [0, 0, 0]
+    assert model["trees"][-1] == {"base_weights": [10.0], "id": 2}
+    assert aggregated["learner"]["gradient_booster"]["name"] == "gbtree"
+    assert aggregate(None, bst_curr) is bst_curr
+
+
+def test_aggregate_fit_parses_global_model_once() -> None:
+    """Test that the global model is not parsed again in later rounds."""
+    # Prepare
+    strategy = FedXgbBagging()
+    rounds: List[List[Tuple[ClientProxy, FitRes]]] = [
+        [_fit_res(_xgb_model(1, 1, 10 * rnd + idx)) for idx in range(3)]
+        for rnd in range(3)
+    ]
+    expected = None
+    for results in rounds:
+        for _, fit_res in results:
+            expected = aggregate(expected, fit_res.parameters.tensors[0])
+
+    # Execute
+    with patch(
+        "flwr.server.strategy.fedxgb_bagging.json.loads", wraps=json.loads
+    ) as loads:
+        for server_round, results in enumerate(rounds, start=1):
+            parameters, _ = strategy.aggregate_fit(server_round, results, [])
+
+    # Assert
+    assert loads.call_count == 9
+    assert parameters is not None
+    assert parameters.tensors == [expected]
+    assert json.loads(parameters.tensors[0])["learner"]["gradient_booster"]["model"][
+        "iteration_indptr"
+    ] == list(range(10))
@@ -70,6 +70,7 @@ class QFedAvg(FedAvg):
         initial_parameters: Optional[Parameters] = None,
         fit_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
         evaluate_metrics_aggregation_fn: Optional[MetricsAggregationFn] = None,
+        num_aggregation_workers: int = 1,
     ) -> None:
         super().__init__(
             fraction_fit=fraction_fit,
@@ -84,6 +85,7 @@ class QFedAvg(FedAvg):
             initial_parameters=initial_parameters,
             fit_metrics_aggregation_fn=fit_metrics_aggregation_fn,
             evaluate_metrics_aggregation_fn=evaluate_metrics_aggregation_fn,
+            num_aggregation_workers=num_aggregation_workers,
         )
         self.learning_rate = qffl_learning_rate
         self.q_param = q_param
@@ -213,7 +215,9 @@ class QFedAvg(FedAvg):
                 * np.float_power(loss + 1e-10, self.q_param)
             )
 
-        weights_aggregated: NDArrays = aggregate_qffl(weights_before, deltas, hs_ffl)
+        weights_aggregated: NDArrays = aggregate_qffl(
+            weights_before, deltas, hs_ffl, num_workers=self.num_aggregation_workers
+        )
         parameters_aggregated = ndarrays_to_parameters(weights_aggregated)
 
         # Aggregate custom metrics if aggregation fn was provided
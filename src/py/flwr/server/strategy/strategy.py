@@ -105,6 +105,36 @@ class Strategy(ABC):
             the global model parameters remain the same.
         """
 
+    def aggregate_fit_partial(
+        self,
+        server_round: int,  # pylint: disable=unused-argument
+        result: Tuple[ClientProxy, FitRes],  # pylint: disable=unused-argument
+    ) -> bool:
+        """Aggregate a single training result as soon as it is received.
+
+        This method is optional. Strategies that implement it allow the server to
+        fold each result into the aggregate while it is still waiting for other
+        clients, instead of aggregating all results after the slowest client has
+        returned. The final aggregate is still computed in `aggregate_fit`, which
+        receives all results of the round.
+
+        Parameters
+        ----------
+        server_round : int
+            The current round of federated learning.
+        result : Tuple[ClientProxy, FitRes]
+            A successful update from one of the previously selected clients.
+
+        Returns
+        -------
+        aggregated : bool
+            Whether the result has been aggregated. If `True`, the caller may
+            release the parameters of the `FitRes` before it is passed to
+            `aggregate_fit`, leaving them empty. If `False` (the default), the
+            result is passed to `aggregate_fit` unchanged.
+        """
+        return False
+
     @abstractmethod
     def configure_evaluate(
         self, server_round: int, parameters: Parameters, client_manager: ClientManager
@@ -22,6 +22,7 @@ from uuid import UUID
 
 import grpc
 
+from flwr.common.constant import PULL_MAX_WAIT
 from flwr.common.logger import log
 from flwr.common.serde import user_config_from_proto, user_config_to_proto
 from flwr.proto import driver_pb2_grpc  # pylint: disable=E0611
@@ -97,11 +98,10 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
         # Init state
         state: State = self.state_factory.state()
 
-        # Store each TaskIns
-        task_ids: List[Optional[UUID]] = []
-        for task_ins in request.task_ins_list:
-            task_id: Optional[UUID] = state.store_task_ins(task_ins=task_ins)
-            task_ids.append(task_id)
+        # Store all TaskIns at once
+        task_ids: List[Optional[UUID]] = state.store_task_ins_batch(
+            list(request.task_ins_list)
+        )
 
         return PushTaskInsResponse(
             task_ids=[str(task_id) if task_id else "" for task_id in task_ids]
@@ -133,6 +133,12 @@ class DriverServicer(driver_pb2_grpc.DriverServicer):
 
         context.add_callback(on_rpc_done)
 
+        # Long-poll: wait until at least one TaskRes is available
+        if request.timeout > 0:
+            state.wait_for_task_res(
+                task_ids=task_ids, timeout=min(request.timeout, PULL_MAX_WAIT)
+            )
+
         # Read from state
         task_res_list: List[TaskRes] = state.get_task_res(task_ids=task_ids, limit=None)
 
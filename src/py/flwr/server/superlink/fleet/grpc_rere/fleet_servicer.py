@@ -16,9 +16,17 @@
 
 
 from logging import DEBUG, INFO
+from typing import Iterator
 
 import grpc
 
+from flwr.common import GRPC_MAX_MESSAGE_LENGTH
+from flwr.common.chunking import (
+    ArrayChunkAssembler,
+    iter_array_chunks,
+    strip_large_arrays,
+)
+from flwr.common.constant import ARRAY_CHUNK_SIZE, ARRAY_STREAM_MAX_BYTES
 from flwr.common.logger import log
 from flwr.proto import fleet_pb2_grpc  # pylint: disable=E0611
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
@@ -30,8 +38,10 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PingResponse,
     PullTaskInsRequest,
     PullTaskInsResponse,
+    PullTaskInsStreamResponse,
     PushTaskResRequest,
     PushTaskResResponse,
+    PushTaskResStreamRequest,
 )
 from flwr.proto.run_pb2 import GetRunRequest, GetRunResponse  # pylint: disable=E0611
 from flwr.server.superlink.fleet.message_handler import message_handler
@@ -41,8 +51,17 @@ from flwr.server.superlink.state import StateFactory
 class FleetServicer(fleet_pb2_grpc.FleetServicer):
     """Fleet API servicer."""
 
-    def __init__(self, state_factory: StateFactory) -> None:
+    def __init__(
+        self,
+        state_factory: StateFactory,
+        chunk_size: int = ARRAY_CHUNK_SIZE,
+        max_message_length: int = GRPC_MAX_MESSAGE_LENGTH,
+        max_stream_bytes: int = ARRAY_STREAM_MAX_BYTES,
+    ) -> None:
         self.state_factory = state_factory
+        self.chunk_size = chunk_size
+        self.max_message_length = max_message_length
+        self.max_stream_bytes = max_stream_bytes
 
     def CreateNode(
         self, request: CreateNodeRequest, context: grpc.ServicerContext
@@ -92,6 +111,53 @@ class FleetServicer(fleet_pb2_grpc.FleetServicer):
             state=self.state_factory.state(),
         )
 
+    def PullTaskInsStream(
+        self, request: PullTaskInsRequest, context: grpc.ServicerContext
+    ) -> Iterator[PullTaskInsStreamResponse]:
+        """Pull TaskIns, streaming large arrays in chunks."""
+        log(INFO, "FleetServicer.PullTaskInsStream")
+        response = message_handler.pull_task_ins(
+            request=request,
+            state=self.state_factory.state(),
+        )
+        stripped = strip_large_arrays(response.task_ins_list, self.chunk_size)
+        yield PullTaskInsStreamResponse(response=response)
+        for chunk in iter_array_chunks(stripped, self.chunk_size):
+            yield PullTaskInsStreamResponse(chunk=chunk)
+
+    def PushTaskResStream(
+        self,
+        request_iterator: Iterator[PushTaskResStreamRequest],
+        context: grpc.ServicerContext,
+    ) -> PushTaskResResponse:
+        """Push TaskRes, receiving large arrays in chunks."""
+        log(INFO, "FleetServicer.PushTaskResStream")
+        request = PushTaskResRequest()
+        try:
+            stream = iter(request_iterator)
+            first = next(stream, None)
+            if first is None or first.WhichOneof("payload") != "request":
+                raise ValueError("Stream does not start with a PushTaskResRequest.")
+            request = first.request
+            # No array may exceed the size of a unary message, and all arrays of
+            # the stream together may not exceed `max_stream_bytes`
+            assembler = ArrayChunkAssembler(
+                max_bytes=self.max_stream_bytes,
+                max_array_bytes=self.max_message_length,
+            )
+            for stream_request in stream:
+                if stream_request.WhichOneof("payload") != "chunk":
+                    raise ValueError("Unexpected PushTaskResRequest in stream.")
+                assembler.add(stream_request.chunk)
+            assembler.assemble(request.task_res_list)
+        except ValueError as err:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(err))
+
+        return message_handler.push_task_res(
+            request=request,
+            state=self.state_factory.state(),
+        )
+
     def GetRun(
         self, request: GetRunRequest, context: grpc.ServicerContext
     ) -> GetRunResponse:
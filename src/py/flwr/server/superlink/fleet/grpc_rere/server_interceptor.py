@@ -110,6 +110,9 @@ class AuthenticateServerInterceptor(grpc.ServerInterceptor):  # type: ignore
         # One of the method handlers in
         # `flwr.server.superlink.fleet.grpc_rere.fleet_server.FleetServicer`
         method_handler: grpc.RpcMethodHandler = continuation(handler_call_details)
+        if method_handler.unary_unary is None:
+            # Streaming calls cannot be authenticated by the request's HMAC
+            return _unimplemented_stream_method_handler(method_handler)
         return self._generic_auth_unary_method_handler(method_handler)
 
     def _generic_auth_unary_method_handler(
@@ -212,3 +215,33 @@ class AuthenticateServerInterceptor(grpc.ServerInterceptor):  # type: ignore
         # Note: the innermost `CreateNode` method will never be called
         node_id = self.state.create_node(request.ping_interval, public_key_bytes)
         return CreateNodeResponse(node=Node(node_id=node_id, anonymous=False))
+
+
+def _unimplemented_stream_method_handler(
+    method_handler: grpc.RpcMethodHandler,
+) -> grpc.RpcMethodHandler:
+    """Return a handler that rejects a streaming call when authentication is on."""
+
+    def _abort(_: Any, context: grpc.ServicerContext) -> Any:
+        context.abort(
+            grpc.StatusCode.UNIMPLEMENTED,
+            "Streaming calls are not supported with client authentication",
+        )
+
+    if method_handler.unary_stream is not None:
+        return grpc.unary_stream_rpc_method_handler(
+            _abort,
+            request_deserializer=method_handler.request_deserializer,
+            response_serializer=method_handler.response_serializer,
+        )
+    if method_handler.stream_unary is not None:
+        return grpc.stream_unary_rpc_method_handler(
+            _abort,
+            request_deserializer=method_handler.request_deserializer,
+            response_serializer=method_handler.response_serializer,
+        )
+    return grpc.stream_stream_rpc_method_handler(
+        _abort,
+        request_deserializer=method_handler.request_deserializer,
+        response_serializer=method_handler.response_serializer,
+    )
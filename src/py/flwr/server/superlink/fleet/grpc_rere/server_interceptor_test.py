@@ -36,6 +36,7 @@ from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     PingResponse,
     PullTaskInsRequest,
     PullTaskInsResponse,
+    PullTaskInsStreamResponse,
     PushTaskResRequest,
     PushTaskResResponse,
 )
@@ -91,6 +92,11 @@ class TestServerInterceptor(unittest.TestCase):  # pylint: disable=R0902
             request_serializer=PullTaskInsRequest.SerializeToString,
             response_deserializer=PullTaskInsResponse.FromString,
         )
+        self._pull_task_ins_stream = self._channel.unary_stream(
+            "/flwr.proto.Fleet/PullTaskInsStream",
+            request_serializer=PullTaskInsRequest.SerializeToString,
+            response_deserializer=PullTaskInsStreamResponse.FromString,
+        )
         self._push_task_res = self._channel.unary_unary(
             "/flwr.proto.Fleet/PushTaskRes",
             request_serializer=PushTaskResRequest.SerializeToString,
@@ -498,3 +504,23 @@ class TestServerInterceptor(unittest.TestCase):  # pylint: disable=R0902
         assert call.initial_metadata()[0] == expected_metadata
         assert isinstance(response, CreateNodeResponse)
         assert response.node.node_id == client_node_id
+
+    def test_unsupported_streaming_pull_task_ins(self) -> None:
+        """Test server interceptor for streaming calls."""
+        # Prepare
+        node_id = self.state.create_node(
+            ping_interval=30, public_key=public_key_to_bytes(self._client_public_key)
+        )
+        public_key_bytes = base64.urlsafe_b64encode(
+            public_key_to_bytes(self._client_public_key)
+        )
+
+        # Execute & Assert
+        with self.assertRaises(grpc.RpcError) as context:
+            list(
+                self._pull_task_ins_stream(
+                    request=PullTaskInsRequest(node=Node(node_id=node_id)),
+                    metadata=((_PUBLIC_KEY_HEADER, public_key_bytes),),
+                )
+            )
+        assert context.exception.code() == grpc.StatusCode.UNIMPLEMENTED
@@ -15,12 +15,15 @@
 """Fleet API message handlers."""
 
 
+import threading
 import time
 from typing import List, Optional
 from uuid import UUID
 
+from flwr.common.constant import PULL_MAX_WAIT, PULL_MAX_WAITERS
 from flwr.common.serde import user_config_to_proto
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
+    CachedArrayRef,
     CreateNodeRequest,
     CreateNodeResponse,
     DeleteNodeRequest,
@@ -42,6 +45,10 @@ from flwr.proto.run_pb2 import (  # pylint: disable=E0611
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import State
 
+# Bounds the number of PullTaskIns requests waiting for TaskIns at once, so that
+# they cannot take up all workers of the server
+_pull_waiters = threading.BoundedSemaphore(PULL_MAX_WAITERS)
+
 
 def create_node(
     request: CreateNodeRequest,  # pylint: disable=unused-argument
@@ -79,12 +86,48 @@ def pull_task_ins(request: PullTaskInsRequest, state: State) -> PullTaskInsRespo
     node = request.node  # pylint: disable=no-member
     node_id: Optional[int] = None if node.anonymous else node.node_id
 
-    # Retrieve TaskIns from State
-    task_ins_list: List[TaskIns] = state.get_task_ins(node_id=node_id, limit=1)
+    # Wait for TaskIns if requested, unless the client node is anonymous or too
+    # many requests are waiting already
+    if (
+        node_id is not None
+        and request.timeout > 0
+        and _pull_waiters.acquire(blocking=False)  # pylint: disable=R1732
+    ):
+        try:
+            state.wait_for_task_ins(
+                node_ids={node_id}, timeout=min(request.timeout, PULL_MAX_WAIT)
+            )
+        finally:
+            _pull_waiters.release()
+
+    # Retrieve TaskIns from State, leaving out the data of arrays the node has
+    # cached. Arrays are stored in State by their SHA-256 hash, so the hashes
+    # announced by the node are blob IDs
+    task_ins_list: List[TaskIns] = []
+    cached_arrays: List[CachedArrayRef] = []
+    if request.cached_arrays:
+        task_ins_list, omitted_refs = state.get_task_ins_omitting_blobs(
+            node_id=node_id,
+            limit=1,
+            blob_ids={digest.sha256 for digest in request.cached_arrays},
+        )
+        cached_arrays = [
+            CachedArrayRef(
+                task_index=task_index,
+                record_key=record_key,
+                array_index=array_index,
+                sha256=blob_id,
+            )
+            for task_index, refs in enumerate(omitted_refs)
+            for record_key, array_index, blob_id in refs
+        ]
+    else:
+        task_ins_list = state.get_task_ins(node_id=node_id, limit=1)
 
     # Build response
     response = PullTaskInsResponse(
         task_ins_list=task_ins_list,
+        cached_arrays=cached_arrays,
     )
     return response
 
@@ -15,16 +15,25 @@
 """Fleet API message handler tests."""
 
 
-from unittest.mock import MagicMock
+import hashlib
+import threading
+from unittest.mock import MagicMock, patch
 
+from flwr.common.constant import PULL_MAX_WAIT
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
+    ArrayDigest,
     CreateNodeRequest,
     DeleteNodeRequest,
     PullTaskInsRequest,
     PushTaskResRequest,
 )
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
-from flwr.proto.task_pb2 import Task, TaskRes  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import (  # pylint: disable=E0611
+    Array,
+    ParametersRecord,
+    RecordSet,
+)
+from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
 
 from .message_handler import create_node, delete_node, pull_task_ins, push_task_res
 
@@ -96,11 +105,94 @@ def test_pull_task_ins() -> None:
     state.create_node.assert_not_called()
     state.delete_node.assert_not_called()
     state.store_task_ins.assert_not_called()
+    state.wait_for_task_ins.assert_not_called()
     state.get_task_ins.assert_called_once()
     state.store_task_res.assert_not_called()
     state.get_task_res.assert_not_called()
 
 
+def test_pull_task_ins_with_timeout() -> None:
+    """Test that pull_task_ins waits for TaskIns at most `PULL_MAX_WAIT`."""
+    # Prepare
+    request = PullTaskInsRequest(
+        node=Node(node_id=1, anonymous=False), timeout=PULL_MAX_WAIT + 1
+    )
+    state = MagicMock()
+
+    # Execute
+    pull_task_ins(request=request, state=state)
+
+    # Assert
+    state.wait_for_task_ins.assert_called_once_with(node_ids={1}, timeout=PULL_MAX_WAIT)
+    state.get_task_ins.assert_called_once_with(node_id=1, limit=1)
+
+
+def test_pull_task_ins_with_too_many_waiters() -> None:
+    """Test that pull_task_ins does not wait if too many requests are waiting."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=1, anonymous=False), timeout=5)
+    state = MagicMock()
+
+    # Execute
+    with patch(
+        "flwr.server.superlink.fleet.message_handler.message_handler._pull_waiters",
+        threading.BoundedSemaphore(1),
+    ) as waiters:
+        waiters.acquire()
+        pull_task_ins(request=request, state=state)
+
+    # Assert
+    state.wait_for_task_ins.assert_not_called()
+    state.get_task_ins.assert_called_once_with(node_id=1, limit=1)
+
+
+def test_pull_task_ins_anonymous_with_timeout() -> None:
+    """Test that pull_task_ins does not wait for TaskIns of anonymous nodes."""
+    # Prepare
+    request = PullTaskInsRequest(node=Node(node_id=0, anonymous=True), timeout=5)
+    state = MagicMock()
+
+    # Execute
+    pull_task_ins(request=request, state=state)
+
+    # Assert
+    state.wait_for_task_ins.assert_not_called()
+    state.get_task_ins.assert_called_once_with(node_id=None, limit=1)
+
+
+def test_pull_task_ins_leaves_out_cached_arrays() -> None:
+    """Test that pull_task_ins leaves out the data of arrays cached by the node."""
+    # Prepare
+    sha256 = hashlib.sha256(b"\x01" * 1000).hexdigest()
+    record = ParametersRecord(
+        data_keys=["0", "1"],
+        data_values=[Array(data=b""), Array(data=b"\x02" * 1000)],
+    )
+    state = MagicMock()
+    state.get_task_ins_omitting_blobs.return_value = (
+        [TaskIns(task=Task(recordset=RecordSet(parameters={"params": record})))],
+        [[("params", 0, sha256)]],
+    )
+    request = PullTaskInsRequest(
+        node=Node(node_id=1, anonymous=False),
+        cached_arrays=[ArrayDigest(sha256=sha256, size=1000)],
+    )
+
+    # Execute
+    response = pull_task_ins(request=request, state=state)
+
+    # Assert
+    state.get_task_ins_omitting_blobs.assert_called_once_with(
+        node_id=1, limit=1, blob_ids={sha256}
+    )
+    state.get_task_ins.assert_not_called()
+    assert len(response.task_ins_list) == 1
+    assert len(response.cached_arrays) == 1
+    ref = response.cached_arrays[0]
+    assert (ref.task_index, ref.record_key, ref.array_index) == (0, "params", 0)
+    assert ref.sha256 == sha256
+
+
 def test_push_task_res() -> None:
     """Test push_task_res."""
     # Prepare
@@ -16,13 +16,16 @@
 
 
 import sys
+from functools import partial
+from typing import Optional
 
-from flwr.common.constant import MISSING_EXTRA_REST
+from flwr.common.constant import MISSING_EXTRA_REST, PULL_MAX_WAITERS
 from flwr.proto.fleet_pb2 import (  # pylint: disable=E0611
     CreateNodeRequest,
     DeleteNodeRequest,
     PingRequest,
     PullTaskInsRequest,
+    PullTaskInsResponse,
     PushTaskResRequest,
 )
 from flwr.proto.run_pb2 import GetRunRequest  # pylint: disable=E0611
@@ -30,6 +33,7 @@ from flwr.server.superlink.fleet.message_handler import message_handler
 from flwr.server.superlink.state import State
 
 try:
+    from anyio import CapacityLimiter, to_thread
     from starlette.applications import Starlette
     from starlette.datastructures import Headers
     from starlette.exceptions import HTTPException
@@ -40,6 +44,33 @@ except ModuleNotFoundError:
     sys.exit(MISSING_EXTRA_REST)
 
 
+# PullTaskIns requests wait for TaskIns in threads of their own limiter, separate
+# from the default limiter of the event loop. The limiter is created on first use
+_pull_task_ins_limiter: Optional[CapacityLimiter] = None
+_num_pull_task_ins_waiters = 0  # pylint: disable=invalid-name
+
+
+async def _wait_and_pull_task_ins(
+    request: PullTaskInsRequest, state: State
+) -> PullTaskInsResponse:
+    """Handle a PullTaskIns request in a thread, or right away if too many wait."""
+    global _pull_task_ins_limiter, _num_pull_task_ins_waiters  # pylint: disable=W0603
+    if request.timeout <= 0 or _num_pull_task_ins_waiters >= PULL_MAX_WAITERS:
+        request.timeout = 0
+        return message_handler.pull_task_ins(request=request, state=state)
+
+    if _pull_task_ins_limiter is None:
+        _pull_task_ins_limiter = CapacityLimiter(PULL_MAX_WAITERS)
+    _num_pull_task_ins_waiters += 1
+    try:
+        return await to_thread.run_sync(
+            partial(message_handler.pull_task_ins, request=request, state=state),
+            limiter=_pull_task_ins_limiter,
+        )
+    finally:
+        _num_pull_task_ins_waiters -= 1
+
+
 async def create_node(request: Request) -> Response:
     """Create Node."""
     _check_headers(request.headers)
@@ -111,9 +142,8 @@ async def pull_task_ins(request: Request) -> Response:
     state: State = app.state.STATE_FACTORY.state()
 
     # Handle message
-    pull_task_ins_response_proto = message_handler.pull_task_ins(
-        request=pull_task_ins_request_proto,
-        state=state,
+    pull_task_ins_response_proto = await _wait_and_pull_task_ins(
+        request=pull_task_ins_request_proto, state=state
     )
 
     # Return serialized ProtoBuf
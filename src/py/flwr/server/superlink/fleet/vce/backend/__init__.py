@@ -17,12 +17,13 @@
 import importlib
 from typing import Dict, Type
 
-from .backend import Backend, BackendConfig
+from .backend import Backend, BackendConfig, BackendResult
+from .processpoolbackend import ProcessPoolBackend
 
 is_ray_installed = importlib.util.find_spec("ray") is not None
 
 # Mapping of supported backends
-supported_backends: Dict[str, Type[Backend]] = {}
+supported_backends: Dict[str, Type[Backend]] = {"process": ProcessPoolBackend}
 
 # To log backend-specific error message when chosen backend isn't available
 error_messages_backends: Dict[str, str] = {}
@@ -45,4 +46,5 @@ else:
 __all__ = [
     "Backend",
     "BackendConfig",
+    "BackendResult",
 ]
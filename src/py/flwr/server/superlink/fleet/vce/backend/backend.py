@@ -16,7 +16,7 @@
 
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, List, Tuple, Union
 
 from flwr.client.client_app import ClientApp
 from flwr.common.context import Context
@@ -24,6 +24,7 @@ from flwr.common.message import Message
 from flwr.common.typing import ConfigsRecordValues
 
 BackendConfig = Dict[str, Dict[str, ConfigsRecordValues]]
+BackendResult = Union[Tuple[Message, Context], Exception]
 
 
 class Backend(ABC):
@@ -49,6 +50,19 @@ class Backend(ABC):
         """
         return 0
 
+    @property
+    def max_batch_size(self) -> int:
+        """Return the maximum number of TaskIns a worker processes at once."""
+        return 1
+
+    def scale(self, num_queued: int) -> None:
+        """Adapt the number of workers to the number of queued TaskIns.
+
+        The Simulation Engine calls this periodically and then runs as many TaskIns
+        concurrently as `num_workers` returns. Backends with a fixed number of workers
+        do not need to override this method.
+        """
+
     @abstractmethod
     def is_worker_idle(self) -> bool:
         """Report whether a backend worker is idle and can therefore run a ClientApp."""
@@ -65,3 +79,22 @@ class Backend(ABC):
         context: Context,
     ) -> Tuple[Message, Context]:
         """Submit a job to the backend."""
+
+    def process_messages(
+        self,
+        app: Callable[[], ClientApp],
+        messages: List[Tuple[Message, Context]],
+    ) -> List[BackendResult]:
+        """Submit a batch of jobs to the backend.
+
+        Return, for each message, either the output message and updated context, or the
+        exception raised while processing it. Backends can override this method to run
+        all jobs with a single call to a worker.
+        """
+        results: List[BackendResult] = []
+        for message, context in messages:
+            try:
+                results.append(self.process_message(app, message, context))
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                results.append(ex)
+        return results
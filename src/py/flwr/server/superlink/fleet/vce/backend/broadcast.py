@@ -0,0 +1,128 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Broadcast of payloads shared by the messages of a simulation round."""
+
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from flwr.common.message import Message
+
+# `Array` data of at least this size is shared between messages
+SHARED_PAYLOAD_MIN_BYTES = 64 * 1024
+
+# Number of leading and trailing bytes used to look up identical payloads
+_KEY_BYTES = 64
+
+PayloadKey = Tuple[int, bytes, bytes]
+
+
+class SharedBytesHandle(ABC):
+    """A handle from which a backend loads the bytes of a `SharedBytes` object."""
+
+    @property
+    @abstractmethod
+    def key(self) -> str:
+        """Return a key identifying the bytes."""
+
+    @abstractmethod
+    def load(self) -> bytes:
+        """Load the bytes."""
+
+
+class SharedBytes(bytes):
+    """Bytes shared by several messages, e.g., the global model of a round.
+
+    A backend can attach a `handle` to them, e.g., to put them in an object store
+    once instead of sending them with every message. Such `SharedBytes` are pickled
+    as their handle, and loaded only once per process and round when unpickled.
+    Without a handle, they are pickled as plain bytes.
+    """
+
+    handle: Optional[SharedBytesHandle] = None
+    generation: int = 0
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the handle instead of the bytes, if there is one."""
+        if self.handle is None:
+            return bytes, (bytes(self),)
+        return _load_shared_bytes, (self.handle, self.generation)
+
+
+# Bytes loaded from handles in this process, and the latest generation among them
+_loaded_bytes: Dict[str, Tuple[int, bytes]] = {}
+_loaded_generation: int = 0
+
+
+def _load_shared_bytes(handle: SharedBytesHandle, generation: int) -> bytes:
+    """Load the bytes of a handle, reusing them if they were loaded before."""
+    global _loaded_generation  # pylint: disable=global-statement
+    loaded = _loaded_bytes.get(handle.key)
+    if loaded is not None:
+        return loaded[1]
+
+    if generation > _loaded_generation:
+        # Drop the bytes of earlier rounds
+        for key in [k for k, v in _loaded_bytes.items() if v[0] < generation]:
+            del _loaded_bytes[key]
+        _loaded_generation = generation
+    data = handle.load()
+    _loaded_bytes[handle.key] = (generation, data)
+    return data
+
+
+class PayloadInterner:
+    """Let messages with identical `Array` data share a single `SharedBytes` object.
+
+    Every call to `share` starts a new generation. Payloads identical to the ones
+    shared in the previous generation are shared with it, so that a round whose
+    messages are retrieved in several parts still shares one copy of its payloads.
+    """
+
+    def __init__(self, min_bytes: int = SHARED_PAYLOAD_MIN_BYTES) -> None:
+        self._min_bytes = min_bytes
+        self._generation = 0
+        self._shared: Dict[PayloadKey, List[SharedBytes]] = {}
+
+    def share(self, messages: List[Message]) -> None:
+        """Replace identical `Array` data in `messages` by shared bytes in place."""
+        self._generation += 1
+        previous, self._shared = self._shared, {}
+        for message in messages:
+            if not message.has_content():
+                continue
+            for record in message.content.parameters_records.values():
+                for array in record.values():
+                    if len(array.data) >= self._min_bytes:
+                        array.data = self._intern(array.data, previous)
+
+    def _intern(
+        self, data: bytes, previous: Dict[PayloadKey, List[SharedBytes]]
+    ) -> SharedBytes:
+        """Return the shared bytes equal to `data`, creating them if needed."""
+        key = (len(data), data[:_KEY_BYTES], data[-_KEY_BYTES:])
+        candidates = self._shared.setdefault(key, [])
+        for shared in candidates:
+            if shared == data:
+                return shared
+        for shared in previous.get(key, []):
+            if shared == data:
+                candidates.append(shared)
+                return shared
+
+        shared = SharedBytes(data)
+        shared.generation = self._generation
+        candidates.append(shared)
+        return shared
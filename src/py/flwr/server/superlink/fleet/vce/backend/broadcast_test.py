@@ -0,0 +1,147 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the broadcast of shared payloads."""
+
+
+import pickle
+from typing import Dict, List
+
+import numpy as np
+
+from flwr.common import DEFAULT_TTL, Message, Metadata, RecordSet
+from flwr.common.parameter import ndarrays_to_parameters
+from flwr.common.record import Array, ParametersRecord
+from flwr.common.serde import recordset_from_proto, recordset_to_proto
+from flwr.common.typing import NDArrays
+
+from .broadcast import (
+    SHARED_PAYLOAD_MIN_BYTES,
+    PayloadInterner,
+    SharedBytes,
+    SharedBytesHandle,
+)
+
+
+class _CountingHandle(SharedBytesHandle):
+    """A handle counting how often its bytes are loaded."""
+
+    store: Dict[str, bytes] = {}
+    loads = 0
+
+    def __init__(self, data: bytes, key: str) -> None:
+        _CountingHandle.store[key] = bytes(data)
+        self._key = key
+
+    @property
+    def key(self) -> str:
+        """Return the key."""
+        return self._key
+
+    def load(self) -> bytes:
+        """Return the bytes and count the load."""
+        _CountingHandle.loads += 1
+        return _CountingHandle.store[self._key]
+
+
+def _message(layers: NDArrays) -> Message:
+    """Create a Message with a ParametersRecord holding `layers`."""
+    parameters = ndarrays_to_parameters(layers)
+    record = ParametersRecord()
+    for idx, tensor in enumerate(parameters.tensors):
+        record[str(idx)] = Array(dtype="", shape=[], stype="numpy.ndarray", data=tensor)
+    content = RecordSet(parameters_records={"parameters": record})
+    # Decode from proto as the Simulation Engine does, so no bytes are shared yet
+    content = recordset_from_proto(recordset_to_proto(content))
+    return Message(
+        metadata=Metadata(
+            run_id=0,
+            message_id="",
+            src_node_id=0,
+            dst_node_id=1,
+            reply_to_message="",
+            group_id="",
+            ttl=DEFAULT_TTL,
+            message_type="train",
+        ),
+        content=content,
+    )
+
+
+def _data(message: Message) -> List[bytes]:
+    record = message.content.parameters_records["parameters"]
+    return [array.data for array in record.values()]
+
+
+def test_interner_shares_identical_payloads() -> None:
+    """Test that identical large payloads are shared and others are not."""
+    # Prepare
+    size = SHARED_PAYLOAD_MIN_BYTES // 4
+    global_model: NDArrays = [np.arange(size, dtype=np.float32), np.ones(2)]
+    messages = [_message(global_model) for _ in range(3)]
+    messages.append(_message([global_model[0] + 1, global_model[1]]))
+    interner = PayloadInterner()
+
+    # Execute
+    interner.share(messages)
+
+    # Assert
+    data = [_data(message) for message in messages]
+    assert isinstance(data[0][0], SharedBytes)
+    assert data[0][0] is data[1][0] is data[2][0]
+    assert data[3][0] is not data[0][0]
+    assert not isinstance(data[0][1], SharedBytes)
+    assert data[0] == ndarrays_to_parameters(global_model).tensors
+
+
+def test_interner_shares_payloads_with_previous_generation() -> None:
+    """Test that a round retrieved in two parts shares one copy of its payloads."""
+    # Prepare
+    layers = [np.arange(SHARED_PAYLOAD_MIN_BYTES // 4, dtype=np.float32)]
+    first, second, third = _message(layers), _message(layers), _message(layers)
+    interner = PayloadInterner()
+
+    # Execute
+    interner.share([first])
+    interner.share([second])
+    interner.share([])
+    interner.share([third])
+
+    # Assert
+    assert _data(first)[0] is _data(second)[0]
+    assert _data(third)[0] is not _data(first)[0]
+    assert _data(third)[0] == _data(first)[0]
+
+
+def test_shared_bytes_pickling() -> None:
+    """Test that SharedBytes are pickled as plain bytes or as their handle."""
+    # Prepare
+    data = SharedBytes(b"\x01" * 10_000)
+    _CountingHandle.loads = 0
+
+    # Execute
+    plain = pickle.loads(pickle.dumps(data))
+    data.handle = _CountingHandle(data, key="test-key")
+    data.generation = 1
+    payload = pickle.dumps([data, data])
+    first = pickle.loads(payload)
+    second = pickle.loads(payload)
+
+    # Assert
+    assert isinstance(plain, bytes) and not isinstance(plain, SharedBytes)
+    assert plain == data
+    assert len(payload) < len(data)
+    assert first[0] == data
+    assert first[0] is first[1] is second[0]
+    assert _CountingHandle.loads == 1
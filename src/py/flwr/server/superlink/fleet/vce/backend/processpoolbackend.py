@@ -0,0 +1,364 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multiprocessing backend for the Fleet API using the Simulation Engine."""
+
+
+import io
+import multiprocessing
+import os
+import pathlib
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from logging import DEBUG
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from flwr.client.client_app import ClientApp, ClientAppException, LoadClientAppError
+from flwr.common.context import Context
+from flwr.common.logger import log
+from flwr.common.message import Message
+
+from .backend import Backend, BackendConfig, BackendResult
+
+ClientAppFn = Callable[[], ClientApp]
+
+DEFAULT_MAX_BATCH_SIZE = 8
+
+# Byte strings of at least this size (e.g., the data of an `Array` in a
+# `ParametersRecord`) are passed to and from workers through shared memory
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+# Shared memory segments are released as soon as they are closed on Windows, so
+# they can only be handed over from one process to another on POSIX systems
+_USE_SHARED_MEMORY = os.name == "posix"
+
+
+class _JobError(NamedTuple):
+    """An exception raised by a job in a worker process."""
+
+    load_error: bool
+    message: str
+
+
+# ClientApp of a worker process, loaded on first use for each run
+_worker_app_fn: Optional[ClientAppFn] = None
+_worker_app: Optional[Tuple[int, ClientApp]] = None
+
+
+def _init_worker(app_fn: ClientAppFn) -> None:
+    """Set the function loading the ClientApp of a worker process."""
+    global _worker_app_fn, _worker_app  # pylint: disable=global-statement
+    _worker_app_fn = app_fn
+    _worker_app = None
+
+
+def _load_worker_app(run_id: int) -> ClientApp:
+    """Load the ClientApp of a worker process once per run."""
+    global _worker_app  # pylint: disable=global-statement
+    if _worker_app is None or _worker_app[0] != run_id:
+        # Drop the ClientApp of the previous run before loading the new one
+        _worker_app = None
+        _worker_app = (run_id, _worker_app_fn())  # type: ignore
+    return _worker_app[1]
+
+
+def _run_batch(payload: bytes, segment: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Run the ClientApp on a batch of messages in a worker process."""
+    jobs: List[Tuple[Message, Context]] = _loads(payload, segment)
+
+    results: List[Any] = []
+    # If a batch contains several messages for the same node, each of them must
+    # see the context updated by the previous one
+    latest_contexts: Dict[int, Context] = {}
+    for message, context in jobs:
+        context = latest_contexts.get(context.node_id, context)
+        try:
+            app = _load_worker_app(message.metadata.run_id)
+        except LoadClientAppError as ex:
+            results.append(_JobError(load_error=True, message=str(ex)))
+            continue
+        try:
+            out_message = app(message=message, context=context)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            results.append(_JobError(load_error=False, message=str(ex)))
+            continue
+        latest_contexts[context.node_id] = context
+        results.append((out_message, context))
+
+    return _dumps(results)
+
+
+def _dumps(obj: Any) -> Tuple[bytes, Optional[str]]:
+    """Pickle `obj`, moving large byte strings to a shared memory segment.
+
+    Returns the pickled object and the name of the segment, or `None` if no
+    segment was needed. The process loading the object releases the segment.
+    """
+    if not _USE_SHARED_MEMORY:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), None
+
+    blobs: List[bytes] = []
+    offsets: List[int] = [0]
+    # Byte strings shared by several messages, e.g. `SharedBytes`, are stored once
+    pids: Dict[int, Tuple[int, int]] = {}
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj: Any) -> Optional[Tuple[int, int]]:
+            if not isinstance(obj, bytes) or len(obj) < SHARED_MEMORY_MIN_BYTES:
+                return None
+            if id(obj) not in pids:
+                blobs.append(obj)
+                offsets.append(offsets[-1] + len(obj))
+                pids[id(obj)] = (offsets[-2], len(obj))
+            return pids[id(obj)]
+
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    if not blobs:
+        return buffer.getvalue(), None
+
+    segment = shared_memory.SharedMemory(create=True, size=offsets[-1])
+    for blob, offset in zip(blobs, offsets):
+        segment.buf[offset : offset + len(blob)] = blob
+    segment.close()
+    # The segment is handed over to the loading process, which releases it
+    _unregister_segment(segment.name)
+    return buffer.getvalue(), segment.name
+
+
+def _loads(payload: bytes, segment_name: Optional[str]) -> Any:
+    """Unpickle an object pickled by `_dumps` and release its segment."""
+    if segment_name is None:
+        return pickle.loads(payload)
+
+    segment = shared_memory.SharedMemory(name=segment_name)
+    try:
+
+        loaded: Dict[Tuple[int, int], bytes] = {}
+
+        class _Unpickler(pickle.Unpickler):
+            def persistent_load(self, pid: Any) -> bytes:
+                offset, size = pid
+                if pid not in loaded:
+                    loaded[pid] = bytes(segment.buf[offset : offset + size])
+                return loaded[pid]
+
+        return _Unpickler(io.BytesIO(payload)).load()
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def _unregister_segment(name: str) -> None:
+    """Stop tracking a shared memory segment created by this process."""
+    # pylint: disable-next=import-outside-toplevel
+    from multiprocessing import resource_tracker
+
+    resource_tracker.unregister(f"/{name}", "shared_memory")
+
+
+class ProcessPoolBackend(Backend):
+    """A backend that runs ClientApps in a pool of local processes.
+
+    Compared to `RayBackend`, it starts instantly and does not need Ray, but it only
+    uses the CPUs of the local machine. Large byte strings in messages and contexts,
+    such as the arrays of a `ParametersRecord`, are passed to and from the worker
+    processes through shared memory.
+
+    Worker processes are started with the first ClientApp, using the "forkserver"
+    start method where available. The function loading the ClientApp must therefore
+    be picklable. The "fork" start method, with which the workers inherit the
+    ClientApp instead, can be selected explicitly. It is not the default because
+    forking the multi-threaded SuperLink process can deadlock the workers.
+
+    Supported backend config entries are `init_args.num_workers` (default: the
+    number of CPUs), `init_args.start_method` and `actor.max_batch_size` (default:
+    8).
+    """
+
+    def __init__(
+        self,
+        backend_config: BackendConfig,
+        work_dir: str,
+    ) -> None:
+        """Prepare ProcessPoolBackend."""
+        log(DEBUG, "Initialising: %s", self.__class__.__name__)
+        log(DEBUG, "Backend config: %s", backend_config)
+
+        if not pathlib.Path(work_dir).exists():
+            raise ValueError(f"Specified work_dir {work_dir} does not exist.")
+
+        init_args = backend_config.get("init_args", {})
+        self._num_workers = _validate_positive_int(
+            init_args.get("num_workers", os.cpu_count() or 1), "init_args.num_workers"
+        )
+        self._max_batch_size = _validate_positive_int(
+            backend_config.get("actor", {}).get(
+                "max_batch_size", DEFAULT_MAX_BATCH_SIZE
+            ),
+            "actor.max_batch_size",
+        )
+        start_methods = multiprocessing.get_all_start_methods()
+        start_method = init_args.get(
+            "start_method", "forkserver" if "forkserver" in start_methods else None
+        )
+        if start_method is not None and start_method not in start_methods:
+            raise ValueError(
+                f"`init_args.start_method` must be one of {start_methods}, "
+                f"but got {start_method!r}."
+            )
+        self._mp_context = multiprocessing.get_context(
+            None if start_method is None else str(start_method)
+        )
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._app_fn: Optional[ClientAppFn] = None
+        self._num_busy_workers = 0
+
+    @property
+    def num_workers(self) -> int:
+        """Return number of worker processes."""
+        return self._num_workers
+
+    @property
+    def max_batch_size(self) -> int:
+        """Return the maximum number of messages sent to a worker at once."""
+        return self._max_batch_size
+
+    def is_worker_idle(self) -> bool:
+        """Report whether a worker process is idle."""
+        with self._lock:
+            return self._num_busy_workers < self._num_workers
+
+    def build(self) -> None:
+        """Build backend.
+
+        Worker processes are started with the first ClientApp.
+        """
+
+    def _get_executor(self, app: ClientAppFn) -> ProcessPoolExecutor:
+        """Return the pool of workers running `app`, starting it if needed."""
+        with self._lock:
+            if self._executor is None or self._app_fn is not app:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+                self._check_picklable(app)
+                self._app_fn = app
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._num_workers,
+                    mp_context=self._mp_context,
+                    initializer=_init_worker,
+                    initargs=(app,),
+                )
+                log(DEBUG, "Started pool of %i processes", self._num_workers)
+            self._num_busy_workers += 1
+            return self._executor
+
+    def _check_picklable(self, app: ClientAppFn) -> None:
+        """Check that `app` can be sent to worker processes that are not forked."""
+        start_method = self._mp_context.get_start_method()
+        if start_method == "fork":
+            return
+        try:
+            pickle.dumps(app)
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            raise ValueError(
+                f"The function loading the ClientApp cannot be pickled, which is "
+                f"required by the {start_method!r} start method ({ex}). Load the "
+                f"ClientApp by reference, or set `init_args.start_method` to 'fork'."
+            ) from ex
+
+    def process_message(
+        self,
+        app: ClientAppFn,
+        message: Message,
+        context: Context,
+    ) -> Tuple[Message, Context]:
+        """Run ClientApp that process a given message.
+
+        Return output message and updated context.
+        """
+        result = self.process_messages(app, [(message, context)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def process_messages(
+        self,
+        app: ClientAppFn,
+        messages: List[Tuple[Message, Context]],
+    ) -> List[BackendResult]:
+        """Run ClientApp on a batch of messages in a single worker process.
+
+        Return, for each message, the output message and updated context, or the
+        exception raised while processing it.
+        """
+        executor = self._get_executor(app)
+        try:
+            payload, segment = _dumps(messages)
+            try:
+                out_payload, out_segment = executor.submit(
+                    _run_batch, payload, segment
+                ).result()
+            except BaseException:
+                # Release the segment if the worker did not
+                if segment is not None:
+                    _release_segment(segment)
+                raise
+        finally:
+            with self._lock:
+                self._num_busy_workers -= 1
+
+        results: List[BackendResult] = []
+        for result in _loads(out_payload, out_segment):
+            if isinstance(result, _JobError):
+                if result.load_error:
+                    results.append(LoadClientAppError(result.message))
+                else:
+                    results.append(ClientAppException(result.message))
+            else:
+                results.append(result)
+        return results
+
+    def terminate(self) -> None:
+        """Terminate all worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        log(DEBUG, "Terminated %s", self.__class__.__name__)
+
+
+def _release_segment(name: str) -> None:
+    """Release a shared memory segment handed over to another process."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def _validate_positive_int(value: Any, name: str) -> int:
+    """Return `value` if it is an integer greater than zero."""
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(
+            f"`{name}` in the backend config must be an integer greater than zero, "
+            f"but got {value!r}."
+        )
+    return value
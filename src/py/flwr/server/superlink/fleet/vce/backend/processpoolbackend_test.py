@@ -0,0 +1,223 @@
+# Copyright 2024 Flower Labs GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Test for multiprocessing backend for the Fleet API using the Simulation Engine."""
+
+
+from math import pi
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Tuple
+from unittest import TestCase
+
+from flwr.client import Client, NumPyClient
+from flwr.client.client_app import ClientApp, ClientAppException
+from flwr.common import (
+    DEFAULT_TTL,
+    Config,
+    ConfigsRecord,
+    Context,
+    GetPropertiesIns,
+    Message,
+    MessageTypeLegacy,
+    Metadata,
+    RecordSet,
+    Scalar,
+)
+from flwr.common.recordset_compat import getpropertiesins_to_recordset
+
+from . import supported_backends
+from .backend import BackendConfig
+from .broadcast import SharedBytes
+from .processpoolbackend import (
+    SHARED_MEMORY_MIN_BYTES,
+    ProcessPoolBackend,
+    _dumps,
+    _loads,
+)
+
+
+class DummyClient(NumPyClient):
+    """A dummy NumPyClient for tests."""
+
+    def get_properties(self, config: Config) -> Dict[str, Scalar]:
+        """Return properties by doing a simple calculation."""
+        if config["factor"] == 0:
+            raise ValueError("Factor must not be zero")
+        result = float(config["factor"]) * pi
+
+        # store something in context
+        self.context.state.configs_records["result"] = ConfigsRecord({"result": result})
+        return {"result": result}
+
+
+def get_dummy_client(context: Context) -> Client:  # pylint: disable=unused-argument
+    """Return a DummyClient converted to Client type."""
+    return DummyClient().to_client()
+
+
+def _load_app() -> ClientApp:
+    return ClientApp(client_fn=get_dummy_client)
+
+
+def _create_message_and_context(factor: int, node_id: int) -> Tuple[Message, Context]:
+    getproperties_ins = GetPropertiesIns(config={"factor": factor})
+    message = Message(
+        content=getpropertiesins_to_recordset(getproperties_ins),
+        metadata=Metadata(
+            run_id=0,
+            message_id="",
+            group_id="",
+            src_node_id=0,
+            dst_node_id=node_id,
+            reply_to_message="",
+            ttl=DEFAULT_TTL,
+            message_type=MessageTypeLegacy.GET_PROPERTIES,
+        ),
+    )
+    context = Context(node_id=node_id, node_config={}, state=RecordSet(), run_config={})
+    return message, context
+
+
+class AsyncTestProcessPoolBackend(TestCase):
+    """A basic class to test the multiprocessing backend."""
+
+    def setUp(self) -> None:
+        """Create a backend with a single worker process."""
+        self.backend = ProcessPoolBackend(
+            backend_config={"init_args": {"num_workers": 1}},
+            work_dir=str(Path.cwd()),
+        )
+        self.backend.build()
+
+    def tearDown(self) -> None:
+        """Terminate the backend."""
+        self.backend.terminate()
+
+    def test_process_message(self) -> None:
+        """Test processing a single message in a worker process."""
+        # Prepare
+        message, context = _create_message_and_context(factor=2024, node_id=1)
+
+        # Execute
+        out_message, updated_context = self.backend.process_message(
+            _load_app, message, context
+        )
+
+        # Assert
+        content = out_message.content
+        assert (
+            content.configs_records["getpropertiesres.properties"]["result"]
+            == 2024 * pi
+        )
+        assert updated_context.state.configs_records["result"]["result"] == 2024 * pi
+
+    def test_process_messages_with_failing_message(self) -> None:
+        """Test that a failing message does not affect the rest of a batch."""
+        # Prepare
+        messages = [
+            _create_message_and_context(factor=1, node_id=1),
+            _create_message_and_context(factor=0, node_id=2),
+            _create_message_and_context(factor=3, node_id=3),
+        ]
+
+        # Execute
+        results = self.backend.process_messages(_load_app, messages)
+
+        # Assert
+        assert len(results) == 3
+        assert isinstance(results[1], ClientAppException)
+        for idx in (0, 2):
+            result = results[idx]
+            assert not isinstance(result, Exception)
+            assert result[1].node_id == messages[idx][1].node_id
+        assert self.backend.is_worker_idle()
+
+
+def test_shared_memory_roundtrip() -> None:
+    """Test passing large byte strings through a shared memory segment."""
+    # Prepare
+    blobs = [bytes([idx]) * SHARED_MEMORY_MIN_BYTES for idx in range(3)]
+    obj = {"small": b"abc", "large": blobs}
+
+    # Execute
+    payload, segment = _dumps(obj)
+    loaded = _loads(payload, segment)
+
+    # Assert
+    assert loaded == obj
+    assert segment is not None
+    assert len(payload) < SHARED_MEMORY_MIN_BYTES
+    try:
+        shared_memory.SharedMemory(name=segment)
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError("Shared memory segment was not released")
+
+
+def test_shared_memory_stores_shared_bytes_once() -> None:
+    """Test that a byte string in several messages is passed only once."""
+    # Prepare
+    blob = SharedBytes(b"\x01" * SHARED_MEMORY_MIN_BYTES)
+
+    # Execute
+    payload, segment = _dumps([blob, blob, bytes(blob)])
+    loaded = _loads(payload, segment)
+
+    # Assert
+    assert loaded == [blob] * 3
+    assert loaded[0] is loaded[1]
+    assert loaded[0] is not loaded[2]
+
+
+def test_invalid_backend_config() -> None:
+    """Test that an invalid backend config is rejected."""
+    backend_configs: List[BackendConfig] = [
+        {"init_args": {"num_workers": 0}},
+        {"init_args": {"start_method": "invalid"}},
+        {"actor": {"max_batch_size": "8"}},
+    ]
+    for backend_config in backend_configs:
+        try:
+            ProcessPoolBackend(backend_config, work_dir=str(Path.cwd()))
+        except ValueError:
+            continue
+        raise AssertionError(f"Config {backend_config} was not rejected")
+
+
+def test_backend_is_supported() -> None:
+    """Test that the backend can be selected by name."""
+    assert supported_backends["process"] is ProcessPoolBackend
+
+
+def test_unpicklable_app_requires_fork() -> None:
+    """Test that an unpicklable ClientApp is rejected without the fork method."""
+    # Prepare
+    backend = ProcessPoolBackend(
+        {"init_args": {"num_workers": 1, "start_method": "spawn"}},
+        work_dir=str(Path.cwd()),
+    )
+    message, context = _create_message_and_context(factor=1, node_id=1)
+    app = ClientApp(client_fn=get_dummy_client)
+
+    # Execute & Assert
+    try:
+        backend.process_message(lambda: app, message, context)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unpicklable ClientApp was not rejected")
+    finally:
+        backend.terminate()
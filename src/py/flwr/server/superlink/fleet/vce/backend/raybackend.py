@@ -14,9 +14,11 @@
 # ==============================================================================
 """Ray backend for the Fleet API using the Simulation Engine."""
 
+import math
 import pathlib
+import threading
 from logging import DEBUG, ERROR
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import ray
 
@@ -26,17 +28,71 @@ from flwr.common.context import Context
 from flwr.common.logger import log
 from flwr.common.message import Message
 from flwr.common.typing import ConfigsRecordValues
-from flwr.simulation.ray_transport.ray_actor import BasicActorPool, ClientAppActor
+from flwr.simulation.ray_transport.ray_actor import (
+    BasicActorPool,
+    ClientAppActor,
+    ClientAppFnRef,
+    pool_size_from_resources,
+)
 from flwr.simulation.ray_transport.utils import enable_tf_gpu_growth
 
-from .backend import Backend, BackendConfig
+from .backend import Backend, BackendConfig, BackendResult
+from .broadcast import SharedBytes, SharedBytesHandle
 
 ClientResourcesDict = Dict[str, Union[int, float]]
 ActorArgsDict = Dict[str, Union[int, float, Callable[[], None]]]
 RunTimeEnvDict = Dict[str, Union[str, List[str]]]
 
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_IDLE_TIMEOUT = 30.0
+DEFAULT_SCALE_UP_THRESHOLD = 1.0
 
-class RayBackend(Backend):
+
+class AutoscalingConfig(NamedTuple):
+    """Settings of the autoscaling of the ActorPool."""
+
+    min_actors: int
+    idle_timeout: float
+    scale_up_threshold: float
+
+
+def _num_desired_actors(
+    num_queued: int,
+    num_actors: int,
+    message_latency: Optional[float],
+    scale_up_threshold: float,
+) -> int:
+    """Return the number of actors needed to process the queued TaskIns in time."""
+    if message_latency is None:
+        # Nothing is known about the ClientApp yet, so scale with the queue
+        return num_actors + num_queued
+    if num_queued * message_latency <= scale_up_threshold * num_actors:
+        return num_actors
+    num_desired = math.ceil(
+        num_queued * message_latency / max(scale_up_threshold, 1e-3)
+    )
+    # There is no point in having more actors than queued TaskIns
+    return min(num_desired, num_actors + num_queued)
+
+
+class ObjectStoreHandle(SharedBytesHandle):
+    """A handle to `SharedBytes` stored once in the Ray object store."""
+
+    def __init__(self, data: SharedBytes) -> None:
+        self.object_ref = ray.put(data)
+
+    @property
+    def key(self) -> str:
+        """Return the ID of the object in the object store."""
+        return str(self.object_ref.hex())
+
+    def load(self) -> bytes:
+        """Get the bytes from the object store."""
+        data: bytes = ray.get(self.object_ref)
+        return data
+
+
+class RayBackend(Backend):  # pylint: disable=R0902
     """A backend that submits jobs to a `BasicActorPool`."""
 
     def __init__(
@@ -61,6 +117,8 @@ class RayBackend(Backend):
 
         # Create actor pool
         actor_kwargs = self._validate_actor_arguments(config=backend_config)
+        self._max_batch_size = self._validate_max_batch_size(config=backend_config)
+        self._autoscaling = self._validate_autoscaling(config=backend_config)
 
         self.pool = BasicActorPool(
             actor_type=ClientAppActor,
@@ -68,6 +126,40 @@ class RayBackend(Backend):
             actor_kwargs=actor_kwargs,
         )
 
+        # The last ClientAppFn passed to the actors, stored in the object store
+        self._app_fn_ref: Optional[Tuple[Callable[[], ClientApp], ClientAppFnRef]] = (
+            None
+        )
+        self._app_fn_ref_lock = threading.Lock()
+        self._broadcast_lock = threading.Lock()
+
+    def _get_app_fn_ref(self, app: Callable[[], ClientApp]) -> ClientAppFnRef:
+        """Return the ClientAppFnRef of `app`, putting it in the object store once.
+
+        Actors keep the ClientApp loaded as long as they receive the same
+        ClientAppFnRef, so passing a new `app` makes them load it again.
+        """
+        with self._app_fn_ref_lock:
+            if self._app_fn_ref is None or self._app_fn_ref[0] is not app:
+                self._app_fn_ref = (app, ClientAppFnRef(app))
+            return self._app_fn_ref[1]
+
+    def _broadcast(self, messages: List[Message]) -> None:
+        """Put the `SharedBytes` in `messages` in the object store once.
+
+        Actors then receive them from the object store instead of with every message,
+        and load them only once per round.
+        """
+        with self._broadcast_lock:
+            for message in messages:
+                if not message.has_content():
+                    continue
+                for record in message.content.parameters_records.values():
+                    for array in record.values():
+                        data = array.data
+                        if isinstance(data, SharedBytes) and data.handle is None:
+                            data.handle = ObjectStoreHandle(data)
+
     def _configure_runtime_env(self, work_dir: str) -> RunTimeEnvDict:
         """Return list of files/subdirectories to exclude relative to work_dir.
 
@@ -123,6 +215,45 @@ class RayBackend(Backend):
                 actor_args["on_actor_init_fn"] = enable_tf_gpu_growth
         return actor_args
 
+    def _validate_max_batch_size(self, config: BackendConfig) -> int:
+        actor_args_config = config.get("actor", {})
+        max_batch_size = actor_args_config.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)
+        if not isinstance(max_batch_size, int) or max_batch_size < 1:
+            raise ValueError(
+                f"`max_batch_size` is expected to be an `int` >= 1 but found "
+                f"`{max_batch_size!r}`"
+            )
+        return max_batch_size
+
+    def _validate_autoscaling(
+        self, config: BackendConfig
+    ) -> Optional[AutoscalingConfig]:
+        autoscaling_config = config.get("autoscaling", {})
+        if not autoscaling_config:
+            return None
+        autoscaling = AutoscalingConfig(
+            min_actors=autoscaling_config.get("min_actors", 1),  # type: ignore
+            idle_timeout=autoscaling_config.get(  # type: ignore
+                "idle_timeout", DEFAULT_IDLE_TIMEOUT
+            ),
+            scale_up_threshold=autoscaling_config.get(  # type: ignore
+                "scale_up_threshold", DEFAULT_SCALE_UP_THRESHOLD
+            ),
+        )
+        if not isinstance(autoscaling.min_actors, int) or autoscaling.min_actors < 1:
+            raise ValueError(
+                f"`autoscaling.min_actors` is expected to be an `int` >= 1 but found "
+                f"`{autoscaling.min_actors!r}`"
+            )
+        for key in ("idle_timeout", "scale_up_threshold"):
+            value = getattr(autoscaling, key)
+            if not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(
+                    f"`autoscaling.{key}` is expected to be a number >= 0 but found "
+                    f"`{value!r}`"
+                )
+        return autoscaling
+
     def init_ray(self, backend_config: BackendConfig, work_dir: str) -> None:
         """Intialises Ray if not already initialised."""
         if not ray.is_initialized():
@@ -150,15 +281,75 @@ class RayBackend(Backend):
         """Return number of actors in pool."""
         return self.pool.num_actors
 
+    @property
+    def max_batch_size(self) -> int:
+        """Return the maximum number of messages sent to an actor at once."""
+        return self._max_batch_size
+
     def is_worker_idle(self) -> bool:
         """Report whether the pool has idle actors."""
         return self.pool.is_actor_available()
 
     def build(self) -> None:
-        """Build pool of Ray actors that this backend will submit jobs to."""
-        self.pool.add_actors_to_pool(self.pool.actors_capacity)
+        """Build pool of Ray actors that this backend will submit jobs to.
+
+        With autoscaling, the pool starts with `autoscaling.min_actors` actors.
+        """
+        num_actors = self.pool.actors_capacity
+        if self._autoscaling is not None:
+            num_actors = min(num_actors, self._autoscaling.min_actors)
+        self.pool.add_actors_to_pool(num_actors)
         log(DEBUG, "Constructed ActorPool with: %i actors", self.pool.num_actors)
 
+    def scale(self, num_queued: int) -> None:
+        """Add or remove actors if autoscaling is enabled.
+
+        Actors are added if the queued TaskIns would take the current ones longer
+        than `autoscaling.scale_up_threshold` seconds to process, judging by the
+        time actors took per message so far, as long as they fit in the cluster.
+        Actors that have been idle for `autoscaling.idle_timeout` seconds while no
+        TaskIns are queued are terminated.
+        """
+        if self._autoscaling is None:
+            return
+
+        if num_queued == 0:
+            num_removed = self.pool.remove_idle_actors(
+                idle_timeout=self._autoscaling.idle_timeout,
+                min_actors=self._autoscaling.min_actors,
+            )
+            if num_removed:
+                log(
+                    DEBUG,
+                    "Terminated %i idle actors, %i left in ActorPool",
+                    num_removed,
+                    self.pool.num_actors,
+                )
+            return
+
+        num_actors = self.pool.num_actors
+        num_desired = _num_desired_actors(
+            num_queued=num_queued,
+            num_actors=num_actors,
+            message_latency=self.pool.message_latency,
+            scale_up_threshold=self._autoscaling.scale_up_threshold,
+        )
+        if num_desired <= num_actors:
+            return
+
+        # Only add actors that fit in the cluster, which might have grown
+        self.pool.actors_capacity = pool_size_from_resources(self.pool.client_resources)
+        num_new = min(num_desired, self.pool.actors_capacity) - num_actors
+        if num_new > 0:
+            self.pool.add_actors_to_pool(num_new)
+            log(
+                DEBUG,
+                "Added %i actors for %i queued TaskIns, %i in ActorPool",
+                num_new,
+                num_queued,
+                self.pool.num_actors,
+            )
+
     def process_message(
         self,
         app: Callable[[], ClientApp],
@@ -170,12 +361,13 @@ class RayBackend(Backend):
         Return output message and updated context.
         """
         partition_id = context.node_config[PARTITION_ID_KEY]
+        self._broadcast([message])
 
         try:
             # Submit a task to the pool
             future = self.pool.submit(
                 lambda a, a_fn, mssg, cid, state: a.run.remote(a_fn, mssg, cid, state),
-                (app, message, str(partition_id), context),
+                (self._get_app_fn_ref(app), message, str(partition_id), context),
             )
 
             # Fetch result
@@ -196,8 +388,46 @@ class RayBackend(Backend):
             self.pool.add_actor_back_to_pool(future)
             raise ex
 
+    def process_messages(
+        self,
+        app: Callable[[], ClientApp],
+        messages: List[Tuple[Message, Context]],
+    ) -> List[BackendResult]:
+        """Run ClientApp on a batch of messages with a single actor call.
+
+        Return, for each message, the output message and updated context, or the
+        exception raised while processing it.
+        """
+        jobs = [
+            (message, str(context.node_config[PARTITION_ID_KEY]), context)
+            for message, context in messages
+        ]
+        self._broadcast([message for message, _ in messages])
+
+        try:
+            # Submit all jobs to the same actor
+            future = self.pool.submit_batch(
+                lambda a, a_fn, batch: a.run_batch.remote(a_fn, batch),
+                (self._get_app_fn_ref(app), jobs),
+            )
+
+            # Fetch results
+            return self.pool.fetch_batch_results_and_return_actor_to_pool(future)
+
+        except Exception as ex:
+            log(
+                ERROR,
+                "An exception was raised when processing a batch of messages by %s",
+                self.__class__.__name__,
+            )
+            # add actor back into pool
+            self.pool.add_actor_back_to_pool(future)
+            raise ex
+
     def terminate(self) -> None:
         """Terminate all actors in actor pool."""
+        hits, misses = self.pool.app_cache_info()
+        log(DEBUG, "ClientApp reused %i times, loaded %i times", hits, misses)
         self.pool.terminate_all_actors()
         ray.shutdown()
         log(DEBUG, "Terminated %s", self.__class__.__name__)
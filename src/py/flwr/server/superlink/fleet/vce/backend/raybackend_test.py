@@ -19,27 +19,44 @@ from pathlib import Path
 from typing import Callable, Dict, Optional, Tuple, Union
 from unittest import TestCase
 
+import numpy as np
 import ray
 
 from flwr.client import Client, NumPyClient
-from flwr.client.client_app import ClientApp, LoadClientAppError
+from flwr.client.client_app import ClientApp, ClientAppException, LoadClientAppError
 from flwr.client.node_state import NodeState
 from flwr.common import (
     DEFAULT_TTL,
     Config,
     ConfigsRecord,
     Context,
+    FitIns,
     GetPropertiesIns,
     Message,
+    MessageType,
     MessageTypeLegacy,
     Metadata,
+    NDArrays,
     Scalar,
+    ndarrays_to_parameters,
+    parameters_to_ndarrays,
 )
 from flwr.common.constant import PARTITION_ID_KEY
 from flwr.common.object_ref import load_app
-from flwr.common.recordset_compat import getpropertiesins_to_recordset
+from flwr.common.recordset_compat import (
+    fitins_to_recordset,
+    getpropertiesins_to_recordset,
+    recordset_to_fitres,
+)
 from flwr.server.superlink.fleet.vce.backend.backend import BackendConfig
-from flwr.server.superlink.fleet.vce.backend.raybackend import RayBackend
+from flwr.server.superlink.fleet.vce.backend.broadcast import (
+    PayloadInterner,
+    SharedBytes,
+)
+from flwr.server.superlink.fleet.vce.backend.raybackend import (
+    RayBackend,
+    _num_desired_actors,
+)
 
 
 class DummyClient(NumPyClient):
@@ -53,6 +70,12 @@ class DummyClient(NumPyClient):
         self.context.state.configs_records["result"] = ConfigsRecord({"result": result})
         return {"result": result}
 
+    def fit(
+        self, parameters: NDArrays, config: Config
+    ) -> Tuple[NDArrays, int, Dict[str, Scalar]]:
+        """Return the received parameters incremented by one."""
+        return [layer + 1 for layer in parameters], 1, {}
+
 
 def get_dummy_client(context: Context) -> Client:  # pylint: disable=unused-argument
     """Return a DummyClient converted to Client type."""
@@ -178,6 +201,162 @@ class TestRayBackend(TestCase):
         ]
         assert obtained_result_in_context == expected_output
 
+    def test_backend_process_messages(self) -> None:
+        """Test submitting a batch of messages, one of which fails."""
+        backend = RayBackend(
+            backend_config={
+                "init_args": {"num_cpus": 1},
+                "client_resources": {"num_cpus": 1, "num_gpus": 0},
+                "actor": {"max_batch_size": 4},
+            },
+            work_dir="",
+        )
+        backend.build()
+        message, context, expected_output = _create_message_and_context()
+        failing_message, failing_context, _ = _create_message_and_context()
+        failing_message.content = getpropertiesins_to_recordset(
+            GetPropertiesIns(config={"factor": "not-a-number"})
+        )
+
+        # Execute
+        results = backend.process_messages(
+            _load_app,
+            [
+                (message, context),
+                (failing_message, failing_context),
+                (message, context),
+            ],
+        )
+        backend.terminate()
+
+        # Assert
+        assert backend.max_batch_size == 4
+        assert len(results) == 3
+        assert isinstance(results[1], ClientAppException)
+        for result in (results[0], results[2]):
+            assert not isinstance(result, Exception)
+            out_mssg, updated_context = result
+            assert (
+                out_mssg.content.configs_records["getpropertiesres.properties"][
+                    "result"
+                ]
+                == expected_output
+            )
+            assert (
+                updated_context.state.configs_records["result"]["result"]
+                == expected_output
+            )
+
+    def test_backend_reuses_client_app(self) -> None:
+        """Test that actors load the ClientApp again only if it changes."""
+        backend = RayBackend(
+            backend_config={
+                "init_args": {"num_cpus": 1},
+                "client_resources": {"num_cpus": 1, "num_gpus": 0},
+            },
+            work_dir="",
+        )
+        backend.build()
+        message, context, _ = _create_message_and_context()
+
+        # Execute
+        for app_fn in [_load_app, _load_app, lambda: client_app]:
+            backend.process_messages(app_fn, [(message, context)] * 3)
+            backend.process_message(app_fn, message, context)
+        hits, misses = backend.pool.app_cache_info()
+        backend.terminate()
+
+        # Assert
+        assert (hits, misses) == (10, 2)
+
+    def test_backend_broadcasts_shared_payloads(self) -> None:
+        """Test that actors receive payloads shared by messages correctly."""
+        backend = RayBackend(
+            backend_config={
+                "init_args": {"num_cpus": 1},
+                "client_resources": {"num_cpus": 1, "num_gpus": 0},
+            },
+            work_dir="",
+        )
+        backend.build()
+        model: NDArrays = [np.arange(100_000, dtype=np.float32), np.ones(3)]
+        fitins = FitIns(parameters=ndarrays_to_parameters(model), config={})
+        jobs = []
+        for _ in range(3):
+            message, context, _ = _create_message_and_context()
+            message.metadata.message_type = MessageType.TRAIN
+            message.content = fitins_to_recordset(fitins, keep_input=True)
+            jobs.append((message, context))
+        PayloadInterner().share([message for message, _ in jobs])
+
+        # Execute
+        results = backend.process_messages(_load_app, jobs)
+        backend.terminate()
+
+        # Assert
+        shared = jobs[0][0].content.parameters_records["fitins.parameters"]
+        data = [array.data for array in shared.values()]
+        assert isinstance(data[0], SharedBytes) and data[0].handle is not None
+        for result in results:
+            assert not isinstance(result, Exception)
+            fitres = recordset_to_fitres(result[0].content, keep_input=False)
+            updated = parameters_to_ndarrays(fitres.parameters)
+            np.testing.assert_array_equal(updated[0], model[0] + 1)
+            np.testing.assert_array_equal(updated[1], model[1] + 1)
+
+    def test_backend_autoscaling(self) -> None:
+        """Test that actors are added for queued TaskIns and removed when idle."""
+        backend = RayBackend(
+            backend_config={
+                "init_args": {"num_cpus": 1},
+                "client_resources": {"num_cpus": 0.25, "num_gpus": 0},
+                "autoscaling": {"min_actors": 1, "idle_timeout": 0.0},
+            },
+            work_dir="",
+        )
+        backend.build()
+        message, context, _ = _create_message_and_context()
+
+        # Execute
+        num_workers = [backend.num_workers]
+        backend.scale(num_queued=2)
+        num_workers.append(backend.num_workers)
+        backend.process_messages(_load_app, [(message, context)] * 2)
+        backend.scale(num_queued=0)
+        num_workers.append(backend.num_workers)
+        backend.terminate()
+
+        # Assert
+        assert num_workers == [1, 3, 1]
+        assert backend.pool.message_latency is not None
+
+    def test_num_desired_actors(self) -> None:
+        """Test the number of actors autoscaling aims for."""
+        # No latency observed yet
+        assert _num_desired_actors(10, 2, None, 1.0) == 12
+        # Queue processed in time by the current actors
+        assert _num_desired_actors(10, 2, 0.1, 1.0) == 2
+        # Queue too long for the current actors
+        assert _num_desired_actors(10, 2, 0.5, 1.0) == 5
+        # No more actors than queued TaskIns
+        assert _num_desired_actors(3, 2, 10.0, 1.0) == 5
+
+    def test_backend_invalid_autoscaling(self) -> None:
+        """Test that an invalid autoscaling config is rejected."""
+        with self.assertRaises(ValueError):
+            RayBackend(
+                backend_config={"autoscaling": {"min_actors": 0}},
+                work_dir="",
+            )
+
+    def test_backend_invalid_max_batch_size(self) -> None:
+        """Test that an invalid `max_batch_size` is rejected."""
+        with self.assertRaises(ValueError):
+            RayBackend(
+                backend_config={"actor": {"max_batch_size": 0}},
+                work_dir="",
+            )
+
     def test_backend_creation_submit_and_termination_non_existing_client_app(
         self,
     ) -> None:
@@ -19,15 +19,14 @@ import json
 import threading
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from logging import DEBUG, ERROR, INFO, WARN
 from pathlib import Path
 from queue import Empty, Queue
-from time import sleep
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from flwr.client.client_app import ClientApp, ClientAppException, LoadClientAppError
-from flwr.client.node_state import NodeState
+from flwr.client.node_state import ContextStore, NodeState
 from flwr.client.supernode.app import _get_load_client_app_fn
 from flwr.common.constant import (
     NUM_PARTITIONS_KEY,
@@ -36,16 +35,66 @@ from flwr.common.constant import (
     ErrorCode,
 )
 from flwr.common.logger import log
-from flwr.common.message import Error
+from flwr.common.message import Error, Message
 from flwr.common.serde import message_from_taskins, message_to_taskres
 from flwr.common.typing import Run
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import State, StateFactory
 
-from .backend import Backend, error_messages_backends, supported_backends
+from .backend import Backend, BackendResult, error_messages_backends, supported_backends
+from .backend.broadcast import PayloadInterner
 
 NodeToPartitionMapping = Dict[int, int]
 
+# Maximum number of TaskRes stored in State at once
+MAX_TASK_RES_BATCH_SIZE = 256
+
+# Interval (in seconds) at which the backend can adapt its number of workers
+BACKEND_SCALE_INTERVAL = 1.0
+
+
+class _ClientAppLoader:
+    """Load the ClientApp of a simulation once.
+
+    When pickled, e.g., to start the workers of a backend, a loader with a `load_fn`
+    leaves out the loaded ClientApp, which is then loaded again by reference.
+    """
+
+    def __init__(
+        self,
+        load_fn: Optional[Callable[[], ClientApp]] = None,
+        app: Optional[ClientApp] = None,
+    ) -> None:
+        self._load_fn = load_fn
+        self._app = app
+
+    def __call__(self) -> ClientApp:
+        """Return the ClientApp, loading it on first use."""
+        if self._app is None:
+            if self._load_fn is None:
+                raise LoadClientAppError("No ClientApp to load.")
+            self._app = self._load_fn()
+        return self._app
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave out the ClientApp if it can be loaded again."""
+        state = self.__dict__.copy()
+        if self._load_fn is not None:
+            state["_app"] = None
+        return state
+
+
+def _load_client_app(
+    client_app_attr: str, app_dir: str, flwr_dir: Optional[str], run: Run
+) -> ClientApp:
+    """Load a ClientApp by reference."""
+    return _get_load_client_app_fn(
+        default_app_ref=client_app_attr,
+        project_dir=app_dir,
+        flwr_dir=flwr_dir,
+        multi_app=True,
+    )(run.fab_id, run.fab_version)
+
 
 def _register_nodes(
     num_nodes: int, state_factory: StateFactory
@@ -64,6 +113,7 @@ def _register_node_states(
     nodes_mapping: NodeToPartitionMapping,
     run: Run,
     app_dir: Optional[str] = None,
+    context_store: Optional[ContextStore] = None,
 ) -> Dict[int, NodeState]:
     """Create NodeState objects and pre-register the context for the run."""
     node_states: Dict[int, NodeState] = {}
@@ -75,6 +125,7 @@ def _register_node_states(
                 PARTITION_ID_KEY: partition_id,
                 NUM_PARTITIONS_KEY: num_partitions,
             },
+            context_store=context_store,
         )
 
         # Pre-register Context objects
@@ -85,94 +136,196 @@ def _register_node_states(
     return node_states
 
 
-# pylint: disable=too-many-arguments,too-many-locals
+def _create_context_store(backend_config: Dict[str, Any]) -> Optional[ContextStore]:
+    """Create a ContextStore if it is enabled in the backend config."""
+    store_config = backend_config.get("context_store", {})
+    if not store_config:
+        return None
+    max_contexts_in_memory = store_config.get("max_contexts_in_memory")
+    if not isinstance(max_contexts_in_memory, int) or max_contexts_in_memory < 1:
+        raise ValueError(
+            "`context_store.max_contexts_in_memory` in the backend config must be "
+            f"an integer greater than zero, but got {max_contexts_in_memory!r}."
+        )
+    database = store_config.get("database")
+    log(
+        INFO,
+        "Keeping at most %i node contexts in memory, spilling others to %s",
+        max_contexts_in_memory,
+        database or "a temporary file",
+    )
+    return ContextStore(max_contexts_in_memory, database=database)
+
+
+def _error_reply(message: Message, ex: Exception) -> Message:
+    """Create an error reply to a message that could not be processed."""
+    if isinstance(ex, ClientAppException):
+        e_code = ErrorCode.CLIENT_APP_RAISED_EXCEPTION
+    elif isinstance(ex, LoadClientAppError):
+        e_code = ErrorCode.LOAD_CLIENT_APP_EXCEPTION
+    else:
+        e_code = ErrorCode.UNKNOWN
+
+    reason = str(type(ex)) + ":<'" + str(ex) + "'>"
+    return message.create_error_reply(error=Error(code=e_code, reason=reason))
+
+
+def _process_task_ins_batch(
+    app_fn: Callable[[], ClientApp],
+    task_ins_batch: List[Tuple[TaskIns, Message]],
+    node_states: Dict[int, NodeState],
+    backend: Backend,
+) -> List[TaskRes]:
+    """Process a batch of TaskIns with a single call to the backend."""
+    results: List[BackendResult]
+    try:
+        # Retrieve context
+        jobs = [
+            (
+                message,
+                node_states[task_ins.task.consumer.node_id].retrieve_context(
+                    run_id=task_ins.run_id
+                ),
+            )
+            for task_ins, message in task_ins_batch
+        ]
+
+        # Let backend process messages
+        results = backend.process_messages(app_fn, jobs)
+    # Exceptions aren't raised but reported as an error message
+    except Exception as ex:  # pylint: disable=broad-exception-caught
+        results = [ex for _ in task_ins_batch]
+
+    task_res_list: List[TaskRes] = []
+    for (task_ins, message), result in zip(task_ins_batch, results):
+        if isinstance(result, Exception):
+            log(ERROR, result)
+            log(
+                ERROR,
+                "".join(
+                    traceback.format_exception(
+                        type(result), result, result.__traceback__
+                    )
+                ),
+            )
+            out_mssg = _error_reply(message, result)
+        else:
+            out_mssg, updated_context = result
+            # Update Context
+            node_states[task_ins.task.consumer.node_id].update_context(
+                task_ins.run_id, context=updated_context
+            )
+
+        # Convert to TaskRes
+        task_res = message_to_taskres(out_mssg)
+        task_res.task.pushed_at = time.time()
+        task_res_list.append(task_res)
+    return task_res_list
+
+
+# pylint: disable=too-many-arguments
 def worker(
     app_fn: Callable[[], ClientApp],
-    taskins_queue: "Queue[TaskIns]",
+    taskins_queue: "Queue[Tuple[TaskIns, Message]]",
     taskres_queue: "Queue[TaskRes]",
     node_states: Dict[int, NodeState],
     backend: Backend,
     f_stop: threading.Event,
+    worker_id: int = 0,
 ) -> None:
-    """Get TaskIns from queue and pass it to an actor in the pool to execute it."""
+    """Get TaskIns from queue and pass them to an actor in the pool to execute them.
+
+    When more TaskIns are queued than there are workers, up to
+    `backend.max_batch_size` of them are sent to the backend at once. The worker
+    stops when the backend scales down to `worker_id` workers or less.
+    """
     while not f_stop.is_set():
-        out_mssg = None
+        if worker_id >= backend.num_workers:
+            break
         try:
             # Fetch from queue with timeout. We use a timeout so
             # the stopping event can be evaluated even when the queue is empty.
-            task_ins: TaskIns = taskins_queue.get(timeout=1.0)
-            node_id = task_ins.task.consumer.node_id
-
-            # Retrieve context
-            context = node_states[node_id].retrieve_context(run_id=task_ins.run_id)
-
-            # Convert TaskIns to Message
-            message = message_from_taskins(task_ins)
-
-            # Let backend process message
-            out_mssg, updated_context = backend.process_message(
-                app_fn, message, context
-            )
-
-            # Update Context
-            node_states[node_id].update_context(
-                task_ins.run_id, context=updated_context
-            )
+            task_ins_batch = [taskins_queue.get(timeout=1.0)]
         except Empty:
             # An exception raised if queue.get times out
-            pass
-        # Exceptions aren't raised but reported as an error message
-        except Exception as ex:  # pylint: disable=broad-exception-caught
-            log(ERROR, ex)
-            log(ERROR, traceback.format_exc())
-
-            if isinstance(ex, ClientAppException):
-                e_code = ErrorCode.CLIENT_APP_RAISED_EXCEPTION
-            elif isinstance(ex, LoadClientAppError):
-                e_code = ErrorCode.LOAD_CLIENT_APP_EXCEPTION
-            else:
-                e_code = ErrorCode.UNKNOWN
-
-            reason = str(type(ex)) + ":<'" + str(ex) + "'>"
-            out_mssg = message.create_error_reply(
-                error=Error(code=e_code, reason=reason)
-            )
+            continue
+
+        # Group queued TaskIns, leaving enough of them for the other workers
+        batch_size = min(
+            backend.max_batch_size,
+            1 + taskins_queue.qsize() // max(1, backend.num_workers),
+        )
+        while len(task_ins_batch) < batch_size:
+            try:
+                task_ins_batch.append(taskins_queue.get_nowait())
+            except Empty:
+                break
 
-        finally:
-            if out_mssg:
-                # Convert to TaskRes
-                task_res = message_to_taskres(out_mssg)
-                # Store TaskRes in state
-                task_res.task.pushed_at = time.time()
-                taskres_queue.put(task_res)
+        # Store TaskRes in state
+        for task_res in _process_task_ins_batch(
+            app_fn, task_ins_batch, node_states, backend
+        ):
+            taskres_queue.put(task_res)
 
 
 def add_taskins_to_queue(
     state: State,
-    queue: "Queue[TaskIns]",
+    queue: "Queue[Tuple[TaskIns, Message]]",
     nodes_mapping: NodeToPartitionMapping,
     f_stop: threading.Event,
 ) -> None:
-    """Put TaskIns in a queue from State."""
+    """Put TaskIns and the Messages they carry in a queue from State.
+
+    Identical `Array` data in the Messages retrieved together, such as the global
+    model sent to all nodes in a round, is decoded into a single shared object.
+    """
+    node_ids = set(nodes_mapping.keys())
+    interner = PayloadInterner()
     while not f_stop.is_set():
-        for node_id in nodes_mapping.keys():
-            task_ins_list = state.get_task_ins(node_id=node_id, limit=1)
-            for task_ins in task_ins_list:
-                queue.put(task_ins)
-        sleep(0.1)
+        # Wait until TaskIns are stored for any of the nodes. We use a timeout so
+        # the stopping event can be evaluated even when no TaskIns are stored.
+        if state.wait_for_task_ins(node_ids=node_ids, timeout=1.0):
+            task_ins_list = state.get_task_ins_for_nodes(node_ids=node_ids)
+            # Convert TaskIns to Message
+            messages = [message_from_taskins(task_ins) for task_ins in task_ins_list]
+            interner.share(messages)
+            for task_ins, message in zip(task_ins_list, messages):
+                # Only the Message keeps the content, shared with other Messages
+                task_ins.task.ClearField("recordset")
+                queue.put((task_ins, message))
 
 
 def put_taskres_into_state(
     state: State, queue: "Queue[TaskRes]", f_stop: threading.Event
 ) -> None:
-    """Put TaskRes into State from a queue."""
+    """Put TaskRes into State from a queue.
+
+    All TaskRes queued at once are stored with a single call to the State.
+    """
     while not f_stop.is_set():
         try:
-            taskres = queue.get(timeout=1.0)
-            state.store_task_res(taskres)
+            task_res_list = [queue.get(timeout=1.0)]
         except Empty:
             # queue is empty when timeout was triggered
-            pass
+            continue
+
+        while len(task_res_list) < MAX_TASK_RES_BATCH_SIZE:
+            try:
+                task_res_list.append(queue.get_nowait())
+            except Empty:
+                break
+        state.store_task_res_batch(task_res_list)
+
+
+def _start_workers(
+    workers: Dict[int, threading.Thread], num_workers: int, args: Tuple[Any, ...]
+) -> None:
+    """Start a `worker` thread for each worker ID below `num_workers` without one."""
+    for worker_id in range(num_workers):
+        if worker_id in workers and workers[worker_id].is_alive():
+            continue
+        workers[worker_id] = threading.Thread(target=worker, args=(*args, worker_id))
+        workers[worker_id].start()
 
 
 def run_api(
@@ -184,7 +337,7 @@ def run_api(
     f_stop: threading.Event,
 ) -> None:
     """Run the VCE."""
-    taskins_queue: "Queue[TaskIns]" = Queue()
+    taskins_queue: "Queue[Tuple[TaskIns, Message]]" = Queue()
     taskres_queue: "Queue[TaskRes]" = Queue()
 
     try:
@@ -219,20 +372,20 @@ def run_api(
         )
         injector_th.start()
 
-        with ThreadPoolExecutor() as executor:
-            _ = [
-                executor.submit(
-                    worker,
-                    app_fn,
-                    taskins_queue,
-                    taskres_queue,
-                    node_states,
-                    backend,
-                    f_stop,
-                )
-                for _ in range(backend.num_workers)
-            ]
+        # Run one worker per backend worker, following the backend as it scales
+        workers: Dict[int, threading.Thread] = {}
+        while True:
+            backend.scale(taskins_queue.qsize())
+            _start_workers(
+                workers,
+                backend.num_workers,
+                (app_fn, taskins_queue, taskres_queue, node_states, backend, f_stop),
+            )
+            if f_stop.wait(BACKEND_SCALE_INTERVAL):
+                break
 
+        for worker_th in workers.values():
+            worker_th.join()
         extractor_th.join()
         injector_th.join()
 
@@ -313,11 +466,6 @@ def start_vce(
             num_nodes=num_supernodes, state_factory=state_factory
         )
 
-    # Construct mapping of NodeStates
-    node_states = _register_node_states(
-        nodes_mapping=nodes_mapping, run=run, app_dir=app_dir if is_app else None
-    )
-
     # Load backend config
     log(DEBUG, "Supported backends: %s", list(supported_backends.keys()))
     backend_config = json.loads(backend_config_json_stream)
@@ -341,35 +489,28 @@ def start_vce(
         """Instantiate a Backend."""
         return backend_type(backend_config, work_dir=app_dir)
 
-    # Load ClientApp if needed
-    def _load() -> ClientApp:
-
-        if client_app_attr:
-            app = _get_load_client_app_fn(
-                default_app_ref=client_app_attr,
-                project_dir=app_dir,
-                flwr_dir=flwr_dir,
-                multi_app=True,
-            )(run.fab_id, run.fab_version)
-
-        if client_app:
-            app = client_app
-        return app
-
-    app_fn = _load
+    # Load ClientApp if needed. The loader caches the `ClientApp` and stays
+    # picklable, so that backends can load it again in their workers
+    app_fn = _ClientAppLoader(app=client_app)
+    if client_app_attr is not None:
+        app_fn = _ClientAppLoader(
+            load_fn=partial(_load_client_app, client_app_attr, app_dir, flwr_dir, run)
+        )
 
+    context_store: Optional[ContextStore] = None
     try:
-        # Test if ClientApp can be loaded
-        client_app = app_fn()
-
-        # Cache `ClientApp`
-        if client_app_attr:
-            # Now wrap the loaded ClientApp in a dummy function
-            # this prevent unnecesary low-level loading of ClientApp
-            def _load_client_app() -> ClientApp:
-                return client_app
+        # Construct mapping of NodeStates. The context store is closed below, also
+        # if registering the nodes fails
+        context_store = _create_context_store(backend_config)
+        node_states = _register_node_states(
+            nodes_mapping=nodes_mapping,
+            run=run,
+            app_dir=app_dir if is_app else None,
+            context_store=context_store,
+        )
 
-            app_fn = _load_client_app
+        # Test if ClientApp can be loaded
+        app_fn()
 
         # Run main simulation loop
         run_api(
@@ -392,3 +533,7 @@ def start_vce(
         raise loadapp_ex
     except Exception as ex:
         raise ex
+    finally:
+        if context_store is not None:
+            log(INFO, "Context store metrics: %s", context_store.metrics())
+            context_store.close()
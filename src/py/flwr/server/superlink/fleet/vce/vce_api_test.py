@@ -15,18 +15,23 @@
 """Test Fleet Simulation Engine API."""
 
 
+import pickle
 import threading
 import time
 from itertools import cycle
 from json import JSONDecodeError
 from math import pi
 from pathlib import Path
+from queue import Queue
 from time import sleep
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 from uuid import UUID
 
-from flwr.client.client_app import LoadClientAppError
+import pytest
+
+from flwr.client.client_app import ClientApp, LoadClientAppError
 from flwr.common import (
     DEFAULT_TTL,
     GetPropertiesIns,
@@ -37,9 +42,12 @@ from flwr.common import (
 from flwr.common.recordset_compat import getpropertiesins_to_recordset
 from flwr.common.serde import message_from_taskres, message_to_taskins
 from flwr.common.typing import Run
+from flwr.proto.task_pb2 import TaskIns  # pylint: disable=E0611
 from flwr.server.superlink.fleet.vce.vce_api import (
     NodeToPartitionMapping,
+    _ClientAppLoader,
     _register_nodes,
+    add_taskins_to_queue,
     start_vce,
 )
 from flwr.server.superlink.state import InMemoryState, StateFactory
@@ -280,3 +288,65 @@ class TestFleetSimulationEngineRayBackend(TestCase):
                 content.configs_records["getpropertiesres.properties"]["result"]
                 == expected_results[UUID(task_res.task.ancestry[0])]
             )
+
+
+def _load_empty_app() -> ClientApp:
+    return ClientApp()
+
+
+def test_client_app_loader_pickles_without_app() -> None:
+    """Test that a pickled loader loads the ClientApp again."""
+    # Prepare
+    loader = _ClientAppLoader(load_fn=_load_empty_app)
+    app = loader()
+
+    # Execute
+    unpickled = pickle.loads(pickle.dumps(loader))
+
+    # Assert
+    assert loader() is app
+    assert isinstance(unpickled(), ClientApp)
+    assert unpickled() is not app
+
+
+def test_queued_task_ins_drop_their_content() -> None:
+    """Test that only the queued Messages keep the content of the TaskIns."""
+    # Prepare
+    state_factory, nodes_mapping, _ = init_state_factory_nodes_mapping(
+        num_nodes=2, num_messages=4
+    )
+    queue: "Queue[Tuple[TaskIns, Message]]" = Queue()
+    f_stop = threading.Event()
+    thread = threading.Thread(
+        target=add_taskins_to_queue,
+        args=(state_factory.state(), queue, nodes_mapping, f_stop),
+    )
+
+    # Execute
+    thread.start()
+    queued: List[Tuple[TaskIns, Message]] = [queue.get(timeout=10) for _ in range(4)]
+    f_stop.set()
+    thread.join()
+
+    # Assert
+    for task_ins, message in queued:
+        assert not task_ins.task.HasField("recordset")
+        assert task_ins.task.consumer.node_id == message.metadata.dst_node_id
+        assert message.content.configs_records
+
+
+def test_context_store_closed_if_registering_nodes_fails() -> None:
+    """Test that the ContextStore is closed if the NodeStates cannot be created."""
+    # Prepare
+    context_store = MagicMock()
+    vce_api = "flwr.server.superlink.fleet.vce.vce_api"
+
+    # Execute
+    with patch(f"{vce_api}._create_context_store", return_value=context_store), patch(
+        f"{vce_api}._register_node_states", side_effect=ValueError
+    ):
+        with pytest.raises(ValueError):
+            start_and_shutdown(num_supernodes=2)
+
+    # Assert
+    context_store.close.assert_called_once()
@@ -15,10 +15,12 @@
 """In-memory State implementation."""
 
 
+import itertools
 import threading
 import time
+from collections import deque
 from logging import ERROR
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from flwr.common import log, now
@@ -28,7 +30,13 @@ from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state.state import State
 from flwr.server.utils import validate_task_ins_or_res
 
-from .utils import generate_rand_int_from_bytes, make_node_unavailable_taskres
+from .utils import (
+    BlobRef,
+    generate_rand_int_from_bytes,
+    make_node_unavailable_taskres,
+    restore_blobs,
+    strip_blobs,
+)
 
 
 class InMemoryState(State):  # pylint: disable=R0902,R0904
@@ -45,11 +53,29 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         self.task_ins_store: Dict[UUID, TaskIns] = {}
         self.task_res_store: Dict[UUID, TaskRes] = {}
 
+        # Secondary indexes, updated together with the stores above:
+        # map node_id (`None` for anonymous nodes) to its undelivered TaskIns, and
+        # the task_id of each TaskIns to the TaskRes replying to it, where each
+        # TaskRes is stored with a sequence number to preserve insertion order
+        self.pending_task_ins: Dict[Optional[int], Deque[UUID]] = {}
+        self.task_res_ids_by_reply_to: Dict[str, Dict[UUID, int]] = {}
+        self._task_res_seq = itertools.count()
+
+        # The data of large arrays in TaskIns is stored once per content: map blob
+        # ID to data and number of references, and the task_id of each TaskIns to
+        # the blobs it references
+        self.blobs: Dict[str, bytes] = {}
+        self.blob_ref_counts: Dict[str, int] = {}
+        self.task_ins_blob_refs: Dict[UUID, List[BlobRef]] = {}
+
         self.client_public_keys: Set[bytes] = set()
         self.server_public_key: Optional[bytes] = None
         self.server_private_key: Optional[bytes] = None
 
         self.lock = threading.Lock()
+        # Notified whenever a TaskIns or TaskRes is stored
+        self.task_ins_stored = threading.Condition(self.lock)
+        self.task_res_stored = threading.Condition(self.lock)
 
     def store_task_ins(self, task_ins: TaskIns) -> Optional[UUID]:
         """Store one TaskIns."""
@@ -68,47 +94,121 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
 
         # Store TaskIns
         task_ins.task_id = str(task_id)
+        blob_refs, blobs = strip_blobs([task_ins])
         with self.lock:
-            self.task_ins_store[task_id] = task_ins
+            self._store_task_ins_and_index(task_id, task_ins, blob_refs[0], blobs)
+            self.task_ins_stored.notify_all()
 
         # Return the new task_id
         return task_id
 
+    def store_task_ins_batch(
+        self, task_ins_list: List[TaskIns]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskIns, acquiring the lock only once."""
+        task_ids: List[Optional[UUID]] = []
+        valid: List[Tuple[UUID, TaskIns]] = []
+        for task_ins in task_ins_list:
+            # Validate task
+            errors = validate_task_ins_or_res(task_ins)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+                continue
+
+            # Validate run_id
+            if task_ins.run_id not in self.run_ids:
+                log(ERROR, "`run_id` is invalid")
+                task_ids.append(None)
+                continue
+
+            # Create task_id
+            task_id = uuid4()
+            task_ins.task_id = str(task_id)
+            task_ids.append(task_id)
+            valid.append((task_id, task_ins))
+
+        # Store TaskIns
+        if valid:
+            blob_refs, blobs = strip_blobs([task_ins for _, task_ins in valid])
+            with self.lock:
+                for (task_id, task_ins), refs in zip(valid, blob_refs):
+                    self._store_task_ins_and_index(task_id, task_ins, refs, blobs)
+                self.task_ins_stored.notify_all()
+
+        return task_ids
+
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
     ) -> List[TaskIns]:
         """Get all TaskIns that have not been delivered yet."""
+        task_ins_list, _ = self.get_task_ins_omitting_blobs(node_id, limit, set())
+        return task_ins_list
+
+    def get_task_ins_omitting_blobs(
+        self, node_id: Optional[int], limit: Optional[int], blob_ids: Set[str]
+    ) -> Tuple[List[TaskIns], List[List[BlobRef]]]:
+        """Get all TaskIns that have not been delivered yet, omitting some blobs."""
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
         # Find TaskIns for node_id that were not delivered yet
-        task_ins_list: List[TaskIns] = []
+        found: List[Tuple[UUID, TaskIns]] = []
         with self.lock:
-            for _, task_ins in self.task_ins_store.items():
-                # pylint: disable=too-many-boolean-expressions
-                if (
-                    node_id is not None  # Not anonymous
-                    and task_ins.task.consumer.anonymous is False
-                    and task_ins.task.consumer.node_id == node_id
-                    and task_ins.task.delivered_at == ""
-                ) or (
-                    node_id is None  # Anonymous
-                    and task_ins.task.consumer.anonymous is True
-                    and task_ins.task.consumer.node_id == 0
-                    and task_ins.task.delivered_at == ""
-                ):
-                    task_ins_list.append(task_ins)
-                if limit and len(task_ins_list) == limit:
-                    break
+            pending = self.pending_task_ins.get(node_id)
+            while pending and (limit is None or len(found) < limit):
+                task_id = pending.popleft()
+                task_ins = self.task_ins_store.get(task_id)
+                if task_ins is not None and task_ins.task.delivered_at == "":
+                    found.append((task_id, task_ins))
+            if pending is not None and not pending:
+                del self.pending_task_ins[node_id]
 
-        # Mark all of them as delivered
-        delivered_at = now().isoformat()
-        for task_ins in task_ins_list:
-            task_ins.task.delivered_at = delivered_at
+            # Mark all of them as delivered
+            delivered_at = now().isoformat()
+            for _, task_ins in found:
+                task_ins.task.delivered_at = delivered_at
+            blob_refs, blobs = self._get_blobs([task_id for task_id, _ in found])
 
         # Return TaskIns
+        return _with_blobs(
+            [task_ins for _, task_ins in found], blob_refs, blobs, blob_ids
+        )
+
+    def get_task_ins_for_nodes(self, node_ids: Set[int]) -> List[TaskIns]:
+        """Get undelivered TaskIns for any of the given nodes."""
+        found: List[Tuple[UUID, TaskIns]] = []
+        with self.lock:
+            # Only visit nodes with pending TaskIns
+            for node_id in [n for n in self.pending_task_ins if n in node_ids]:
+                for task_id in self.pending_task_ins.pop(node_id):
+                    task_ins = self.task_ins_store.get(task_id)
+                    if task_ins is not None and task_ins.task.delivered_at == "":
+                        found.append((task_id, task_ins))
+
+            # Mark all of them as delivered
+            delivered_at = now().isoformat()
+            for _, task_ins in found:
+                task_ins.task.delivered_at = delivered_at
+            blob_refs, blobs = self._get_blobs([task_id for task_id, _ in found])
+
+        task_ins_list, _ = _with_blobs(
+            [task_ins for _, task_ins in found], blob_refs, blobs, set()
+        )
         return task_ins_list
 
+    def wait_for_task_ins(self, node_ids: Set[int], timeout: float) -> bool:
+        """Wait until undelivered TaskIns for any of the given nodes are available."""
+
+        def is_available() -> bool:
+            # Iterate over the smaller of the two collections
+            if len(node_ids) <= len(self.pending_task_ins):
+                return any(n in self.pending_task_ins for n in node_ids)
+            return any(n in node_ids for n in self.pending_task_ins)
+
+        with self.task_ins_stored:
+            return self.task_ins_stored.wait_for(is_available, timeout=timeout)
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes."""
         # Validate task
@@ -128,11 +228,48 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         # Store TaskRes
         task_res.task_id = str(task_id)
         with self.lock:
-            self.task_res_store[task_id] = task_res
+            self._store_task_res_and_index(task_id, task_res)
+            self.task_res_stored.notify_all()
 
         # Return the new task_id
         return task_id
 
+    def store_task_res_batch(
+        self, task_res_list: List[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskRes, acquiring the lock only once."""
+        task_ids: List[Optional[UUID]] = []
+        valid: List[Tuple[UUID, TaskRes]] = []
+        for task_res in task_res_list:
+            # Validate task
+            errors = validate_task_ins_or_res(task_res)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+                continue
+
+            # Validate run_id
+            if task_res.run_id not in self.run_ids:
+                log(ERROR, "`run_id` is invalid")
+                task_ids.append(None)
+                continue
+
+            # Create task_id
+            task_id = uuid4()
+            task_res.task_id = str(task_id)
+            task_ids.append(task_id)
+            valid.append((task_id, task_res))
+
+        # Store TaskRes
+        if valid:
+            with self.lock:
+                for task_id, task_res in valid:
+                    self._store_task_res_and_index(task_id, task_res)
+                self.task_res_stored.notify_all()
+
+        return task_ids
+
+    # pylint: disable-next=R0914
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get all TaskRes that have not been delivered yet."""
         if limit is not None and limit < 1:
@@ -140,15 +277,18 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
 
         with self.lock:
             # Find TaskRes that were not delivered yet
-            task_res_list: List[TaskRes] = []
-            replied_task_ids: Set[UUID] = set()
-            for _, task_res in self.task_res_store.items():
-                reply_to = UUID(task_res.task.ancestry[0])
-                if reply_to in task_ids and task_res.task.delivered_at == "":
-                    task_res_list.append(task_res)
-                    replied_task_ids.add(reply_to)
-                if limit and len(task_res_list) == limit:
-                    break
+            found: List[Tuple[int, UUID, TaskRes]] = []
+            for task_ins_id in task_ids:
+                task_res_ids = self.task_res_ids_by_reply_to.get(str(task_ins_id), {})
+                for task_res_id, seq in task_res_ids.items():
+                    task_res = self.task_res_store[task_res_id]
+                    if task_res.task.delivered_at == "":
+                        found.append((seq, task_ins_id, task_res))
+            found.sort(key=lambda item: item[0])
+            if limit:
+                found = found[:limit]
+            task_res_list: List[TaskRes] = [task_res for _, _, task_res in found]
+            replied_task_ids: Set[UUID] = {task_ins_id for _, task_ins_id, _ in found}
 
             # Check if the node is offline
             for task_id in task_ids - replied_task_ids:
@@ -164,7 +304,9 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
                     err_taskres = make_node_unavailable_taskres(
                         ref_taskins=task_ins,
                     )
-                    self.task_res_store[UUID(err_taskres.task_id)] = err_taskres
+                    self._store_task_res_and_index(
+                        UUID(err_taskres.task_id), err_taskres
+                    )
                     task_res_list.append(err_taskres)
 
             # Mark all of them as delivered
@@ -175,6 +317,34 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
             # Return TaskRes
             return task_res_list
 
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available."""
+        with self.task_res_stored:
+            return self.task_res_stored.wait_for(
+                lambda: self._has_task_res(task_ids), timeout=timeout
+            )
+
+    def _has_task_res(self, task_ids: Set[UUID]) -> bool:
+        """Check if `get_task_res` would return any TaskRes for `task_ids`.
+
+        Must be called while holding `self.lock`.
+        """
+        current_time = time.time()
+        for task_id in task_ids:
+            for task_res_id in self.task_res_ids_by_reply_to.get(str(task_id), {}):
+                if self.task_res_store[task_res_id].task.delivered_at == "":
+                    return True
+            # A TaskRes is created on retrieval if the node is offline
+            task_ins = self.task_ins_store.get(task_id)
+            if task_ins is None:
+                continue
+            online_until, _ = self.node_ids.get(
+                task_ins.task.consumer.node_id, (current_time, 0.0)
+            )
+            if online_until < current_time:
+                return True
+        return False
+
     def delete_tasks(self, task_ids: Set[UUID]) -> None:
         """Delete all delivered TaskIns/TaskRes pairs."""
         task_ins_to_be_deleted: Set[UUID] = set()
@@ -183,10 +353,9 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
         with self.lock:
             for task_ins_id in task_ids:
                 # Find the task_id of the matching task_res
-                for task_res_id, task_res in self.task_res_store.items():
-                    if UUID(task_res.task.ancestry[0]) != task_ins_id:
-                        continue
-                    if task_res.task.delivered_at == "":
+                task_res_ids = self.task_res_ids_by_reply_to.get(str(task_ins_id), {})
+                for task_res_id in task_res_ids:
+                    if self.task_res_store[task_res_id].task.delivered_at == "":
                         continue
 
                     task_ins_to_be_deleted.add(task_ins_id)
@@ -194,8 +363,69 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
 
             for task_id in task_ins_to_be_deleted:
                 del self.task_ins_store[task_id]
+                self._release_blobs(task_id)
             for task_id in task_res_to_be_deleted:
-                del self.task_res_store[task_id]
+                task_res = self.task_res_store.pop(task_id)
+                reply_to = task_res.task.ancestry[0]
+                task_res_ids = self.task_res_ids_by_reply_to[reply_to]
+                del task_res_ids[task_id]
+                if not task_res_ids:
+                    del self.task_res_ids_by_reply_to[reply_to]
+
+    def _store_task_ins_and_index(
+        self,
+        task_id: UUID,
+        task_ins: TaskIns,
+        blob_refs: List[BlobRef],
+        blobs: Dict[str, bytes],
+    ) -> None:
+        """Store a TaskIns stripped by `strip_blobs` and queue it, if undelivered.
+
+        Must be called while holding `self.lock`.
+        """
+        self.task_ins_store[task_id] = task_ins
+        if blob_refs:
+            self.task_ins_blob_refs[task_id] = blob_refs
+            for _, _, blob_id in blob_refs:
+                # Keep the data stored first, so identical data is dropped
+                self.blobs.setdefault(blob_id, blobs[blob_id])
+                self.blob_ref_counts[blob_id] = self.blob_ref_counts.get(blob_id, 0) + 1
+        if task_ins.task.delivered_at == "":
+            consumer = task_ins.task.consumer
+            node_id = None if consumer.anonymous else consumer.node_id
+            self.pending_task_ins.setdefault(node_id, deque()).append(task_id)
+
+    def _get_blobs(
+        self, task_ids: List[UUID]
+    ) -> Tuple[List[List[BlobRef]], Dict[str, bytes]]:
+        """Return the blobs referenced by each of the given TaskIns.
+
+        Must be called while holding `self.lock`.
+        """
+        blob_refs = [self.task_ins_blob_refs.get(task_id, []) for task_id in task_ids]
+        blobs = {ref[2]: self.blobs[ref[2]] for refs in blob_refs for ref in refs}
+        return blob_refs, blobs
+
+    def _release_blobs(self, task_id: UUID) -> None:
+        """Drop the references of a deleted TaskIns, and unreferenced blobs.
+
+        Must be called while holding `self.lock`.
+        """
+        for _, _, blob_id in self.task_ins_blob_refs.pop(task_id, []):
+            self.blob_ref_counts[blob_id] -= 1
+            if self.blob_ref_counts[blob_id] == 0:
+                del self.blob_ref_counts[blob_id]
+                del self.blobs[blob_id]
+
+    def _store_task_res_and_index(self, task_id: UUID, task_res: TaskRes) -> None:
+        """Store a TaskRes and index it by the TaskIns it replies to.
+
+        Must be called while holding `self.lock`.
+        """
+        self.task_res_store[task_id] = task_res
+        reply_to = task_res.task.ancestry[0]
+        task_res_ids = self.task_res_ids_by_reply_to.setdefault(reply_to, {})
+        task_res_ids[task_id] = next(self._task_res_seq)
 
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
@@ -345,3 +575,29 @@ class InMemoryState(State):  # pylint: disable=R0902,R0904
                 self.node_ids[node_id] = (time.time() + ping_interval, ping_interval)
                 return True
         return False
+
+
+def _with_blobs(
+    task_ins_list: List[TaskIns],
+    blob_refs: List[List[BlobRef]],
+    blobs: Dict[str, bytes],
+    omitted_blob_ids: Set[str],
+) -> Tuple[List[TaskIns], List[List[BlobRef]]]:
+    """Return the TaskIns, replacing those referencing blobs by restored copies.
+
+    Blobs in `omitted_blob_ids` are not restored. Their references are returned for
+    each TaskIns.
+    """
+    result: List[TaskIns] = []
+    omitted_refs: List[List[BlobRef]] = []
+    for task_ins, refs in zip(task_ins_list, blob_refs):
+        restored_refs = [ref for ref in refs if ref[2] not in omitted_blob_ids]
+        if restored_refs:
+            restored = TaskIns()
+            restored.CopyFrom(task_ins)
+            restore_blobs(restored, restored_refs, blobs)
+            task_ins = restored
+        omitted = [ref for ref in refs if ref[2] in omitted_blob_ids]
+        result.append(task_ins)
+        omitted_refs.append(omitted)
+    return result, omitted_refs
@@ -13,12 +13,15 @@
 # limitations under the License.
 # ==============================================================================
 """SQLite based implemenation of server state."""
+# pylint: disable=C0302
 
 
 import json
 import re
 import sqlite3
+import threading
 import time
+from collections import Counter
 from logging import DEBUG, ERROR
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union, cast
 from uuid import UUID, uuid4
@@ -32,7 +35,13 @@ from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.utils.validator import validate_task_ins_or_res
 
 from .state import State
-from .utils import generate_rand_int_from_bytes, make_node_unavailable_taskres
+from .utils import (
+    BlobRef,
+    generate_rand_int_from_bytes,
+    make_node_unavailable_taskres,
+    restore_blobs,
+    strip_blobs,
+)
 
 SQL_CREATE_TABLE_NODE = """
 CREATE TABLE IF NOT EXISTS node(
@@ -109,8 +118,52 @@ CREATE TABLE IF NOT EXISTS task_res(
 );
 """
 
+SQL_CREATE_TABLE_BLOB = """
+CREATE TABLE IF NOT EXISTS blob(
+    blob_id                 TEXT UNIQUE,
+    data                    BLOB,
+    ref_count               INTEGER
+);
+"""
+
+SQL_CREATE_TABLE_TASK_INS_BLOB = """
+CREATE TABLE IF NOT EXISTS task_ins_blob(
+    task_id                 TEXT,
+    record_key              TEXT,
+    array_index             INTEGER,
+    blob_id                 TEXT
+);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_CONSUMER = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_consumer
+ON task_ins (consumer_node_id, consumer_anonymous, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_RES_ANCESTRY = """
+CREATE INDEX IF NOT EXISTS idx_task_res_ancestry
+ON task_res (ancestry, delivered_at);
+"""
+
+SQL_CREATE_INDEX_TASK_INS_BLOB = """
+CREATE INDEX IF NOT EXISTS idx_task_ins_blob ON task_ins_blob (task_id);
+"""
+
 DictOrTuple = Union[Tuple[Any, ...], Dict[str, Any]]
 
+# Each SqliteState instance has its own connection, so instances for the same
+# database share the conditions which are notified whenever a TaskIns or a TaskRes
+# is stored
+_conditions: Dict[Tuple[str, str], threading.Condition] = {}
+_conditions_lock = threading.Lock()
+
+
+def _get_condition(database_path: str, table: str) -> threading.Condition:
+    with _conditions_lock:
+        if (database_path, table) not in _conditions:
+            _conditions[(database_path, table)] = threading.Condition()
+        return _conditions[(database_path, table)]
+
 
 class SqliteState(State):  # pylint: disable=R0904
     """SQLite-based state implementation."""
@@ -129,6 +182,8 @@ class SqliteState(State):  # pylint: disable=R0904
         """
         self.database_path = database_path
         self.conn: Optional[sqlite3.Connection] = None
+        self.task_ins_stored = _get_condition(database_path, "task_ins")
+        self.task_res_stored = _get_condition(database_path, "task_res")
 
     def initialize(self, log_queries: bool = False) -> List[Tuple[str]]:
         """Create tables if they don't exist yet.
@@ -140,6 +195,10 @@ class SqliteState(State):  # pylint: disable=R0904
         """
         self.conn = sqlite3.connect(self.database_path)
         self.conn.execute("PRAGMA foreign_keys = ON;")
+        # Let readers (e.g., polling nodes) proceed while a write is in progress.
+        # WAL mode is ignored for in-memory databases.
+        self.conn.execute("PRAGMA journal_mode = WAL;")
+        self.conn.execute("PRAGMA synchronous = NORMAL;")
         self.conn.row_factory = dict_factory
         if log_queries:
             self.conn.set_trace_callback(lambda query: log(DEBUG, query))
@@ -149,10 +208,15 @@ class SqliteState(State):  # pylint: disable=R0904
         cur.execute(SQL_CREATE_TABLE_RUN)
         cur.execute(SQL_CREATE_TABLE_TASK_INS)
         cur.execute(SQL_CREATE_TABLE_TASK_RES)
+        cur.execute(SQL_CREATE_TABLE_BLOB)
+        cur.execute(SQL_CREATE_TABLE_TASK_INS_BLOB)
         cur.execute(SQL_CREATE_TABLE_NODE)
         cur.execute(SQL_CREATE_TABLE_CREDENTIAL)
         cur.execute(SQL_CREATE_TABLE_PUBLIC_KEY)
         cur.execute(SQL_CREATE_INDEX_ONLINE_UNTIL)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_CONSUMER)
+        cur.execute(SQL_CREATE_INDEX_TASK_RES_ANCESTRY)
+        cur.execute(SQL_CREATE_INDEX_TASK_INS_BLOB)
         res = cur.execute("SELECT name FROM sqlite_schema;")
 
         return res.fetchall()
@@ -209,30 +273,136 @@ class SqliteState(State):  # pylint: disable=R0904
         If `task_ins.task.consumer.anonymous` is `False`, then
         `task_ins.task.consumer.node_id` MUST be set (not 0)
         """
-        # Validate task
-        errors = validate_task_ins_or_res(task_ins)
-        if any(errors):
-            log(ERROR, errors)
-            return None
+        return self.store_task_ins_batch([task_ins])[0]
 
-        # Create task_id
-        task_id = uuid4()
+    def store_task_ins_batch(
+        self, task_ins_list: List[TaskIns]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskIns in a single transaction.
 
-        # Store TaskIns
-        task_ins.task_id = str(task_id)
-        data = (task_ins_to_dict(task_ins),)
-        columns = ", ".join([f":{key}" for key in data[0]])
-        query = f"INSERT INTO task_ins VALUES({columns});"
+        Returns the `task_id` (UUID) of each `task_ins` in `task_ins_list`, in the same
+        order, or `None` for each `task_ins` that is invalid or refers to an invalid
+        run.
+        """
+        valid_run_ids = self._get_existing_run_ids(
+            {task_ins.run_id for task_ins in task_ins_list}
+        )
 
-        # Only invalid run_id can trigger IntegrityError.
-        # This may need to be changed in the future version with more integrity checks.
-        try:
-            self.query(query, data)
-        except sqlite3.IntegrityError:
-            log(ERROR, "`run` is invalid")
-            return None
+        task_ids: List[Optional[UUID]] = []
+        valid: List[TaskIns] = []
+        for task_ins in task_ins_list:
+            # Validate task
+            errors = validate_task_ins_or_res(task_ins)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+                continue
+            if task_ins.run_id not in valid_run_ids:
+                log(ERROR, "`run` is invalid")
+                task_ids.append(None)
+                continue
+
+            # Create task_id
+            task_id = uuid4()
+            task_ins.task_id = str(task_id)
+            task_ids.append(task_id)
+            valid.append(task_ins)
+
+        if valid:
+            self._insert_task_ins(valid)
+
+            with self.task_ins_stored:
+                self.task_ins_stored.notify_all()
+
+        return task_ids
+
+    def _insert_task_ins(self, task_ins_list: List[TaskIns]) -> None:
+        """Insert TaskIns and the blobs they reference in a single transaction."""
+        if self.conn is None:
+            raise AttributeError("State not intitialized")
 
-        return task_id
+        blob_refs, blobs = strip_blobs(task_ins_list)
+        rows = [task_ins_to_dict(task_ins) for task_ins in task_ins_list]
+        ref_rows = [
+            (task_ins.task_id, record_key, array_index, blob_id)
+            for task_ins, refs in zip(task_ins_list, blob_refs)
+            for record_key, array_index, blob_id in refs
+        ]
+        ref_counts = Counter(ref[3] for ref in ref_rows)
+        blob_rows = [
+            (blob_id, data, ref_counts[blob_id]) for blob_id, data in blobs.items()
+        ]
+
+        columns = ", ".join([f":{key}" for key in rows[0]])
+        with self.conn:
+            self.conn.executemany(f"INSERT INTO task_ins VALUES({columns});", rows)
+            if ref_rows:
+                self.conn.executemany(
+                    "INSERT INTO task_ins_blob VALUES(?, ?, ?, ?);", ref_rows
+                )
+                # Store each blob once, counting the references to it
+                self.conn.executemany(
+                    """
+                    INSERT INTO blob VALUES(?, ?, ?)
+                    ON CONFLICT(blob_id)
+                    DO UPDATE SET ref_count = ref_count + excluded.ref_count;
+                    """,
+                    blob_rows,
+                )
+
+    def _restore_blobs(
+        self, task_ins_list: List[TaskIns], omitted_blob_ids: Set[str]
+    ) -> List[List[BlobRef]]:
+        """Write the data of the blobs referenced by the TaskIns back into them.
+
+        Blobs in `omitted_blob_ids` are not restored. Their references are returned for
+        each TaskIns.
+        """
+        omitted_refs: List[List[BlobRef]] = [[] for _ in task_ins_list]
+        if len(task_ins_list) == 0:
+            return omitted_refs
+
+        query = """
+            SELECT task_id, record_key, array_index, blob_id
+            FROM task_ins_blob
+            WHERE task_id IN (SELECT value FROM json_each(:task_ids));
+        """
+        task_ids = [task_ins.task_id for task_ins in task_ins_list]
+        rows = self.query(query, {"task_ids": json.dumps(task_ids)})
+        if len(rows) == 0:
+            return omitted_refs
+
+        blob_refs: Dict[str, List[BlobRef]] = {}
+        omitted_by_task_id: Dict[str, List[BlobRef]] = {}
+        for row in rows:
+            ref = (row["record_key"], row["array_index"], row["blob_id"])
+            if ref[2] in omitted_blob_ids:
+                omitted_by_task_id.setdefault(row["task_id"], []).append(ref)
+            else:
+                blob_refs.setdefault(row["task_id"], []).append(ref)
+        query = """
+            SELECT blob_id, data
+            FROM blob
+            WHERE blob_id IN (SELECT value FROM json_each(:blob_ids));
+        """
+        blob_ids = list({ref[2] for refs in blob_refs.values() for ref in refs})
+        blobs: Dict[str, bytes] = {}
+        if blob_ids:
+            blobs = {
+                row["blob_id"]: row["data"]
+                for row in self.query(query, {"blob_ids": json.dumps(blob_ids)})
+            }
+        for index, task_ins in enumerate(task_ins_list):
+            restore_blobs(task_ins, blob_refs.get(task_ins.task_id, []), blobs)
+            omitted_refs[index] = omitted_by_task_id.get(task_ins.task_id, [])
+        return omitted_refs
+
+    def _get_existing_run_ids(self, run_ids: Set[int]) -> Set[int]:
+        """Return which of the given runs exist, in one query."""
+        placeholders = ",".join([f":id_{i}" for i in range(len(run_ids))])
+        query = f"SELECT run_id FROM run WHERE run_id IN ({placeholders});"
+        data = {f"id_{i}": run_id for i, run_id in enumerate(run_ids)}
+        return {row["run_id"] for row in self.query(query, data)}
 
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
@@ -260,6 +430,13 @@ class SqliteState(State):  # pylint: disable=R0904
         If `limit` is not `None`, return, at most, `limit` number of `task_ins`. If
         `limit` is set, it has to be greater than zero.
         """
+        task_ins_list, _ = self.get_task_ins_omitting_blobs(node_id, limit, set())
+        return task_ins_list
+
+    def get_task_ins_omitting_blobs(
+        self, node_id: Optional[int], limit: Optional[int], blob_ids: Set[str]
+    ) -> Tuple[List[TaskIns], List[List[BlobRef]]]:
+        """Get undelivered TaskIns for one node, omitting the data of some blobs."""
         if limit is not None and limit < 1:
             raise AssertionError("`limit` must be >= 1")
 
@@ -270,11 +447,11 @@ class SqliteState(State):  # pylint: disable=R0904
             )
             raise AssertionError(msg)
 
-        data: Dict[str, Union[str, int]] = {}
+        data: Dict[str, Union[str, int]] = {"delivered_at": now().isoformat()}
 
         if node_id is None:
             # Retrieve all anonymous Tasks
-            query = """
+            subquery = """
                 SELECT task_id
                 FROM task_ins
                 WHERE consumer_anonymous == 1
@@ -283,7 +460,7 @@ class SqliteState(State):  # pylint: disable=R0904
             """
         else:
             # Retrieve all TaskIns for node_id
-            query = """
+            subquery = """
                 SELECT task_id
                 FROM task_ins
                 WHERE consumer_anonymous == 0
@@ -293,37 +470,71 @@ class SqliteState(State):  # pylint: disable=R0904
             data["node_id"] = node_id
 
         if limit is not None:
-            query += " LIMIT :limit"
+            subquery += " LIMIT :limit"
             data["limit"] = limit
 
-        query += ";"
-
+        # Mark the TaskIns as delivered and return them in a single statement
+        query = f"""
+            UPDATE task_ins
+            SET delivered_at = :delivered_at
+            WHERE task_id IN ({subquery})
+            RETURNING *;
+        """
         rows = self.query(query, data)
 
-        if rows:
-            # Prepare query
-            task_ids = [row["task_id"] for row in rows]
-            placeholders: str = ",".join([f":id_{i}" for i in range(len(task_ids))])
-            query = f"""
-                UPDATE task_ins
-                SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
-            """
+        result = [dict_to_task_ins(row) for row in rows]
+        omitted_refs = self._restore_blobs(result, blob_ids)
 
-            # Prepare data for query
-            delivered_at = now().isoformat()
-            data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(task_ids):
-                data[f"id_{index}"] = str(task_id)
+        return result, omitted_refs
 
-            # Run query
-            rows = self.query(query, data)
+    def get_task_ins_for_nodes(self, node_ids: Set[int]) -> List[TaskIns]:
+        """Get undelivered TaskIns for any of the given nodes."""
+        if len(node_ids) == 0:
+            return []
+
+        # Pass the node IDs as a single JSON array to avoid exceeding the maximum
+        # number of host parameters for large sets of nodes
+        query = """
+            UPDATE task_ins
+            SET delivered_at = :delivered_at
+            WHERE consumer_anonymous == 0
+            AND   delivered_at = ""
+            AND   consumer_node_id IN (SELECT value FROM json_each(:node_ids))
+            RETURNING *;
+        """
+        data = {
+            "delivered_at": now().isoformat(),
+            "node_ids": json.dumps(list(node_ids)),
+        }
+        rows = self.query(query, data)
 
         result = [dict_to_task_ins(row) for row in rows]
+        self._restore_blobs(result, set())
 
         return result
 
+    def wait_for_task_ins(self, node_ids: Set[int], timeout: float) -> bool:
+        """Wait until undelivered TaskIns for any of the given nodes are available."""
+        if len(node_ids) == 0:
+            return False
+
+        # Filter by consumer in SQL, so that `idx_task_ins_consumer` is used
+        query = """
+            SELECT 1
+            FROM task_ins
+            WHERE consumer_anonymous == 0
+            AND   delivered_at = ""
+            AND   consumer_node_id IN (SELECT value FROM json_each(:node_ids))
+            LIMIT 1;
+        """
+        data = {"node_ids": json.dumps(list(node_ids))}
+
+        def is_available() -> bool:
+            return len(self.query(query, data)) > 0
+
+        with self.task_ins_stored:
+            return self.task_ins_stored.wait_for(is_available, timeout=timeout)
+
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
 
@@ -363,8 +574,54 @@ class SqliteState(State):  # pylint: disable=R0904
             log(ERROR, "`run` is invalid")
             return None
 
+        with self.task_res_stored:
+            self.task_res_stored.notify_all()
+
         return task_id
 
+    def store_task_res_batch(
+        self, task_res_list: List[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskRes in a single transaction.
+
+        Returns the `task_id` (UUID) of each `task_res` in `task_res_list`, in the same
+        order, or `None` for each `task_res` that is invalid or refers to an invalid
+        run.
+        """
+        valid_run_ids = self._get_existing_run_ids(
+            {task_res.run_id for task_res in task_res_list}
+        )
+
+        task_ids: List[Optional[UUID]] = []
+        rows: List[Dict[str, Any]] = []
+        for task_res in task_res_list:
+            # Validate task
+            errors = validate_task_ins_or_res(task_res)
+            if any(errors):
+                log(ERROR, errors)
+                task_ids.append(None)
+                continue
+            if task_res.run_id not in valid_run_ids:
+                log(ERROR, "`run` is invalid")
+                task_ids.append(None)
+                continue
+
+            # Create task_id
+            task_id = uuid4()
+            task_res.task_id = str(task_id)
+            task_ids.append(task_id)
+            rows.append(task_res_to_dict(task_res))
+
+        if rows:
+            columns = ", ".join([f":{key}" for key in rows[0]])
+            query = f"INSERT INTO task_res VALUES({columns});"
+            self.query(query, rows)
+
+            with self.task_res_stored:
+                self.task_res_stored.notify_all()
+
+        return task_ids
+
     # pylint: disable-next=R0914
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get TaskRes for task_ids.
@@ -389,46 +646,31 @@ class SqliteState(State):  # pylint: disable=R0904
             return []
 
         placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
-        query = f"""
-            SELECT *
+        subquery = f"""
+            SELECT task_id
             FROM task_res
             WHERE ancestry IN ({placeholders})
             AND delivered_at = ""
         """
 
-        data: Dict[str, Union[str, float, int]] = {}
+        data: Dict[str, Union[str, float, int]] = {"delivered_at": now().isoformat()}
 
         if limit is not None:
-            query += " LIMIT :limit"
+            subquery += " LIMIT :limit"
             data["limit"] = limit
 
-        query += ";"
-
         for index, task_id in enumerate(task_ids):
             data[f"id_{index}"] = str(task_id)
 
+        # Mark the TaskRes as delivered and return them in a single statement
+        query = f"""
+            UPDATE task_res
+            SET delivered_at = :delivered_at
+            WHERE task_id IN ({subquery})
+            RETURNING *;
+        """
         rows = self.query(query, data)
 
-        if rows:
-            # Prepare query
-            found_task_ids = [row["task_id"] for row in rows]
-            placeholders = ",".join([f":id_{i}" for i in range(len(found_task_ids))])
-            query = f"""
-                UPDATE task_res
-                SET delivered_at = :delivered_at
-                WHERE task_id IN ({placeholders})
-                RETURNING *;
-            """
-
-            # Prepare data for query
-            delivered_at = now().isoformat()
-            data = {"delivered_at": delivered_at}
-            for index, task_id in enumerate(found_task_ids):
-                data[f"id_{index}"] = str(task_id)
-
-            # Run query
-            rows = self.query(query, data)
-
         result = [dict_to_task_res(row) for row in rows]
 
         # 1. Query: Fetch consumer_node_id of remaining task_ids
@@ -480,6 +722,39 @@ class SqliteState(State):  # pylint: disable=R0904
 
         return result
 
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available."""
+        if len(task_ids) == 0:
+            return False
+
+        placeholders = ",".join([f":id_{i}" for i in range(len(task_ids))])
+        # Either an undelivered TaskRes exists, or a TaskIns is addressed to an
+        # offline node, for which `get_task_res` creates a TaskRes
+        query = f"""
+            SELECT EXISTS (
+                SELECT 1
+                FROM task_res
+                WHERE ancestry IN ({placeholders})
+                AND delivered_at = ""
+            ) OR EXISTS (
+                SELECT 1
+                FROM task_ins
+                JOIN node ON task_ins.consumer_node_id = node.node_id
+                WHERE task_ins.task_id IN ({placeholders})
+                AND node.online_until < :time
+            ) AS available;
+        """
+        data: Dict[str, Union[str, float]] = {
+            f"id_{index}": str(task_id) for index, task_id in enumerate(task_ids)
+        }
+
+        def is_available() -> bool:
+            data["time"] = time.time()
+            return bool(self.query(query, data)[0]["available"])
+
+        with self.task_res_stored:
+            return self.task_res_stored.wait_for(is_available, timeout=timeout)
+
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
 
@@ -519,7 +794,8 @@ class SqliteState(State):  # pylint: disable=R0904
                 FROM task_res
                 WHERE ancestry IN ({placeholders})
                 AND delivered_at != ''
-            );
+            )
+            RETURNING task_id;
         """
 
         # 2. Query: Delete delivered task_res to be run after 1. Query
@@ -533,11 +809,48 @@ class SqliteState(State):  # pylint: disable=R0904
             raise AttributeError("State not intitialized")
 
         with self.conn:
-            self.conn.execute(query_1, data)
+            deleted = self.conn.execute(query_1, data).fetchall()
             self.conn.execute(query_2, data)
+            if deleted:
+                self._release_blobs([row["task_id"] for row in deleted])
 
         return None
 
+    def _release_blobs(self, task_ids: List[str]) -> None:
+        """Drop the references of deleted TaskIns, and unreferenced blobs.
+
+        Must be called within the transaction deleting the TaskIns.
+        """
+        if self.conn is None:
+            raise AttributeError("State not intitialized")
+
+        data = {"task_ids": json.dumps(task_ids)}
+        self.conn.execute(
+            """
+            UPDATE blob
+            SET ref_count = ref_count - (
+                SELECT count(*)
+                FROM task_ins_blob
+                WHERE task_ins_blob.blob_id = blob.blob_id
+                AND   task_ins_blob.task_id IN (SELECT value FROM json_each(:task_ids))
+            )
+            WHERE blob_id IN (
+                SELECT blob_id
+                FROM task_ins_blob
+                WHERE task_id IN (SELECT value FROM json_each(:task_ids))
+            );
+            """,
+            data,
+        )
+        self.conn.execute(
+            """
+            DELETE FROM task_ins_blob
+            WHERE task_id IN (SELECT value FROM json_each(:task_ids));
+            """,
+            data,
+        )
+        self.conn.execute("DELETE FROM blob WHERE ref_count <= 0;")
+
     def create_node(
         self, ping_interval: float, public_key: Optional[bytes] = None
     ) -> int:
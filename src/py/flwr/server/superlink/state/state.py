@@ -16,12 +16,14 @@
 
 
 import abc
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from uuid import UUID
 
 from flwr.common.typing import Run, UserConfig
 from flwr.proto.task_pb2 import TaskIns, TaskRes  # pylint: disable=E0611
 
+from .utils import BlobRef
+
 
 class State(abc.ABC):  # pylint: disable=R0904
     """Abstract State."""
@@ -48,6 +50,21 @@ class State(abc.ABC):  # pylint: disable=R0904
         storing the `task_ins` MUST fail.
         """
 
+    def store_task_ins_batch(
+        self, task_ins_list: List[TaskIns]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskIns.
+
+        Usually, the Driver API calls this to schedule the instructions of one
+        request at once.
+
+        Returns the `task_id` (UUID) of each `task_ins` in `task_ins_list`, in the same
+        order, or `None` for each `task_ins` that could not be stored. The same
+        constraints as in `store_task_ins` apply to each `task_ins`. State
+        implementations can override this method to store all of them at once.
+        """
+        return [self.store_task_ins(task_ins) for task_ins in task_ins_list]
+
     @abc.abstractmethod
     def get_task_ins(
         self, node_id: Optional[int], limit: Optional[int]
@@ -76,6 +93,47 @@ class State(abc.ABC):  # pylint: disable=R0904
         `limit` is set, it has to be greater zero.
         """
 
+    def get_task_ins_omitting_blobs(
+        self,
+        node_id: Optional[int],
+        limit: Optional[int],
+        blob_ids: Set[str],  # pylint: disable=unused-argument
+    ) -> Tuple[List[TaskIns], List[List[BlobRef]]]:
+        """Get TaskIns like `get_task_ins`, leaving out the data of some blobs.
+
+        Usually, the Fleet API calls this for Nodes which have cached some arrays,
+        identified by their SHA-256 hash, which is also their blob ID.
+
+        Returns the TaskIns and, for each of them, the location and blob ID of each
+        array whose data was left out because its blob ID is in `blob_ids`. State
+        implementations can override this method, which by default leaves out no
+        data.
+        """
+        task_ins_list = self.get_task_ins(node_id=node_id, limit=limit)
+        return task_ins_list, [[] for _ in task_ins_list]
+
+    @abc.abstractmethod
+    def get_task_ins_for_nodes(self, node_ids: Set[int]) -> List[TaskIns]:
+        """Get undelivered TaskIns for any of the given nodes.
+
+        Usually, the Simulation Engine calls this to retrieve the TaskIns of all its
+        virtual nodes at once instead of calling `get_task_ins` for each node.
+
+        Retrieves all TaskIns where the `task_ins.task.consumer.node_id` is in
+        `node_ids`, `task_ins.task.consumer.anonymous` equals `False`, and
+        `task_ins.task.delivered_at` equals `""`. The retrieved TaskIns are marked as
+        delivered, as in `get_task_ins`.
+        """
+
+    @abc.abstractmethod
+    def wait_for_task_ins(self, node_ids: Set[int], timeout: float) -> bool:
+        """Wait until undelivered TaskIns for any of the given nodes are available.
+
+        Returns `True` as soon as `get_task_ins_for_nodes` would return at least one
+        TaskIns for `node_ids`. Returns `False` if this is still not the case after
+        `timeout` seconds.
+        """
+
     @abc.abstractmethod
     def store_task_res(self, task_res: TaskRes) -> Optional[UUID]:
         """Store one TaskRes.
@@ -97,6 +155,21 @@ class State(abc.ABC):  # pylint: disable=R0904
         storing the `task_res` MUST fail.
         """
 
+    def store_task_res_batch(
+        self, task_res_list: List[TaskRes]
+    ) -> List[Optional[UUID]]:
+        """Store multiple TaskRes.
+
+        Usually, the Simulation Engine calls this to store the results of several
+        virtual nodes at once.
+
+        Returns the `task_id` (UUID) of each `task_res` in `task_res_list`, in the same
+        order, or `None` for each `task_res` that could not be stored. The same
+        constraints as in `store_task_res` apply to each `task_res`. State
+        implementations can override this method to store all of them at once.
+        """
+        return [self.store_task_res(task_res) for task_res in task_res_list]
+
     @abc.abstractmethod
     def get_task_res(self, task_ids: Set[UUID], limit: Optional[int]) -> List[TaskRes]:
         """Get TaskRes for task_ids.
@@ -114,6 +187,18 @@ class State(abc.ABC):  # pylint: disable=R0904
         available. If `limit` is set, it has to be greater zero.
         """
 
+    @abc.abstractmethod
+    def wait_for_task_res(self, task_ids: Set[UUID], timeout: float) -> bool:
+        """Wait until TaskRes for any of the given task_ids are available.
+
+        Usually, the Driver API calls this method to wait for results instead of
+        calling `get_task_res` repeatedly.
+
+        Returns `True` as soon as `get_task_res` would return at least one TaskRes
+        for `task_ids`, including TaskRes reporting that a node is unavailable. Returns
+        `False` if this is still not the case after `timeout` seconds.
+        """
+
     @abc.abstractmethod
     def num_task_ins(self) -> int:
         """Calculate the number of task_ins in store.
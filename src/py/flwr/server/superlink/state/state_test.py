@@ -13,16 +13,18 @@
 # limitations under the License.
 # ==============================================================================
 """Tests all state implemenations have to conform to."""
-# pylint: disable=invalid-name, disable=R0904
+# pylint: disable=invalid-name, disable=R0904, disable=C0302
 
+import hashlib
 import tempfile
+import threading
 import time
 import unittest
 from abc import abstractmethod
 from datetime import datetime, timezone
 from typing import List
 from unittest.mock import patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from flwr.common import DEFAULT_TTL
 from flwr.common.constant import ErrorCode
@@ -32,9 +34,14 @@ from flwr.common.secure_aggregation.crypto.symmetric_encryption import (
     public_key_to_bytes,
 )
 from flwr.proto.node_pb2 import Node  # pylint: disable=E0611
-from flwr.proto.recordset_pb2 import RecordSet  # pylint: disable=E0611
+from flwr.proto.recordset_pb2 import (  # pylint: disable=E0611
+    Array,
+    ParametersRecord,
+    RecordSet,
+)
 from flwr.proto.task_pb2 import Task, TaskIns, TaskRes  # pylint: disable=E0611
 from flwr.server.superlink.state import InMemoryState, SqliteState, State
+from flwr.server.superlink.state.utils import BLOB_MIN_BYTES
 
 
 class StateTest(unittest.TestCase):
@@ -298,7 +305,132 @@ class StateTest(unittest.TestCase):
         # Assert
         assert task_id is None
 
+    def test_store_task_ins_batch(self) -> None:
+        """Store multiple TaskIns at once, skipping invalid ones."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        task_ins_list = [
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id),
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=61016),
+            create_task_ins(consumer_node_id=0, anonymous=False, run_id=run_id),
+            create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id),
+        ]
+
+        # Execute
+        task_ids = state.store_task_ins_batch(task_ins_list)
+        retrieved = state.get_task_ins(node_id=1, limit=None)
+
+        # Assert
+        assert len(task_ids) == 4
+        assert task_ids[0] is not None and task_ids[3] is not None
+        assert task_ids[1] is None and task_ids[2] is None
+        assert {task_ins.task_id for task_ins in retrieved} == {
+            str(task_ids[0]),
+            str(task_ids[3]),
+        }
+
+    def test_store_task_ins_with_blobs(self) -> None:
+        """Store TaskIns sharing large arrays and retrieve them in full."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        model = b"\x01" * BLOB_MIN_BYTES
+        task_ins_list = [
+            create_task_ins_with_arrays(node_id, run_id, [model, b"\x02"])
+            for node_id in (1, 2, 3)
+        ]
+        expected = ParametersRecord()
+        expected.CopyFrom(task_ins_list[0].task.recordset.parameters["parameters"])
+
+        # Execute
+        state.store_task_ins_batch(task_ins_list)
+        retrieved = state.get_task_ins(node_id=1, limit=None)
+        retrieved += state.get_task_ins_for_nodes({2, 3})
+
+        # Assert
+        assert len(retrieved) == 3
+        for task_ins in retrieved:
+            assert task_ins.task.recordset.parameters["parameters"] == expected
+
+    def test_get_task_ins_omitting_blobs(self) -> None:
+        """Retrieve TaskIns without the data of the given blobs."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        cached, other = b"\x01" * BLOB_MIN_BYTES, b"\x02" * BLOB_MIN_BYTES
+        state.store_task_ins(
+            create_task_ins_with_arrays(1, run_id, [cached, b"\x03", other])
+        )
+        cached_id = hashlib.sha256(cached).hexdigest()
+
+        # Execute
+        retrieved, omitted_refs = state.get_task_ins_omitting_blobs(
+            node_id=1, limit=None, blob_ids={cached_id, "unknown"}
+        )
+
+        # Assert
+        assert len(retrieved) == 1
+        record = retrieved[0].task.recordset.parameters["parameters"]
+        assert [array.data for array in record.data_values] == [b"", b"\x03", other]
+        assert omitted_refs == [[("parameters", 0, cached_id)]]
+
+    def test_get_task_ins_limit(self) -> None:
+        """Retrieve at most `limit` TaskIns and deliver each only once."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        state.store_task_ins_batch(
+            [
+                create_task_ins(consumer_node_id=1, anonymous=False, run_id=run_id)
+                for _ in range(3)
+            ]
+        )
+
+        # Execute
+        first = state.get_task_ins(node_id=1, limit=2)
+        second = state.get_task_ins(node_id=1, limit=2)
+        third = state.get_task_ins(node_id=1, limit=2)
+
+        # Assert
+        assert len(first) == 2
+        assert len(second) == 1
+        assert not third
+        assert not {t.task_id for t in first} & {t.task_id for t in second}
+
     # TaskRes tests
+    def test_get_task_ins_for_nodes(self) -> None:
+        """Test retrieving the TaskIns of several nodes at once."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        node_ids = [state.create_node(ping_interval=30) for _ in range(3)]
+        task_ids = state.store_task_ins_batch(
+            [
+                create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+                for node_id in node_ids + node_ids[:1]
+            ]
+        )
+        subscribed = set(node_ids[:2])
+
+        # Execute
+        available = state.wait_for_task_ins(subscribed, timeout=0.0)
+        task_ins_list = state.get_task_ins_for_nodes(subscribed)
+
+        # Assert
+        assert available
+        assert {UUID(task_ins.task_id) for task_ins in task_ins_list} == {
+            task_ids[0],
+            task_ids[1],
+            task_ids[3],
+        }
+        assert all(task_ins.task.delivered_at != "" for task_ins in task_ins_list)
+        assert not state.wait_for_task_ins(subscribed, timeout=0.05)
+        assert not state.get_task_ins_for_nodes(subscribed)
+        assert len(state.get_task_ins(node_id=node_ids[2], limit=None)) == 1
+
     def test_task_res_store_and_retrieve_by_task_ins_id(self) -> None:
         """Store TaskRes retrieve it by task_ins_id."""
         # Prepare
@@ -320,6 +452,72 @@ class StateTest(unittest.TestCase):
         retrieved_task_res = task_res_list[0]
         assert retrieved_task_res.task_id == str(task_res_uuid)
 
+    def test_store_task_res_batch(self) -> None:
+        """Store multiple TaskRes at once, skipping invalid ones."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        task_ins_ids = [uuid4() for _ in range(4)]
+        task_res_list = [
+            create_task_res(
+                producer_node_id=0,
+                anonymous=True,
+                ancestry=[str(task_ins_id)],
+                run_id=run_id,
+            )
+            for task_ins_id in task_ins_ids
+        ]
+        task_res_list[1].run_id = 61016
+        task_res_list[2].task.ClearField("ancestry")
+
+        # Execute
+        task_ids = state.store_task_res_batch(task_res_list)
+        retrieved = state.get_task_res(task_ids=set(task_ins_ids), limit=None)
+
+        # Assert
+        assert len(task_ids) == 4
+        assert task_ids[0] is not None and task_ids[3] is not None
+        assert task_ids[1] is None and task_ids[2] is None
+        assert [task_res.task_id for task_res in retrieved] == [
+            str(task_ids[0]),
+            str(task_ids[3]),
+        ]
+        assert state.num_task_res() == 2
+
+    def test_wait_for_task_res(self) -> None:
+        """Wait for TaskRes which are already available or never stored."""
+        # Prepare
+        state: State = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        node_id = state.create_node(ping_interval=30)
+        task_ids = state.store_task_ins_batch(
+            [
+                create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+                for _ in range(2)
+            ]
+        )
+        assert task_ids[0] is not None and task_ids[1] is not None
+        state.get_task_ins(node_id=node_id, limit=None)
+        state.store_task_res(
+            create_task_res(
+                producer_node_id=node_id,
+                anonymous=False,
+                ancestry=[str(task_ids[0])],
+                run_id=run_id,
+            )
+        )
+
+        # Execute & Assert
+        assert state.wait_for_task_res({task_ids[0], task_ids[1]}, timeout=0.0)
+        assert not state.wait_for_task_res({task_ids[1]}, timeout=0.05)
+
+        # The TaskRes for an offline node is created when it is retrieved
+        current_time = time.time()
+        with patch("time.time", side_effect=lambda: current_time + 50):
+            assert state.wait_for_task_res({task_ids[1]}, timeout=0.0)
+
     def test_node_ids_initial_state(self) -> None:
         """Test retrieving all node_ids and empty initial state."""
         # Prepare
@@ -696,6 +894,40 @@ def create_task_ins(
     return task
 
 
+def create_task_ins_with_arrays(
+    consumer_node_id: int, run_id: int, arrays: List[bytes]
+) -> TaskIns:
+    """Create a TaskIns with a ParametersRecord holding `arrays` for testing."""
+    task_ins = create_task_ins(
+        consumer_node_id=consumer_node_id, anonymous=False, run_id=run_id
+    )
+    task_ins.task.recordset.parameters["parameters"].CopyFrom(
+        ParametersRecord(
+            data_keys=[str(idx) for idx in range(len(arrays))],
+            data_values=[Array(data=data) for data in arrays],
+        )
+    )
+    return task_ins
+
+
+def store_deliver_and_delete(state: State, task_ins: TaskIns) -> None:
+    """Store a TaskIns, deliver it, reply to it, and delete both for testing."""
+    node_id = task_ins.task.consumer.node_id
+    task_ins_id = state.store_task_ins(task_ins)
+    assert task_ins_id is not None
+    state.get_task_ins(node_id=node_id, limit=None)
+    state.store_task_res(
+        create_task_res(
+            producer_node_id=node_id,
+            anonymous=False,
+            ancestry=[str(task_ins_id)],
+            run_id=task_ins.run_id,
+        )
+    )
+    state.get_task_res(task_ids={task_ins_id}, limit=None)
+    state.delete_tasks(task_ids={task_ins_id})
+
+
 def create_task_res(
     producer_node_id: int,
     anonymous: bool,
@@ -730,6 +962,115 @@ class InMemoryStateTest(StateTest):
         """Return InMemoryState."""
         return InMemoryState()
 
+    def test_wait_for_task_res_notified(self) -> None:
+        """Test that waiting for a TaskRes returns once it is stored."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        task_ins_id = uuid4()
+
+        def store_task_res() -> None:
+            time.sleep(0.1)
+            state.store_task_res(
+                create_task_res(
+                    producer_node_id=0,
+                    anonymous=True,
+                    ancestry=[str(task_ins_id)],
+                    run_id=run_id,
+                )
+            )
+
+        thread = threading.Thread(target=store_task_res)
+
+        # Execute
+        start_time = time.time()
+        thread.start()
+        available = state.wait_for_task_res({task_ins_id}, timeout=5.0)
+        thread.join()
+
+        # Assert
+        assert available
+        assert time.time() - start_time < 2.0
+
+    def test_wait_for_task_ins_notified(self) -> None:
+        """Test that waiting for a TaskIns returns once it is stored."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        node_id = state.create_node(ping_interval=30)
+
+        def store_task_ins() -> None:
+            time.sleep(0.1)
+            state.store_task_ins(
+                create_task_ins(
+                    consumer_node_id=node_id, anonymous=False, run_id=run_id
+                )
+            )
+
+        thread = threading.Thread(target=store_task_ins)
+
+        # Execute
+        start_time = time.time()
+        thread.start()
+        available = state.wait_for_task_ins({node_id}, timeout=5.0)
+        thread.join()
+
+        # Assert
+        assert available
+        assert time.time() - start_time < 2.0
+
+    def test_indexes_cleaned_up_after_delete(self) -> None:
+        """Test that the secondary indexes do not outlive the tasks."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        node_id = state.create_node(ping_interval=30)
+        task_ins = create_task_ins(
+            consumer_node_id=node_id, anonymous=False, run_id=run_id
+        )
+        task_ins_id = state.store_task_ins(task_ins)
+        assert task_ins_id is not None
+        state.get_task_ins(node_id=node_id, limit=None)
+        task_res = create_task_res(
+            producer_node_id=node_id,
+            anonymous=False,
+            ancestry=[str(task_ins_id)],
+            run_id=run_id,
+        )
+        state.store_task_res(task_res)
+        state.get_task_res(task_ids={task_ins_id}, limit=None)
+
+        # Execute
+        state.delete_tasks(task_ids={task_ins_id})
+
+        # Assert
+        assert not state.task_ins_store and not state.task_res_store
+        assert not state.pending_task_ins
+        assert not state.task_res_ids_by_reply_to
+
+    def test_blobs_stored_once_and_released(self) -> None:
+        """Test that identical large arrays are stored once until deleted."""
+        # Prepare
+        state = InMemoryState()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        model = b"\x01" * BLOB_MIN_BYTES
+        first, second, third = (
+            create_task_ins_with_arrays(node_id, run_id, [model])
+            for node_id in (1, 2, 3)
+        )
+
+        # Execute
+        store_deliver_and_delete(state, first)
+        num_blobs_after_delete = len(state.blobs)
+        state.store_task_ins(second)
+        state.store_task_ins(third)
+
+        # Assert
+        assert num_blobs_after_delete == 0
+        assert list(state.blobs.values()) == [model]
+        assert list(state.blob_ref_counts.values()) == [2]
+        assert second.task.recordset.parameters["parameters"].data_values[0].data == b""
+
 
 class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
     """Test SqliteState implemenation with in-memory database."""
@@ -751,7 +1092,32 @@ class SqliteInMemoryStateTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 13
+        assert len(result) == 19
+
+    def test_blobs_stored_once_and_released(self) -> None:
+        """Test that identical large arrays are stored once until deleted."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        model = b"\x01" * BLOB_MIN_BYTES
+        first, second, third = (
+            create_task_ins_with_arrays(node_id, run_id, [model])
+            for node_id in (1, 2, 3)
+        )
+
+        # Execute
+        store_deliver_and_delete(state, first)
+        blobs_after_delete = state.query("SELECT * FROM blob;")
+        state.store_task_ins(second)
+        state.store_task_ins(third)
+
+        # Assert
+        assert len(blobs_after_delete) == 0
+        assert not state.query(
+            "SELECT * FROM task_ins_blob WHERE task_id = ?;", (first.task_id,)
+        )
+        blobs = state.query("SELECT data, ref_count FROM blob;")
+        assert blobs == [{"data": model, "ref_count": 2}]
 
 
 class SqliteFileBasedTest(StateTest, unittest.TestCase):
@@ -767,6 +1133,39 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         state.initialize()
         return state
 
+    def test_wait_for_task_res_notified(self) -> None:
+        """Test that waiting for a TaskRes returns once it is stored."""
+        # Prepare
+        state = self.state_factory()
+        run_id = state.create_run("mock/mock", "v1.0.0", {})
+        task_ins_id = uuid4()
+
+        def store_task_res() -> None:
+            time.sleep(0.1)
+            # Each connection is used by a single thread
+            other_state = SqliteState(database_path=self.tmp_file.name)
+            other_state.initialize()
+            other_state.store_task_res(
+                create_task_res(
+                    producer_node_id=0,
+                    anonymous=True,
+                    ancestry=[str(task_ins_id)],
+                    run_id=run_id,
+                )
+            )
+
+        thread = threading.Thread(target=store_task_res)
+
+        # Execute
+        start_time = time.time()
+        thread.start()
+        available = state.wait_for_task_res({task_ins_id}, timeout=5.0)
+        thread.join()
+
+        # Assert
+        assert available
+        assert time.time() - start_time < 2.0
+
     def test_initialize(self) -> None:
         """Test initialization."""
         # Prepare
@@ -776,7 +1175,7 @@ class SqliteFileBasedTest(StateTest, unittest.TestCase):
         result = state.query("SELECT name FROM sqlite_schema;")
 
         # Assert
-        assert len(result) == 13
+        assert len(result) == 19
 
 
 if __name__ == "__main__":
@@ -15,9 +15,11 @@
 """Utility functions for State."""
 
 
+import hashlib
 import time
 from logging import ERROR
 from os import urandom
+from typing import Dict, List, Sequence, Tuple
 from uuid import uuid4
 
 from flwr.common import log
@@ -31,6 +33,15 @@ NODE_UNAVAILABLE_ERROR_REASON = (
     "It exceeds the time limit specified in its last ping."
 )
 
+# The data of arrays larger than this is stored once per content in State
+BLOB_MIN_BYTES = 64 * 1024
+
+# Number of leading and trailing bytes used to find identical blobs
+_BLOB_KEY_BYTES = 64
+
+# Location of a blob in a TaskIns: (ParametersRecord key, array index, blob ID)
+BlobRef = Tuple[str, int, str]
+
 
 def generate_rand_int_from_bytes(num_bytes: int) -> int:
     """Generate a random `num_bytes` integer."""
@@ -60,3 +71,53 @@ def make_node_unavailable_taskres(ref_taskins: TaskIns) -> TaskRes:
             ),
         ),
     )
+
+
+def strip_blobs(
+    task_ins_list: Sequence[TaskIns],
+) -> Tuple[List[List[BlobRef]], Dict[str, bytes]]:
+    """Remove the data of large arrays from TaskIns, keeping one copy per content.
+
+    Parameters
+    ----------
+    task_ins_list : Sequence[TaskIns]
+        The TaskIns to strip. They are modified in place.
+
+    Returns
+    -------
+    blob_refs : List[List[BlobRef]]
+        The location and blob ID of each stripped array, for each TaskIns.
+    blobs : Dict[str, bytes]
+        The data of each blob, keyed by its blob ID, the SHA-256 hash of the data.
+    """
+    blob_refs: List[List[BlobRef]] = []
+    blobs: Dict[str, bytes] = {}
+    # Compare data before hashing it, so that identical data is hashed only once
+    candidates: Dict[Tuple[int, bytes, bytes], List[str]] = {}
+    for task_ins in task_ins_list:
+        refs: List[BlobRef] = []
+        for record_key, record in task_ins.task.recordset.parameters.items():
+            for array_index, array in enumerate(record.data_values):
+                data = array.data
+                if len(data) < BLOB_MIN_BYTES:
+                    continue
+                key = (len(data), data[:_BLOB_KEY_BYTES], data[-_BLOB_KEY_BYTES:])
+                matches = candidates.setdefault(key, [])
+                blob_id = next((b for b in matches if blobs[b] == data), None)
+                if blob_id is None:
+                    blob_id = hashlib.sha256(data).hexdigest()
+                    blobs[blob_id] = data
+                    matches.append(blob_id)
+                refs.append((record_key, array_index, blob_id))
+                array.ClearField("data")
+        blob_refs.append(refs)
+    return blob_refs, blobs
+
+
+def restore_blobs(
+    task_ins: TaskIns, blob_refs: List[BlobRef], blobs: Dict[str, bytes]
+) -> None:
+    """Write the data of the blobs referenced by `blob_refs` back into `task_ins`."""
+    records = task_ins.task.recordset.parameters
+    for record_key, array_index, blob_id in blob_refs:
+        records[record_key].data_values[array_index].data = blobs[blob_id]
@@ -28,9 +28,16 @@ from flwr.common import (
     EvaluateRes,
     FitRes,
     GetParametersIns,
+    Parameters,
     ParametersRecord,
     log,
 )
+from flwr.common.compression import (
+    ReferenceCache,
+    aggregate_compression_metrics,
+    decompress_fit_res,
+    is_compressed,
+)
 from flwr.common.constant import MessageType, MessageTypeLegacy
 
 from ..client_proxy import ClientProxy
@@ -245,8 +252,9 @@ def default_fit_workflow(  # pylint: disable=R0914
         context.client_manager.num_available(),
     )
 
-    # Build dictionary mapping node_id to ClientProxy
+    # Build dictionaries mapping node_id to ClientProxy and FitIns
     node_id_to_proxy = {proxy.node_id: proxy for proxy, _ in client_instructions}
+    node_id_to_fitins = {proxy.node_id: ins for proxy, ins in client_instructions}
 
     # Build out messages
     out_messages = [
@@ -276,11 +284,27 @@ def default_fit_workflow(  # pylint: disable=R0914
     # Aggregate training results
     results: List[Tuple[ClientProxy, FitRes]] = []
     failures: List[Union[Tuple[ClientProxy, FitRes], BaseException]] = []
+    references = ReferenceCache()
     for msg in messages:
         if msg.has_content():
             proxy = node_id_to_proxy[msg.metadata.src_node_id]
             fitres = compat.recordset_to_fitres(msg.content, False)
             if fitres.status.code == Code.OK:
+                if is_compressed(fitres.parameters):
+                    # The client sent a compressed delta from its instructions
+                    fitins = node_id_to_fitins[msg.metadata.src_node_id]
+                    try:
+                        decompress_fit_res(fitres, references.get(fitins.parameters))
+                    except ValueError as err:
+                        failures.append(err)
+                        continue
+                if context.strategy.aggregate_fit_partial(
+                    current_round, (proxy, fitres)
+                ):
+                    # The result is already aggregated, drop its parameters
+                    fitres.parameters = Parameters(
+                        tensors=[], tensor_type=fitres.parameters.tensor_type
+                    )
                 results.append((proxy, fitres))
             else:
                 failures.append((proxy, fitres))
@@ -289,6 +313,9 @@ def default_fit_workflow(  # pylint: disable=R0914
 
     aggregated_result = context.strategy.aggregate_fit(current_round, results, failures)
     parameters_aggregated, metrics_aggregated = aggregated_result
+    metrics_aggregated.update(
+        aggregate_compression_metrics([fitres.metrics for _, fitres in results])
+    )
 
     # Update the parameters and write history
     if parameters_aggregated:
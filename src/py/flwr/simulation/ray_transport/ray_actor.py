@@ -15,6 +15,7 @@
 """Ray-based Flower Actor and ActorPool implementation."""
 
 import threading
+import time
 from abc import ABC
 from logging import DEBUG, ERROR, WARNING
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union
@@ -28,11 +29,62 @@ from flwr.common import Context, Message
 from flwr.common.logger import log
 
 ClientAppFn = Callable[[], ClientApp]
+BatchResult = Union[Tuple[str, Message, Context], Exception]
+
+# Weight of the latest observation in the moving average of the message latency
+_LATENCY_SMOOTHING = 0.2
+
+
+class ClientAppFnRef:
+    """A ClientAppFn stored once in the Ray object store.
+
+    Actors receiving it load the ClientApp once per run and reuse it for the
+    following messages, instead of receiving and calling `client_app_fn` with every
+    message.
+    """
+
+    def __init__(self, client_app_fn: ClientAppFn) -> None:
+        self.object_ref = ray.put(client_app_fn)
+        self.key = self.object_ref.hex()
+
+    def __call__(self) -> ClientApp:
+        """Load the ClientApp."""
+        client_app_fn: ClientAppFn = ray.get(self.object_ref)
+        return client_app_fn()
 
 
 class VirtualClientEngineActor(ABC):
     """Abstract base class for VirtualClientEngine Actors."""
 
+    def __init__(self) -> None:
+        # The ClientApp loaded last, with the run ID and the key of its ClientAppFnRef
+        self._client_app: Optional[Tuple[Tuple[int, str], ClientApp]] = None
+        self.app_cache_hits = 0
+        self.app_cache_misses = 0
+
+    def _load_client_app(
+        self, client_app_fn: Union[ClientAppFn, ClientAppFnRef], run_id: int
+    ) -> ClientApp:
+        """Load the ClientApp, reusing the one loaded before if it is the same."""
+        if not isinstance(client_app_fn, ClientAppFnRef):
+            return client_app_fn()
+
+        key = (run_id, client_app_fn.key)
+        if self._client_app is not None and self._client_app[0] == key:
+            self.app_cache_hits += 1
+            return self._client_app[1]
+
+        # Drop the ClientApp of the previous run before loading the new one
+        self._client_app = None
+        app = client_app_fn()
+        self._client_app = (key, app)
+        self.app_cache_misses += 1
+        return app
+
+    def app_cache_info(self) -> Tuple[int, int]:
+        """Return the number of times the ClientApp was reused and loaded."""
+        return self.app_cache_hits, self.app_cache_misses
+
     def terminate(self) -> None:
         """Manually terminate Actor object."""
         log(WARNING, "Manually terminating %s", self.__class__.__name__)
@@ -40,7 +92,7 @@ class VirtualClientEngineActor(ABC):
 
     def run(
         self,
-        client_app_fn: ClientAppFn,
+        client_app_fn: Union[ClientAppFn, ClientAppFnRef],
         message: Message,
         cid: str,
         context: Context,
@@ -51,7 +103,7 @@ class VirtualClientEngineActor(ABC):
         # from the pool are correctly assigned to each ClientProxy
         try:
             # Load app
-            app: ClientApp = client_app_fn()
+            app = self._load_client_app(client_app_fn, message.metadata.run_id)
 
             # Handle task message
             out_message = app(message=message, context=context)
@@ -64,6 +116,39 @@ class VirtualClientEngineActor(ABC):
 
         return cid, out_message, context
 
+    def run_batch(
+        self,
+        client_app_fn: Union[ClientAppFn, ClientAppFnRef],
+        jobs: List[Tuple[Message, str, Context]],
+    ) -> List[BatchResult]:
+        """Run several client runs, loading the ClientApp only once.
+
+        Exceptions are not raised but returned in place of the result of the job that
+        raised them, so that a failing job does not affect the rest of the batch.
+        """
+        results: List[BatchResult] = []
+        # If a batch contains several messages for the same node, each of them
+        # must see the context updated by the previous one
+        latest_contexts: Dict[int, Context] = {}
+        for message, cid, context in jobs:
+            context = latest_contexts.get(context.node_id, context)
+            try:
+                # Load app
+                app = self._load_client_app(client_app_fn, message.metadata.run_id)
+            except LoadClientAppError as load_ex:
+                results.append(load_ex)
+                continue
+            try:
+                # Handle task message
+                out_message = app(message=message, context=context)
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                results.append(ClientAppException(str(ex)))
+                continue
+            latest_contexts[context.node_id] = context
+            results.append((cid, out_message, context))
+
+        return results
+
 
 @ray.remote
 class ClientAppActor(VirtualClientEngineActor):
@@ -398,8 +483,12 @@ class VirtualClientEngineActorPool(ActorPool):
         return self._fetch_future_result(cid)
 
 
-class BasicActorPool:
-    """A basic actor pool."""
+class BasicActorPool:  # pylint: disable=R0902
+    """A basic actor pool.
+
+    Jobs can be submitted from several threads. If no actor is idle, `submit` and
+    `submit_batch` wait until one is added back to the pool.
+    """
 
     def __init__(
         self,
@@ -409,9 +498,11 @@ class BasicActorPool:
     ):
         self.client_resources = client_resources
 
-        # Queue of idle actors
+        # Queue of idle actors, the one idle for the longest time first
         self.pool: List[VirtualClientEngineActor] = []
         self.num_actors = 0
+        self._idle_since: Dict[VirtualClientEngineActor, float] = {}
+        self._actor_available = threading.Condition()
 
         # Resolve arguments to pass during actor init
         actor_args = {} if actor_kwargs is None else actor_kwargs
@@ -426,6 +517,17 @@ class BasicActorPool:
         self.actors_capacity = pool_size_from_resources(client_resources)
         self._future_to_actor: Dict[Any, VirtualClientEngineActor] = {}
 
+        # Time at which each future was submitted and its number of messages
+        self._future_to_submission: Dict[Any, Tuple[float, int]] = {}
+        # Moving average of the time taken by actors to process one message
+        self.message_latency: Optional[float] = None
+
+    @property
+    def num_busy_actors(self) -> int:
+        """Return the number of actors running jobs."""
+        with self._actor_available:
+            return self.num_actors - len(self.pool)
+
     def is_actor_available(self) -> bool:
         """Return true if there is an idle actor."""
         return len(self.pool) > 0
@@ -436,37 +538,119 @@ class BasicActorPool:
         This method may be executed also if new resources are added to your Ray cluster
         (e.g. you add a new node).
         """
-        for _ in range(num_actors):
-            self.pool.append(self.create_actor_fn())  # type: ignore
-        self.num_actors += num_actors
+        with self._actor_available:
+            for _ in range(num_actors):
+                actor = self.create_actor_fn()  # type: ignore
+                self.pool.append(actor)
+                self._idle_since[actor] = time.monotonic()
+            self.num_actors += num_actors
+            self._actor_available.notify_all()
+
+    def remove_idle_actors(self, idle_timeout: float, min_actors: int) -> int:
+        """Terminate actors that have been idle for at least `idle_timeout` seconds.
+
+        At least `min_actors` actors are kept in the pool. Returns the number of
+        terminated actors.
+        """
+        num_removed = 0
+        with self._actor_available:
+            now = time.monotonic()
+            while (
+                self.pool
+                and self.num_actors > min_actors
+                and now - self._idle_since[self.pool[0]] >= idle_timeout
+            ):
+                actor = self.pool.pop(0)
+                del self._idle_since[actor]
+                actor.terminate.remote()  # type: ignore
+                self.num_actors -= 1
+                num_removed += 1
+        return num_removed
 
     def terminate_all_actors(self) -> None:
         """Terminate actors in pool."""
         num_terminated = 0
-        for actor in self.pool:
-            actor.terminate.remote()  # type: ignore
-            num_terminated += 1
+        with self._actor_available:
+            for actor in self.pool:
+                actor.terminate.remote()  # type: ignore
+                num_terminated += 1
 
         log(DEBUG, "Terminated %i actors", num_terminated)
 
+    def app_cache_info(self) -> Tuple[int, int]:
+        """Return how often idle actors reused and loaded the ClientApp in total."""
+        with self._actor_available:
+            actors = list(self.pool)
+        infos = ray.get(
+            [actor.app_cache_info.remote() for actor in actors]  # type: ignore
+        )
+        return sum(hits for hits, _ in infos), sum(misses for _, misses in infos)
+
+    def _take_idle_actor(self) -> VirtualClientEngineActor:
+        """Remove the most recently used idle actor from the pool."""
+        with self._actor_available:
+            self._actor_available.wait_for(lambda: len(self.pool) > 0)
+            actor = self.pool.pop()
+            del self._idle_since[actor]
+            return actor
+
+    def _track_future(
+        self, future: Any, actor: VirtualClientEngineActor, num_messages: int
+    ) -> None:
+        """Keep track of the actor running `future` and when it was submitted."""
+        with self._actor_available:
+            self._future_to_actor[future] = actor
+            self._future_to_submission[future] = (time.monotonic(), num_messages)
+
     def submit(
-        self, actor_fn: Any, job: Tuple[ClientAppFn, Message, str, Context]
+        self,
+        actor_fn: Any,
+        job: Tuple[Union[ClientAppFn, ClientAppFnRef], Message, str, Context],
     ) -> Any:
         """On idle actor, submit job and return future."""
         # Remove idle actor from pool
-        actor = self.pool.pop()
+        actor = self._take_idle_actor()
         # Submit job to actor
         app_fn, mssg, cid, context = job
         future = actor_fn(actor, app_fn, mssg, cid, context)
-        # Keep track of future:actor (so we can fetch the actor upon job completion
-        # and add it back to the pool)
-        self._future_to_actor[future] = actor
+        self._track_future(future, actor, num_messages=1)
+        return future
+
+    def submit_batch(
+        self,
+        actor_fn: Any,
+        job: Tuple[
+            Union[ClientAppFn, ClientAppFnRef], List[Tuple[Message, str, Context]]
+        ],
+    ) -> Any:
+        """On idle actor, submit a batch of jobs and return future."""
+        # Remove idle actor from pool
+        actor = self._take_idle_actor()
+        # Submit jobs to actor
+        app_fn, jobs = job
+        future = actor_fn(actor, app_fn, jobs)
+        self._track_future(future, actor, num_messages=len(jobs))
         return future
 
     def add_actor_back_to_pool(self, future: Any) -> None:
         """Ad actor assigned to run future back into the pool."""
-        actor = self._future_to_actor.pop(future)
-        self.pool.append(actor)
+        with self._actor_available:
+            actor = self._future_to_actor.pop(future)
+            submitted_at, num_messages = self._future_to_submission.pop(future)
+            now = time.monotonic()
+            self._update_message_latency((now - submitted_at) / num_messages)
+            self.pool.append(actor)
+            self._idle_since[actor] = now
+            self._actor_available.notify()
+
+    def _update_message_latency(self, latency: float) -> None:
+        """Update the moving average of the time taken to process one message."""
+        if self.message_latency is None:
+            self.message_latency = latency
+        else:
+            self.message_latency += _LATENCY_SMOOTHING * (
+                latency - self.message_latency
+            )
 
     def fetch_result_and_return_actor_to_pool(
         self, future: Any
@@ -478,3 +662,15 @@ class BasicActorPool:
         # Get actor that ran job
         self.add_actor_back_to_pool(future)
         return out_mssg, updated_context
+
+    def fetch_batch_results_and_return_actor_to_pool(
+        self, future: Any
+    ) -> List[Union[Tuple[Message, Context], Exception]]:
+        """Pull the results of a batch given a future and add actor back to pool."""
+        results: List[BatchResult] = ray.get(future)
+        # Get actor that ran the jobs
+        self.add_actor_back_to_pool(future)
+        return [
+            result if isinstance(result, Exception) else (result[1], result[2])
+            for result in results
+        ]
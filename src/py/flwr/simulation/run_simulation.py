@@ -213,14 +213,20 @@ def run_simulation(
         should perform.
 
     backend_name : str (default: ray)
-        A simulation backend that runs `ClientApp`s.
+        A simulation backend that runs `ClientApp`s. Either "ray" or "process",
+        which runs them in a pool of local processes without Ray.
 
     backend_config : Optional[BackendConfig]
         'A dictionary to configure a backend. Separate dictionaries to configure
         different elements of backend. Supported top-level keys are `init_args`
         for values parsed to initialisation of backend, `client_resources`
-        to define the resources for clients, and `actor` to define the actor
-        parameters. Values supported in <value> are those included by
+        to define the resources for clients, `actor` to define the actor
+        parameters, `context_store` to keep at most `max_contexts_in_memory`
+        node contexts in memory and spill the others to an SQLite `database`
+        (a temporary file by default), and `autoscaling` to let the Ray backend
+        add actors for queued messages and terminate actors that have been idle
+        for `idle_timeout` seconds, keeping at least `min_actors`. Values
+        supported in <value> are those included by
         `flwr.common.typing.ConfigsRecordValues`.
 
     enable_tf_gpu_growth : bool (default: False)
@@ -441,14 +447,20 @@ def _run_simulation(
         The `ServerApp` to be executed.
 
     backend_name : str (default: ray)
-        A simulation backend that runs `ClientApp`s.
+        A simulation backend that runs `ClientApp`s. Either "ray" or "process",
+        which runs them in a pool of local processes without Ray.
 
     backend_config : Optional[BackendConfig]
         'A dictionary to configure a backend. Separate dictionaries to configure
         different elements of backend. Supported top-level keys are `init_args`
         for values parsed to initialisation of backend, `client_resources`
-        to define the resources for clients, and `actor` to define the actor
-        parameters. Values supported in <value> are those included by
+        to define the resources for clients, `actor` to define the actor
+        parameters, `context_store` to keep at most `max_contexts_in_memory`
+        node contexts in memory and spill the others to an SQLite `database`
+        (a temporary file by default), and `autoscaling` to let the Ray backend
+        add actors for queued messages and terminate actors that have been idle
+        for `idle_timeout` seconds, keeping at least `min_actors`. Values
+        supported in <value> are those included by
         `flwr.common.typing.ConfigsRecordValues`.
 
     client_app_attr : Optional[str]
@@ -604,7 +616,7 @@ def _parse_args_run_simulation() -> argparse.ArgumentParser:
         "--backend",
         default="ray",
         type=str,
-        help="Simulation backend that executes the ClientApp.",
+        help="Simulation backend that executes the ClientApp ('ray' or 'process').",
     )
     parser.add_argument(
         "--backend-config",